@@ -18,18 +18,27 @@ document.addEventListener("DOMContentLoaded", function () {
     .addEventListener("submit", handleNewsSubmit);
 });
 
+const JOB_STATE_TEXT = {
+  queued: "Sırada bekliyor...",
+  fetching: "Sayfa indiriliyor...",
+  parsing: "İçerik çıkarılıyor...",
+  media: "Görseller işleniyor...",
+};
+
 async function handleNewsSubmit(e) {
   e.preventDefault();
 
   const url = document.getElementById("newsUrl").value;
   const loading = document.getElementById("loading");
+  const loadingText = document.getElementById("loadingText");
   const submitBtn = e.target.querySelector('button[type="submit"]');
 
   loading.classList.remove("d-none");
+  loadingText.textContent = JOB_STATE_TEXT.queued;
   submitBtn.disabled = true;
 
   try {
-    const response = await fetch("/api/news/extract", {
+    const response = await fetch("/api/news/jobs", {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
@@ -38,15 +47,23 @@ async function handleNewsSubmit(e) {
       body: JSON.stringify({ url: url }),
     });
 
-    if (response.ok) {
-      const news = await response.json();
+    if (!response.ok) {
+      const error = await response.json();
+      showError(error.detail || "Haber çıkarılamadı");
+      return;
+    }
+
+    const job = await followJob(await response.json(), (state) => {
+      loadingText.textContent = JOB_STATE_TEXT[state] || loadingText.textContent;
+    });
+
+    if (job.state === "done") {
       showSuccess("Haber başarıyla çıkarıldı!");
       document.getElementById("newsUrl").value = "";
 
       $("#newsTable").DataTable().ajax.reload();
     } else {
-      const error = await response.json();
-      showError(error.detail || "Haber çıkarılamadı");
+      showError(job.error || "Haber çıkarılamadı");
     }
   } catch (error) {
     showError("Bağlantı hatası");
@@ -56,6 +73,47 @@ async function handleNewsSubmit(e) {
   }
 }
 
+// Reads the job's server-sent events until it is done or failed. fetch is used instead of
+// EventSource so the Authorization header can be sent; the job keeps running on the server
+// even if this page is closed.
+async function followJob(job, onState) {
+  while (job.state !== "done" && job.state !== "failed") {
+    onState(job.state);
+    const response = await fetch(`/api/news/jobs/${job.id}/events`, {
+      headers: {
+        Accept: "text/event-stream",
+        Authorization: `Bearer ${getToken()}`,
+      },
+    });
+    if (!response.ok) {
+      throw new Error(`Job stream failed: ${response.status}`);
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const event = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const data = event
+          .split("\n")
+          .filter((line) => line.startsWith("data: "))
+          .map((line) => line.slice(6))
+          .join("\n");
+        if (data) {
+          job = JSON.parse(data);
+          onState(job.state);
+        }
+      }
+    }
+  }
+  return job;
+}
+
 function initializeNewsTable() {
   $("#newsTable").DataTable({
     ajax: {
@@ -6,6 +6,8 @@ from app.database import get_db
 from app.models.user import User
 from app.models.news import NewsArticle
 from app.services.auth import AuthService
+from app.services.domain_profiles import domain_profiles
+from app.services.tags import TagService
 
 router = APIRouter()
 
@@ -82,4 +84,21 @@ async def get_top_domains(
     
     sorted_domains = sorted(domain_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
     
-    return [{"domain": domain, "count": count} for domain, count in sorted_domains]
\ No newline at end of file
+    return [{"domain": domain, "count": count} for domain, count in sorted_domains]
+
+@router.get("/stats/tags")
+async def get_top_tags(
+    limit: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(AuthService.get_current_user),
+    db: Session = Depends(get_db)
+):
+    
+    results = TagService.top_tags(db, current_user.id, limit)
+    
+    return [{"tag": result.name, "count": result.count} for result in results]
+
+@router.get("/stats/extraction-profiles")
+async def get_extraction_profiles(
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    return domain_profiles.snapshot()
\ No newline at end of file
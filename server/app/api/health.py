@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import get_db
+from app.lifecycle import in_flight
+from app.services.redis_client import get_redis
+
+router = APIRouter()
+
+def _check_database(db: Session) -> str:
+    try:
+        db.execute(text("SELECT 1"))
+        return "ok"
+    except Exception as e:
+        return f"error: {e}"
+
+def _check_task_queue() -> str:
+    try:
+        get_redis().ping()
+        return "ok"
+    except Exception as e:
+        return f"error: {e}"
+
+def _uses_task_queue() -> bool:
+    # Inline jobs and inline media never reach Redis, so its outage doesn't make this worker unfit
+    return settings.JOB_RUNNER == "celery" or settings.MEDIA_PROCESSING == "worker"
+
+@router.get("/health/live")
+def liveness():
+    """The process is up and serving requests"""
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+def readiness(db: Session = Depends(get_db)):
+    """Ready for traffic: database and, when work is sent to it, task queue reachable and not shutting down"""
+    checks = {"database": _check_database(db)}
+    if _uses_task_queue():
+        checks["task_queue"] = _check_task_queue()
+    ready = not in_flight.draining and all(result == "ok" for result in checks.values())
+    body = {
+        "status": "ready" if ready else "unavailable",
+        "draining": in_flight.draining,
+        "in_flight": in_flight.count,
+        "checks": checks,
+    }
+    return ORJSONResponse(body, status_code=200 if ready else 503)
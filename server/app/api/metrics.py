@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.database import engine
+from app.services.metrics import registry, Gauge
+from app.services.redis_client import get_redis
+
+router = APIRouter()
+
+def _db_pool_stats():
+    pool = engine.pool
+    stats = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[(name,)] = getattr(pool, name)()
+    return stats
+
+def _celery_queue_lengths():
+    import redis
+
+    client = get_redis()
+    try:
+        return {(queue,): client.llen(queue) for queue in settings.CELERY_QUEUES}
+    except redis.RedisError:
+        return {}
+
+registry.register(Gauge(
+    "db_pool_connections",
+    "Database connection pool state",
+    ("state",),
+    collect=_db_pool_stats,
+))
+registry.register(Gauge(
+    "celery_queue_length",
+    "Messages waiting in each Celery queue",
+    ("queue",),
+    collect=_celery_queue_lengths,
+))
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,14 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import and_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from app.database import get_db
 from app.models.user import User
 from app.models.news import NewsArticle
-from app.schemas.news import NewsCreate, NewsResponse
+from app.models.job import ExtractionJob, FINAL_STATES
+from app.schemas.news import (
+    NewsCreate, NewsResponse, NewsListItem, NewsSearchResponse, JobResponse,
+    BulkDeleteRequest, BulkDeleteResponse, RetentionPolicy, RevisionSummary, RevisionVersion,
+)
 from app.services.auth import AuthService
 from app.services.advanced_extractor import AdvancedNewsExtractor
-from app.services.media_processor import MediaProcessor
+from app.services.search import SearchService
+from app.services.ingest import ArticleIngest
+from app.services.jobs import JobService, job_runner
+from app.services.news_queries import NewsQueryService
+from app.services.export import EXPORT_FORMATS, ArticleExporter
+from app.services.retention import ArticleDeletion
+from app.services.refresh import RevisionHistory
 from app.config import settings
+from app.services.metrics import stage
+from app.lifecycle import in_flight
 import asyncio
 
 router = APIRouter()
@@ -17,98 +32,235 @@ router = APIRouter()
 async def extract_news(
     news_data: NewsCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    current_user: User = Depends(AuthService.get_current_user),
+    _tracked: None = Depends(in_flight.dependency)
 ):
     # Use the advanced extractor for better metadata extraction
     extracted = await AdvancedNewsExtractor.extract_with_metadata(str(news_data.url))
     
-    if not extracted["success"]:
-        raise HTTPException(status_code=400, detail=extracted["error"])
+    if not extracted.success:
+        if extracted.retry_after is not None:
+            # The origin is throttled or failing; tell the client when to come back
+            raise HTTPException(
+                status_code=503,
+                detail=extracted.error,
+                headers={"Retry-After": str(max(int(extracted.retry_after + 0.999), 1))}
+            )
+        raise HTTPException(status_code=400, detail=extracted.error)
     
-    # Extract enhanced metadata
-    meta_keywords = None
-    if "tags" in extracted and extracted["tags"]:
-        import json
-        meta_keywords = json.dumps(extracted["tags"])
+    db_news, duplicate_of = ArticleIngest.build(db, str(news_data.url), current_user.id, extracted)
+    # The inline watermark downloads and renders the image; in a thread so the loop keeps serving
+    queue_watermark = await asyncio.to_thread(ArticleIngest.process_media, db_news, duplicate_of)
     
-    meta_lang = extracted.get("language")
+    with stage("db_commit", str(news_data.url)):
+        db.add(db_news)
+        db.commit()
+        db.refresh(db_news)
     
-    # Get video URL
-    video_url = extracted.get("video_url")
+    if queue_watermark:
+        ArticleIngest.queue_media(db_news)
     
-    db_news = NewsArticle(
-        url=str(news_data.url),
-        title=extracted["title"],
-        content=extracted["content"],
-        publish_date=extracted["publish_date"] if extracted["publish_date"] else None,
-        image_url=extracted["image_url"],
-        video_url=video_url,
-        meta_keywords=meta_keywords,
-        meta_lang=meta_lang,
-        user_id=current_user.id
-    )
+    return db_news
+
+@router.get("/", response_model=List[NewsListItem])
+async def get_user_news(
+    tag: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    # Rows are already plain dicts of the declared columns, so skip response_model validation
+    return ORJSONResponse(NewsQueryService.list_for_user(db, current_user.id, tag))
+
+@router.get("/search", response_model=NewsSearchResponse)
+async def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    if db.bind.dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Search is only available on SQLite")
     
-    # Process image if available
-    if extracted["image_url"]:
-        processed_image = MediaProcessor.add_watermark(
-            extracted["image_url"], 
-            settings.WATERMARK_TEXT
-        )
-        db_news.processed_image_url = processed_image
+    try:
+        return ORJSONResponse(SearchService.search(db, current_user.id, q, limit=limit, cursor=cursor))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/export")
+async def export_news(
+    format: str = Query("ndjson"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    domain: Optional[str] = Query(None, max_length=253),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    """The user's whole archive, streamed; since/until bound created_at, domain matches the URL host"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format, use one of: {', '.join(EXPORT_FORMATS)}")
+    if format == "parquet" and not ArticleExporter.parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
     
-    # Process video if available
-    if video_url:
-        try:
-            # For now, we'll just store the video URL
-            # In the future, you can add video processing here
-            db_news.processed_video_url = video_url
-        except Exception as e:
-            print(f"Video processing error: {e}")
+    media_type, extension = EXPORT_FORMATS[format]
+    rows = ArticleExporter.rows(db, current_user.id, since=since, until=until, domain=domain)
+    return StreamingResponse(
+        ArticleExporter.stream(format, rows),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="news-export.{extension}"'},
+    )
+
+@router.post("/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_news(
+    request: BulkDeleteRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    """Delete the user's articles matching every given filter, in batches of DELETE_BATCH_SIZE"""
+    conditions = [NewsArticle.user_id == current_user.id]
+    if request.ids is not None:
+        conditions.append(NewsArticle.id.in_(request.ids))
+    if request.before is not None:
+        conditions.append(NewsArticle.created_at < request.before)
+    if request.domain:
+        conditions.append(NewsQueryService.domain_filter(request.domain))
+    if len(conditions) == 1:
+        raise HTTPException(status_code=400, detail="Give ids, before or domain")
     
-    db.add(db_news)
+    # Batched DELETEs, commits and file removals; in a thread, as the retention loop runs them
+    return {"deleted": await asyncio.to_thread(ArticleDeletion.delete_where, db, and_(*conditions))}
+
+@router.get("/retention", response_model=RetentionPolicy)
+async def get_retention(current_user: User = Depends(AuthService.get_current_user)):
+    return current_user
+
+@router.put("/retention", response_model=RetentionPolicy)
+async def set_retention(
+    policy: RetentionPolicy,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    """Keep articles for retention_days; older ones are deleted on the next retention run"""
+    current_user.retention_days = policy.retention_days
     db.commit()
-    db.refresh(db_news)
-    
-    return db_news
+    return current_user
 
-@router.get("/", response_model=List[NewsResponse])
-async def get_user_news(
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_extraction_job(
+    news_data: NewsCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(AuthService.get_current_user)
 ):
-    return db.query(NewsArticle).filter(NewsArticle.user_id == current_user.id).all()
+    # Submitting the same URL again returns the existing job instead of downloading it twice
+    job, queued = JobService.submit(db, current_user.id, str(news_data.url))
+    if queued:
+        job_runner.schedule(job.id)
+    return job
 
-@router.get("/{news_id}", response_model=NewsResponse)
-async def get_news_detail(
-    news_id: int,
+def _get_user_job(db: Session, job_id: int, user_id: int) -> ExtractionJob:
+    job = db.query(ExtractionJob).filter(
+        ExtractionJob.id == job_id,
+        ExtractionJob.user_id == user_id
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_extraction_job(
+    job_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(AuthService.get_current_user)
 ):
+    return _get_user_job(db, job_id, current_user.id)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_extraction_job(
+    job_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    """Server-sent events with the job's state on every change, until it is done or failed"""
+    _get_user_job(db, job_id, current_user.id)
+    
+    async def events():
+        last = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            # End the read transaction so the next poll sees the worker's commits
+            db.rollback()
+            job = db.get(ExtractionJob, job_id)
+            if job is None:
+                break
+            payload = JobResponse.model_validate(job).model_dump_json()
+            if payload != last:
+                yield f"data: {payload}\n\n"
+                last, idle = payload, 0.0
+            elif idle >= settings.JOB_EVENTS_KEEPALIVE:
+                # Comment line that keeps proxies from closing an idle stream
+                yield ": ping\n\n"
+                idle = 0.0
+            if job.state in FINAL_STATES:
+                break
+            await asyncio.sleep(settings.JOB_EVENTS_POLL_INTERVAL)
+            idle += settings.JOB_EVENTS_POLL_INTERVAL
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _get_user_news(db: Session, news_id: int, user_id: int) -> NewsArticle:
     news = db.query(NewsArticle).filter(
         NewsArticle.id == news_id,
-        NewsArticle.user_id == current_user.id
+        NewsArticle.user_id == user_id
     ).first()
-    
     if not news:
         raise HTTPException(status_code=404, detail="News not found")
-    
     return news
 
+@router.get("/{news_id}", response_model=NewsResponse)
+async def get_news_detail(
+    news_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    return _get_user_news(db, news_id, current_user.id)
+
+@router.get("/{news_id}/revisions", response_model=List[RevisionSummary])
+async def get_news_revisions(
+    news_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    """Versions saved by the refresh scheduler, newest first"""
+    return RevisionHistory.summary(db, _get_user_news(db, news_id, current_user.id))
+
+@router.get("/{news_id}/revisions/{revision}", response_model=RevisionVersion)
+async def get_news_revision(
+    news_id: int,
+    revision: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(AuthService.get_current_user)
+):
+    version = RevisionHistory.version(db, _get_user_news(db, news_id, current_user.id), revision)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return version
+
 @router.delete("/{news_id}")
 async def delete_news(
     news_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(AuthService.get_current_user)
 ):
-    news = db.query(NewsArticle).filter(
-        NewsArticle.id == news_id,
-        NewsArticle.user_id == current_user.id
-    ).first()
+    deleted = ArticleDeletion.delete_where(
+        db, and_(NewsArticle.id == news_id, NewsArticle.user_id == current_user.id)
+    )
     
-    if not news:
+    if not deleted:
         raise HTTPException(status_code=404, detail="News not found")
     
-    db.delete(news)
-    db.commit()
-    
     return {"message": "News deleted successfully"}
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,5 +11,91 @@ class Settings:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./tgrt_full_stack_technical_task.db")
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
     WATERMARK_TEXT = os.getenv("WATERMARK_TEXT", "News Extractor")
+    LANGUAGE_SAMPLE_CHARS = int(os.getenv("LANGUAGE_SAMPLE_CHARS", "2000"))
+    LANGUAGE_CACHE_SIZE = int(os.getenv("LANGUAGE_CACHE_SIZE", "10000"))
+    DUPLICATE_MIN_WORDS = int(os.getenv("DUPLICATE_MIN_WORDS", "20"))
+    DUPLICATE_MIN_SIMILARITY = float(os.getenv("DUPLICATE_MIN_SIMILARITY", "0.8"))
+    SKIP_MEDIA_FOR_DUPLICATES = os.getenv("SKIP_MEDIA_FOR_DUPLICATES", "True").lower() in ("1", "true", "yes")
+    DOMAIN_PROFILES_PATH = os.getenv("DOMAIN_PROFILES_PATH", "domain_profiles.json")
+    DOMAIN_PROFILE_LEARNING_SAMPLES = int(os.getenv("DOMAIN_PROFILE_LEARNING_SAMPLES", "5"))
+    CELERY_QUEUES = os.getenv("CELERY_QUEUES", "extract,image,video").split(",")
+    CELERY_RESULT_EXPIRES = int(os.getenv("CELERY_RESULT_EXPIRES", "3600"))
+    DOMAIN_PROFILE_REPROBE_INTERVAL = int(os.getenv("DOMAIN_PROFILE_REPROBE_INTERVAL", "50"))
+    BODY_COMPRESSION_LEVEL = int(os.getenv("BODY_COMPRESSION_LEVEL", "6"))
+    BODY_COMPRESSION_MIN_BYTES = int(os.getenv("BODY_COMPRESSION_MIN_BYTES", "256"))
+    GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+    STATIC_DIR = os.getenv("STATIC_DIR", "static")
+    # "inline": the API process watermarks images itself; "worker": it hands them to the Celery media worker
+    MEDIA_PROCESSING = os.getenv("MEDIA_PROCESSING", "inline")
+    MEDIA_WORKER_PRELOAD = os.getenv("MEDIA_WORKER_PRELOAD", "True").lower() in ("1", "true", "yes")
+    # gunicorn masters and Celery workers load newspaper, stopwords and language profiles before forking
+    EXTRACTION_PRELOAD = os.getenv("EXTRACTION_PRELOAD", "True").lower() in ("1", "true", "yes")
+    STARTUP_LOCK_PATH = os.getenv("STARTUP_LOCK_PATH", os.path.join(tempfile.gettempdir(), "news-extractor-startup.lock"))
+    SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "30"))
+    # Seconds a gunicorn worker keeps serving, with /health/ready at 503, between SIGTERM and closing its listener
+    SHUTDOWN_READY_DELAY = float(os.getenv("SHUTDOWN_READY_DELAY", "5"))
+    # "inline": API workers run extraction jobs in their event loop; "celery": the extract queue runs them
+    JOB_RUNNER = os.getenv("JOB_RUNNER", "inline")
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "4"))
+    JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "5"))
+    JOB_RETRY_BACKOFF_MAX = float(os.getenv("JOB_RETRY_BACKOFF_MAX", "300"))
+    # A job whose worker hasn't advanced it for this long is claimed again by another worker
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    JOB_SWEEP_INTERVAL = float(os.getenv("JOB_SWEEP_INTERVAL", "30"))
+    JOB_EVENTS_POLL_INTERVAL = float(os.getenv("JOB_EVENTS_POLL_INTERVAL", "0.5"))
+    # Outbound fetch governor, applied per domain in each process
+    FETCH_CONNECT_TIMEOUT = float(os.getenv("FETCH_CONNECT_TIMEOUT", "5"))
+    FETCH_READ_TIMEOUT = float(os.getenv("FETCH_READ_TIMEOUT", "15"))
+    FETCH_TOTAL_TIMEOUT = float(os.getenv("FETCH_TOTAL_TIMEOUT", "30"))
+    # Page bodies are read up to this many bytes; larger declared sizes are refused outright
+    FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
+    FETCH_DOMAIN_RATE = float(os.getenv("FETCH_DOMAIN_RATE", "2"))
+    FETCH_DOMAIN_BURST = float(os.getenv("FETCH_DOMAIN_BURST", "5"))
+    FETCH_INITIAL_CONCURRENCY = int(os.getenv("FETCH_INITIAL_CONCURRENCY", "2"))
+    FETCH_MIN_CONCURRENCY = int(os.getenv("FETCH_MIN_CONCURRENCY", "1"))
+    FETCH_MAX_CONCURRENCY = int(os.getenv("FETCH_MAX_CONCURRENCY", "8"))
+    FETCH_LATENCY_TOLERANCE = float(os.getenv("FETCH_LATENCY_TOLERANCE", "2.0"))
+    FETCH_CIRCUIT_FAILURES = int(os.getenv("FETCH_CIRCUIT_FAILURES", "5"))
+    FETCH_CIRCUIT_RESET = float(os.getenv("FETCH_CIRCUIT_RESET", "30"))
+    # Requests that would have to wait longer than this for their turn are rejected instead
+    FETCH_MAX_WAIT = float(os.getenv("FETCH_MAX_WAIT", "10"))
+    JOB_EVENTS_KEEPALIVE = float(os.getenv("JOB_EVENTS_KEEPALIVE", "15"))
+    # Batch extraction (app.services.batch_extractor): URLs in flight and threads parsing pages
+    BATCH_EXTRACT_CONCURRENCY = int(os.getenv("BATCH_EXTRACT_CONCURRENCY", "16"))
+    BATCH_PARSE_WORKERS = int(os.getenv("BATCH_PARSE_WORKERS", str(min(os.cpu_count() or 1, 8))))
+    # Article export: rows fetched per database round trip, and bytes per streamed chunk
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+    EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+    # Bulk deletes and retention remove this many articles per transaction, pausing between batches
+    DELETE_BATCH_SIZE = int(os.getenv("DELETE_BATCH_SIZE", "500"))
+    RETENTION_BATCH_PAUSE = float(os.getenv("RETENTION_BATCH_PAUSE", "0.05"))
+    # Seconds between retention runs; inline API workers run them when JOB_RUNNER=inline, Celery beat otherwise
+    RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", "3600"))
+    # Seconds after the first extraction at which an article is fetched again; empty disables refreshing
+    REFRESH_SCHEDULE = [int(step) for step in os.getenv("REFRESH_SCHEDULE", "300,1800,7200,86400").split(",") if step.strip()]
+    # How often due articles are looked for (0 disables the inline loop), and how many are taken per pass
+    REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL", "60"))
+    REFRESH_BATCH_SIZE = int(os.getenv("REFRESH_BATCH_SIZE", "200"))
+    # A claimed article whose worker died is picked up again after this long
+    REFRESH_LEASE_SECONDS = int(os.getenv("REFRESH_LEASE_SECONDS", "600"))
+    # Process-wide DNS cache for outbound fetches: seconds an answer (or a failed lookup) is reused,
+    # names kept, and lookups running at once
+    DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+    DNS_NEGATIVE_TTL = float(os.getenv("DNS_NEGATIVE_TTL", "30"))
+    DNS_CACHE_SIZE = int(os.getenv("DNS_CACHE_SIZE", "10000"))
+    DNS_MAX_LOOKUPS = int(os.getenv("DNS_MAX_LOOKUPS", "16"))
+    # robots.txt is checked before every article fetch, as this user agent; "local" keeps parsed rules
+    # as files in ROBOTS_CACHE_DIR (shared by workers on one host), "redis" shares them through REDIS_URL
+    ROBOTS_ENABLED = os.getenv("ROBOTS_ENABLED", "True").lower() in ("1", "true", "yes")
+    ROBOTS_USER_AGENT = os.getenv("ROBOTS_USER_AGENT", "NewsExtractor")
+    ROBOTS_CACHE = os.getenv("ROBOTS_CACHE", "local")
+    ROBOTS_CACHE_DIR = os.getenv("ROBOTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "news-extractor-robots"))
+    # Seconds a robots.txt (or its absence) is trusted, and how soon a failed download is retried
+    ROBOTS_TTL = int(os.getenv("ROBOTS_TTL", "86400"))
+    ROBOTS_ERROR_TTL = int(os.getenv("ROBOTS_ERROR_TTL", "600"))
+    # Crawl-delay values above this are capped, so one host can't stall its queue indefinitely
+    ROBOTS_MAX_CRAWL_DELAY = float(os.getenv("ROBOTS_MAX_CRAWL_DELAY", "60"))
+    # Below this much article text, the page's embedded framework state (__NEXT_DATA__ etc.) is tried
+    EMBEDDED_STATE_MIN_CHARS = int(os.getenv("EMBEDDED_STATE_MIN_CHARS", "200"))
 
 settings = Settings()
\ No newline at end of file
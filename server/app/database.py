@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+import sqlite3
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import settings
 
@@ -6,6 +8,17 @@ engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread":
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def register_sqlite_functions(dbapi_connection):
+    """SQL functions the schema relies on; the search index decompresses article bodies with them"""
+    from app.services.compression import BodyCodec
+    
+    dbapi_connection.create_function("article_body_text", 2, BodyCodec.sql_decode, deterministic=True)
+
+@event.listens_for(Engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        register_sqlite_functions(dbapi_connection)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -13,5 +26,10 @@ def get_db():
     finally:
         db.close()
 
-def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+def create_tables(bind=None):
+    from app.models.news import ensure_search_index
+    
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        ensure_search_index(connection)
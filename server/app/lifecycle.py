@@ -0,0 +1,88 @@
+import asyncio
+import os
+from contextlib import contextmanager
+from sqlalchemy.engine import make_url
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: workers are not forked there, so there is nothing to serialize
+    fcntl = None
+
+
+class InFlight:
+    """Counts running extractions so a shutting down worker can wait for them to finish"""
+
+    def __init__(self):
+        self.count = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @contextmanager
+    def track(self):
+        self.count += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self.count -= 1
+            if self.count == 0:
+                self._idle.set()
+
+    def dependency(self):
+        """FastAPI dependency form of track(), released once the response is sent"""
+        with self.track():
+            yield
+
+    async def drain(self, timeout: float) -> bool:
+        """Stop reporting ready and wait for tracked work; False if it is still running at the timeout"""
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+in_flight = InFlight()
+
+
+@contextmanager
+def startup_lock():
+    """Serialize one-time startup work between workers of the same host"""
+    if fcntl is None:
+        yield
+        return
+    with open(settings.STARTUP_LOCK_PATH, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def runtime_directories():
+    directories = [
+        settings.STATIC_DIR,
+        os.path.join(settings.STATIC_DIR, "images"),
+        os.path.join(settings.STATIC_DIR, "videos"),
+    ]
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+        directories.append(os.path.dirname(os.path.abspath(url.database)))
+    return directories
+
+
+def prepare_runtime():
+    """Startup work for a worker: directories, schema migrations and shared caches"""
+    from app.database import engine
+    from app.migrations.runner import run_migrations
+    from app.services.language_detector import language_detector
+
+    for directory in runtime_directories():
+        os.makedirs(directory, exist_ok=True)
+    # The first worker applies pending migrations; the others then only read the version
+    with startup_lock():
+        run_migrations(engine)
+    language_detector.load()
@@ -1,11 +1,53 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from app.api import auth, news, analytics
-from app.database import create_tables
-import os
+from contextlib import asynccontextmanager
+from starlette.datastructures import Headers
+from app.api import auth, news, analytics, metrics, health
+from app.config import settings
+from app.database import engine
+from app.lifecycle import in_flight, prepare_runtime
+from app.services.jobs import job_runner
+from app.services.retention import RetentionService
+from app.services.refresh import RefreshScheduler
+from app.services.metrics import http_requests_total, http_request_duration_seconds
+import asyncio
+import logging
+import time
 
-app = FastAPI(title="News Content Extractor", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in every worker after the fork, so nothing here is shared between processes
+    prepare_runtime()
+    # Inline runners pick up jobs left queued or half-done by a previous run and keep sweeping
+    # for jobs whose retry is due or whose worker died. With Celery the startup sweep runs once
+    # in the gunicorn master (when_ready) and beat requeues stalled jobs after that.
+    sweeper = retention = refresher = None
+    if settings.JOB_RUNNER == "inline":
+        sweeper = asyncio.create_task(job_runner.sweep_forever(settings.JOB_SWEEP_INTERVAL))
+        # Without Celery beat, API workers enforce retention policies and refresh articles themselves
+        if settings.RETENTION_INTERVAL > 0:
+            retention = asyncio.create_task(RetentionService.enforce_forever(settings.RETENTION_INTERVAL))
+        if settings.REFRESH_INTERVAL > 0:
+            refresher = asyncio.create_task(RefreshScheduler.run_forever(settings.REFRESH_INTERVAL))
+    yield
+    for task in (sweeper, retention, refresher):
+        if task is not None:
+            task.cancel()
+    if not await in_flight.drain(settings.SHUTDOWN_DRAIN_TIMEOUT):
+        logger.warning("Shutting down with %d extractions still running", in_flight.count)
+    engine.dispose()
+
+app = FastAPI(
+    title="News Content Extractor",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,17 +56,38 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    """Leaves server-sent event streams uncompressed; gzip would hold events back in its buffer"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "text/event-stream" in Headers(scope=scope).get("accept", ""):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
-app.mount("/static", StaticFiles(directory="/app/static"), name="static")
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
 
-# Ensure database directory exists
-os.makedirs("/app/data", exist_ok=True)
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        http_request_duration_seconds.observe(time.perf_counter() - started, request.method, path)
+        http_requests_total.inc(request.method, path, str(status_code))
 
-create_tables()
+# The directory is created by prepare_runtime() at startup
+app.mount("/static", StaticFiles(directory=settings.STATIC_DIR, check_dir=False), name="static")
 
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(news.router, prefix="/api/news", tags=["news"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(metrics.router, tags=["metrics"])
+app.include_router(health.router, tags=["health"])
 
 @app.get("/")
 async def read_root():
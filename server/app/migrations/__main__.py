@@ -0,0 +1,23 @@
+import argparse
+from app.database import engine
+from app.models import news, user  # noqa: F401  (register mappers)
+from app.migrations.runner import current_version, run_migrations
+from app.migrations.versions import MIGRATIONS
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--status", action="store_true", help="only print the current and latest version")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per backfill transaction")
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between backfill batches")
+    args = parser.parse_args()
+    
+    with engine.connect() as connection:
+        version = current_version(connection)
+    print(f"Current version: {version if version is not None else 'unversioned'}, latest: {MIGRATIONS[-1].VERSION}")
+    
+    if not args.status:
+        version = run_migrations(engine, batch_size=args.batch_size, pause=args.pause)
+        print(f"Database is at version {version}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+from app.migrations.runner import add_column_if_missing
+
+VERSION = 1
+DESCRIPTION = "add meta_keywords and meta_lang to news_articles"
+
+def upgrade(connection):
+    add_column_if_missing(connection, "news_articles", "meta_keywords", "TEXT")
+    add_column_if_missing(connection, "news_articles", "meta_lang", "VARCHAR")
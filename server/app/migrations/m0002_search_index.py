@@ -0,0 +1,46 @@
+VERSION = 2
+DESCRIPTION = "full-text search index over news_articles"
+
+# Index as first shipped, over the inline news_articles.content column. Migration 6 drops it
+# and migration 7 rebuilds it over the compressed article bodies.
+LEGACY_SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_articles_fts USING fts5(
+        title, content, meta_keywords,
+        content='news_articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_articles_fts_insert AFTER INSERT ON news_articles BEGIN
+        INSERT INTO news_articles_fts(rowid, title, content, meta_keywords)
+        VALUES (new.id, new.title, new.content, new.meta_keywords);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_articles_fts_delete AFTER DELETE ON news_articles BEGIN
+        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content, meta_keywords)
+        VALUES ('delete', old.id, old.title, old.content, old.meta_keywords);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_articles_fts_update AFTER UPDATE OF title, content, meta_keywords ON news_articles BEGIN
+        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content, meta_keywords)
+        VALUES ('delete', old.id, old.title, old.content, old.meta_keywords);
+        INSERT INTO news_articles_fts(rowid, title, content, meta_keywords)
+        VALUES (new.id, new.title, new.content, new.meta_keywords);
+    END
+    """,
+]
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_articles_fts'"
+    ).first()
+    if exists:
+        return
+    for statement in LEGACY_SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO news_articles_fts(news_articles_fts) VALUES ('rebuild')")
@@ -0,0 +1,8 @@
+from app.models.fingerprint import ArticleFingerprint, ArticleFingerprintBand
+
+VERSION = 3
+DESCRIPTION = "near-duplicate fingerprint tables"
+
+def upgrade(connection):
+    ArticleFingerprint.__table__.create(connection, checkfirst=True)
+    ArticleFingerprintBand.__table__.create(connection, checkfirst=True)
@@ -0,0 +1,33 @@
+from app.migrations.runner import BatchedBackfill
+from app.models.news import NewsArticle
+from app.models.tag import Tag, article_tags
+from app.services.tags import TagService
+
+VERSION = 4
+DESCRIPTION = "normalized tags tables backfilled from meta_keywords"
+
+def upgrade(connection):
+    Tag.__table__.create(connection, checkfirst=True)
+    article_tags.create(connection, checkfirst=True)
+
+def _fetch(session, after_id, limit):
+    return session.query(NewsArticle.id, NewsArticle.meta_keywords).filter(
+        NewsArticle.id > after_id
+    ).order_by(NewsArticle.id).limit(limit).all()
+
+def _process(session, rows):
+    links = []
+    for row in rows:
+        names = TagService.parse_meta_keywords(row.meta_keywords)
+        if not names:
+            continue
+        # Skip links that already exist so a re-run after a crash doesn't fail
+        tagged = {tag_id for (tag_id,) in session.query(article_tags.c.tag_id).filter(article_tags.c.article_id == row.id)}
+        for tag in TagService.get_or_create(session, names):
+            if tag.id not in tagged:
+                links.append({"article_id": row.id, "tag_id": tag.id})
+    if links:
+        session.execute(article_tags.insert(), links)
+
+def backfill(engine, batch_size=500, pause=0.05):
+    BatchedBackfill("tags_from_meta_keywords", batch_size, pause).run(engine, _fetch, _process)
@@ -0,0 +1,7 @@
+VERSION = 5
+DESCRIPTION = "index news_articles by user and creation time"
+
+def upgrade(connection):
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_news_articles_user_id_created_at ON news_articles (user_id, created_at)"
+    )
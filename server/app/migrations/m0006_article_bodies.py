@@ -0,0 +1,38 @@
+from sqlalchemy import text
+from app.migrations.runner import BatchedBackfill
+from app.models.article_body import ArticleBody
+
+VERSION = 6
+DESCRIPTION = "move article bodies into compressed article_bodies rows"
+
+def upgrade(connection):
+    ArticleBody.__table__.create(connection, checkfirst=True)
+    if connection.dialect.name == "sqlite":
+        # The old index reads news_articles.content; it is rebuilt over the bodies in migration 7
+        for trigger in ("news_articles_fts_insert", "news_articles_fts_delete", "news_articles_fts_update"):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+        connection.exec_driver_sql("DROP TABLE IF EXISTS news_articles_fts")
+
+def _fetch(session, after_id, limit):
+    return session.execute(
+        text("SELECT id, content FROM news_articles WHERE id > :after_id ORDER BY id LIMIT :limit"),
+        {"after_id": after_id, "limit": limit},
+    ).all()
+
+def _process(session, rows):
+    bodies = []
+    for row in rows:
+        if row.content is None:
+            continue
+        body = ArticleBody.from_text(row.content)
+        bodies.append({"article_id": row.id, "codec": body.codec, "body": body.body, "size": body.size})
+    if bodies:
+        session.execute(ArticleBody.__table__.insert().prefix_with("OR REPLACE", dialect="sqlite"), bodies)
+    # Clearing the inline copy now keeps the column drop in migration 7 cheap
+    session.execute(
+        text("UPDATE news_articles SET content = NULL WHERE id >= :first AND id <= :last"),
+        {"first": rows[0].id, "last": rows[-1].id},
+    )
+
+def backfill(engine, batch_size=500, pause=0.05):
+    BatchedBackfill("article_bodies_from_content", batch_size, pause).run(engine, _fetch, _process)
@@ -0,0 +1,10 @@
+from app.migrations.runner import column_names
+from app.models.news import ensure_search_index
+
+VERSION = 7
+DESCRIPTION = "drop news_articles.content and index the compressed bodies"
+
+def upgrade(connection):
+    if "content" in column_names(connection, "news_articles"):
+        connection.exec_driver_sql("ALTER TABLE news_articles DROP COLUMN content")
+    ensure_search_index(connection)
@@ -0,0 +1,7 @@
+from app.models.job import ExtractionJob
+
+VERSION = 8
+DESCRIPTION = "extraction_jobs table for queued extractions"
+
+def upgrade(connection):
+    ExtractionJob.__table__.create(connection, checkfirst=True)
@@ -0,0 +1,7 @@
+from app.migrations.runner import add_column_if_missing
+
+VERSION = 9
+DESCRIPTION = "add retention_days to users"
+
+def upgrade(connection):
+    add_column_if_missing(connection, "users", "retention_days", "INTEGER")
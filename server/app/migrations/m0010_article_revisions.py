@@ -0,0 +1,8 @@
+from app.models.revision import ArticleRefresh, ArticleRevision
+
+VERSION = 10
+DESCRIPTION = "article_refresh and article_revisions tables for re-extraction"
+
+def upgrade(connection):
+    ArticleRefresh.__table__.create(connection, checkfirst=True)
+    ArticleRevision.__table__.create(connection, checkfirst=True)
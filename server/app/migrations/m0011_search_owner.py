@@ -0,0 +1,14 @@
+from app.models.news import drop_search_index, ensure_search_index
+
+VERSION = 11
+DESCRIPTION = "owner column in the search index so searches only rank the user's articles"
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    columns = [row[1] for row in connection.exec_driver_sql("PRAGMA table_info(news_articles_fts)")]
+    if "owner" in columns:
+        return
+    # Triggers and the source view change with the index, so all of it is recreated and rebuilt
+    drop_search_index(connection)
+    ensure_search_index(connection)
@@ -0,0 +1,30 @@
+from collections import defaultdict
+from sqlalchemy import text
+from app.services.tags import TagService
+
+VERSION = 12
+DESCRIPTION = "merge tags that differ only in case into one case-folded tag"
+
+def upgrade(connection):
+    groups = defaultdict(list)
+    for tag_id, name in connection.execute(text("SELECT id, name FROM tags ORDER BY id")):
+        groups[TagService.fold(name)].append((tag_id, name))
+    
+    for folded, tags in groups.items():
+        if len(tags) == 1 and tags[0][1] == folded:
+            continue
+        # Keep the tag already spelled in folded form, else the oldest; move the others' links onto it
+        keep = next((tag_id for tag_id, name in tags if name == folded), tags[0][0])
+        for tag_id, _ in tags:
+            if tag_id == keep:
+                continue
+            params = {"keep": keep, "merged": tag_id}
+            connection.execute(text("""
+                INSERT INTO article_tags (article_id, tag_id)
+                SELECT article_id, :keep FROM article_tags
+                WHERE tag_id = :merged
+                  AND article_id NOT IN (SELECT article_id FROM article_tags WHERE tag_id = :keep)
+            """), params)
+            connection.execute(text("DELETE FROM article_tags WHERE tag_id = :merged"), params)
+            connection.execute(text("DELETE FROM tags WHERE id = :merged"), params)
+        connection.execute(text("UPDATE tags SET name = :name WHERE id = :keep"), {"name": folded, "keep": keep})
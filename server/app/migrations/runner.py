@@ -0,0 +1,138 @@
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+SCHEMA_VERSION_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description VARCHAR NOT NULL,
+        applied_at DATETIME NOT NULL
+    )
+"""
+
+MIGRATION_PROGRESS_DDL = """
+    CREATE TABLE IF NOT EXISTS migration_progress (
+        name VARCHAR PRIMARY KEY,
+        last_id INTEGER NOT NULL,
+        updated_at DATETIME NOT NULL
+    )
+"""
+
+
+def current_version(connection: Connection) -> Optional[int]:
+    """Applied schema version, None when the schema_version table doesn't exist yet"""
+    if not inspect(connection).has_table("schema_version"):
+        return None
+    return connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+
+
+def _stamp(connection: Connection, version: int, description: str) -> None:
+    connection.execute(
+        text("INSERT INTO schema_version (version, description, applied_at) VALUES (:version, :description, :applied_at)"),
+        {"version": version, "description": description, "applied_at": datetime.utcnow()},
+    )
+
+
+def column_names(connection: Connection, table: str) -> List[str]:
+    return [column["name"] for column in inspect(connection).get_columns(table)]
+
+
+def add_column_if_missing(connection: Connection, table: str, column: str, ddl_type: str) -> None:
+    if column not in column_names(connection, table):
+        connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}")
+
+
+class BatchedBackfill:
+    """Resumable, throttled backfill that walks a table by primary key in small transactions.
+
+    Each batch commits together with its progress row, so an interrupted run resumes after
+    the last committed batch and writers are only blocked for the duration of one batch.
+    """
+
+    def __init__(self, name: str, batch_size: int = 500, pause: float = 0.05):
+        self.name = name
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def _last_id(self, session: Session) -> int:
+        last_id = session.execute(
+            text("SELECT last_id FROM migration_progress WHERE name = :name"), {"name": self.name}
+        ).scalar()
+        return last_id or 0
+
+    def _save_progress(self, session: Session, last_id: int) -> None:
+        params = {"name": self.name, "last_id": last_id, "updated_at": datetime.utcnow()}
+        updated = session.execute(
+            text("UPDATE migration_progress SET last_id = :last_id, updated_at = :updated_at WHERE name = :name"),
+            params,
+        ).rowcount
+        if not updated:
+            session.execute(
+                text("INSERT INTO migration_progress (name, last_id, updated_at) VALUES (:name, :last_id, :updated_at)"),
+                params,
+            )
+
+    def run(self, engine: Engine, fetch_batch: Callable[[Session, int, int], list],
+            process_batch: Callable[[Session, list], None], id_of: Callable = lambda row: row.id) -> int:
+        """fetch_batch(session, after_id, limit) returns rows ordered by id; returns rows processed"""
+        with engine.begin() as connection:
+            connection.exec_driver_sql(MIGRATION_PROGRESS_DDL)
+
+        processed = 0
+        while True:
+            with Session(engine) as session, session.begin():
+                last_id = self._last_id(session)
+                rows = fetch_batch(session, last_id, self.batch_size)
+                if not rows:
+                    session.execute(text("DELETE FROM migration_progress WHERE name = :name"), {"name": self.name})
+                    return processed
+                process_batch(session, rows)
+                self._save_progress(session, id_of(rows[-1]))
+            processed += len(rows)
+            print(f"{self.name}: {processed} rows")
+            if self.pause:
+                time.sleep(self.pause)
+
+
+def run_migrations(engine: Engine, batch_size: int = 500, pause: float = 0.05) -> int:
+    """Bring the database to the latest schema version and return that version"""
+    from app.database import create_tables
+    from app.migrations import versions
+
+    latest = versions.MIGRATIONS[-1].VERSION
+
+    with engine.connect() as connection:
+        version = current_version(connection)
+        existing_tables = inspect(connection).get_table_names() if version is None else None
+
+    if version == latest:
+        return version
+
+    if version is None and "news_articles" not in existing_tables:
+        # Fresh database: build the current schema directly and stamp it
+        create_tables(engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql(SCHEMA_VERSION_DDL)
+            _stamp(connection, latest, "initial schema")
+        return latest
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql(SCHEMA_VERSION_DDL)
+
+    # Databases created before versioning start at 0; every migration checks before it alters
+    for migration in versions.MIGRATIONS:
+        if migration.VERSION <= (version or 0):
+            continue
+        print(f"Applying migration {migration.VERSION}: {migration.DESCRIPTION}")
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+        if hasattr(migration, "backfill"):
+            migration.backfill(engine, batch_size=batch_size, pause=pause)
+        with engine.begin() as connection:
+            _stamp(connection, migration.VERSION, migration.DESCRIPTION)
+        version = migration.VERSION
+
+    return version
@@ -0,0 +1,32 @@
+from app.migrations import (
+    m0001_meta_fields,
+    m0002_search_index,
+    m0003_fingerprints,
+    m0004_tags,
+    m0005_news_user_index,
+    m0006_article_bodies,
+    m0007_body_search_index,
+    m0008_extraction_jobs,
+    m0009_user_retention,
+    m0010_article_revisions,
+    m0011_search_owner,
+    m0012_fold_tags,
+)
+
+# Applied in order; append new migrations with the next VERSION
+MIGRATIONS = [
+    m0001_meta_fields,
+    m0002_search_index,
+    m0003_fingerprints,
+    m0004_tags,
+    m0005_news_user_index,
+    m0006_article_bodies,
+    m0007_body_search_index,
+    m0008_extraction_jobs,
+    m0009_user_retention,
+    m0010_article_revisions,
+    m0011_search_owner,
+    m0012_fold_tags,
+]
+
+assert [m.VERSION for m in MIGRATIONS] == list(range(1, len(MIGRATIONS) + 1))
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey
+from sqlalchemy.orm import relationship
+from app.database import Base
+from app.services.compression import BodyCodec
+
+class ArticleBody(Base):
+    """Compressed article text, kept out of news_articles so list queries stay on small rows"""
+    __tablename__ = "article_bodies"
+    
+    article_id = Column(Integer, ForeignKey("news_articles.id"), primary_key=True)
+    codec = Column(String(8), nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    # Uncompressed UTF-8 size in bytes
+    size = Column(Integer, nullable=False)
+    
+    article = relationship("NewsArticle", back_populates="body")
+    
+    @classmethod
+    def from_text(cls, text: str) -> "ArticleBody":
+        codec, body = BodyCodec.encode(text)
+        return cls(codec=codec, body=body, size=len(text.encode("utf-8")))
+    
+    @property
+    def text(self) -> str:
+        return BodyCodec.decode(self.codec, self.body)
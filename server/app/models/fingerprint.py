@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, BigInteger, LargeBinary, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+from datetime import datetime
+
+class ArticleFingerprint(Base):
+    __tablename__ = "article_fingerprints"
+    
+    article_id = Column(Integer, ForeignKey("news_articles.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Packed MinHash signature, used to verify LSH candidates
+    signature = Column(LargeBinary, nullable=False)
+    duplicate_of_id = Column(Integer, ForeignKey("news_articles.id"), index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    article = relationship("NewsArticle", foreign_keys=[article_id], back_populates="fingerprint")
+    bands = relationship("ArticleFingerprintBand", cascade="all, delete-orphan")
+
+class ArticleFingerprintBand(Base):
+    """One LSH band hash per row; articles sharing any band are near-duplicate candidates"""
+    __tablename__ = "article_fingerprint_bands"
+    
+    user_id = Column(Integer, primary_key=True)
+    band_key = Column(BigInteger, primary_key=True)
+    article_id = Column(Integer, ForeignKey("article_fingerprints.article_id"), primary_key=True)
+    
+    __table_args__ = (
+        Index("ix_article_fingerprint_bands_article_id", "article_id"),
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from app.database import Base
+from datetime import datetime
+
+QUEUED = "queued"
+FETCHING = "fetching"
+PARSING = "parsing"
+MEDIA = "media"
+DONE = "done"
+FAILED = "failed"
+
+# A worker holds a lease on jobs in these states; FINAL_STATES never change again
+ACTIVE_STATES = (FETCHING, PARSING, MEDIA)
+FINAL_STATES = (DONE, FAILED)
+
+class ExtractionJob(Base):
+    """One URL extraction, kept in the database so it outlives the request and the worker"""
+    __tablename__ = "extraction_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    url = Column(String, nullable=False)
+    # sha256 of the user id and the normalized URL; resubmitting the same URL returns this job
+    idempotency_key = Column(String(64), nullable=False, unique=True)
+    state = Column(String(16), nullable=False, default=QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by = Column(String)
+    claimed_at = Column(DateTime)
+    error = Column(Text)
+    article_id = Column(Integer, ForeignKey("news_articles.id", ondelete="SET NULL"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_extraction_jobs_state_next_attempt_at", "state", "next_attempt_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -9,7 +9,6 @@ class NewsArticle(Base):
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, nullable=False)
     title = Column(String)
-    content = Column(Text)
     publish_date = Column(DateTime)
     image_url = Column(String)
     processed_image_url = Column(String)
@@ -20,4 +19,135 @@ class NewsArticle(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="news_articles")
\ No newline at end of file
+    __table_args__ = (
+        Index("ix_news_articles_user_id_created_at", "user_id", "created_at"),
+    )
+    
+    user = relationship("User", back_populates="news_articles")
+    # Only the detail views read it (duplicate_of_id); list and export queries select the column themselves
+    fingerprint = relationship(
+        "ArticleFingerprint",
+        uselist=False,
+        lazy="select",
+        cascade="all, delete-orphan",
+        foreign_keys="ArticleFingerprint.article_id",
+        back_populates="article",
+    )
+    tags = relationship("Tag", secondary="article_tags", back_populates="articles")
+    # Loaded on first access of `content`, i.e. only by views that return the text
+    body = relationship("ArticleBody", uselist=False, lazy="select", cascade="all, delete-orphan", back_populates="article")
+    refresh = relationship("ArticleRefresh", uselist=False, lazy="select", cascade="all, delete-orphan", back_populates="article")
+    
+    @property
+    def duplicate_of_id(self):
+        return self.fingerprint.duplicate_of_id if self.fingerprint else None
+    
+    @property
+    def content(self):
+        return self.body.text if self.body is not None else None
+    
+    @content.setter
+    def content(self, value):
+        self.body = ArticleBody.from_text(value) if value is not None else None
+
+from app.models.fingerprint import ArticleFingerprint  # noqa: E402  (target of NewsArticle.fingerprint)
+from app.models.tag import Tag  # noqa: E402  (target of NewsArticle.tags)
+from app.models.article_body import ArticleBody  # noqa: E402  (target of NewsArticle.body)
+from app.models.revision import ArticleRefresh, ArticleRevision  # noqa: E402,F401  (target of NewsArticle.refresh)
+
+# SQLite FTS5 index over title, body text and meta_keywords. Bodies are stored compressed, so
+# the index reads them through a view that decompresses with the article_body_text() function
+# registered in app.database; triggers on both tables keep it in sync. The owner column holds
+# the user id as a token, so a search ANDs it into the MATCH and FTS5 skips other users' rows
+# inside the index instead of ranking the whole corpus and filtering on the join.
+_BODY_TEXT = "(SELECT article_body_text(codec, body) FROM article_bodies WHERE article_id = {id})"
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIEW IF NOT EXISTS news_articles_search_source AS
+    SELECT a.id AS id, a.title AS title, article_body_text(b.codec, b.body) AS content, a.meta_keywords AS meta_keywords,
+           a.user_id AS owner
+    FROM news_articles a LEFT JOIN article_bodies b ON b.article_id = a.id
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_articles_fts USING fts5(
+        title, content, meta_keywords, owner,
+        content='news_articles_search_source', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS news_articles_fts_insert AFTER INSERT ON news_articles BEGIN
+        INSERT INTO news_articles_fts(rowid, title, content, meta_keywords, owner)
+        VALUES (new.id, new.title, {_BODY_TEXT.format(id="new.id")}, new.meta_keywords, new.user_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS news_articles_fts_delete AFTER DELETE ON news_articles BEGIN
+        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content, meta_keywords, owner)
+        VALUES ('delete', old.id, old.title, {_BODY_TEXT.format(id="old.id")}, old.meta_keywords, old.user_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS news_articles_fts_update AFTER UPDATE OF title, meta_keywords, user_id ON news_articles BEGIN
+        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content, meta_keywords, owner)
+        VALUES ('delete', old.id, old.title, {_BODY_TEXT.format(id="old.id")}, old.meta_keywords, old.user_id);
+        INSERT INTO news_articles_fts(rowid, title, content, meta_keywords, owner)
+        VALUES (new.id, new.title, {_BODY_TEXT.format(id="new.id")}, new.meta_keywords, new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS article_bodies_fts_insert AFTER INSERT ON article_bodies BEGIN
+        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content, meta_keywords, owner)
+        SELECT 'delete', id, title, NULL, meta_keywords, user_id FROM news_articles WHERE id = new.article_id;
+        INSERT INTO news_articles_fts(rowid, title, content, meta_keywords, owner)
+        SELECT id, title, article_body_text(new.codec, new.body), meta_keywords, user_id FROM news_articles WHERE id = new.article_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS article_bodies_fts_update AFTER UPDATE OF codec, body ON article_bodies BEGIN
+        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content, meta_keywords, owner)
+        SELECT 'delete', id, title, article_body_text(old.codec, old.body), meta_keywords, user_id FROM news_articles WHERE id = old.article_id;
+        INSERT INTO news_articles_fts(rowid, title, content, meta_keywords, owner)
+        SELECT id, title, article_body_text(new.codec, new.body), meta_keywords, user_id FROM news_articles WHERE id = new.article_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS article_bodies_fts_delete AFTER DELETE ON article_bodies BEGIN
+        INSERT INTO news_articles_fts(news_articles_fts, rowid, title, content, meta_keywords, owner)
+        SELECT 'delete', id, title, article_body_text(old.codec, old.body), meta_keywords, user_id FROM news_articles WHERE id = old.article_id;
+        INSERT INTO news_articles_fts(rowid, title, content, meta_keywords, owner)
+        SELECT id, title, NULL, meta_keywords, user_id FROM news_articles WHERE id = old.article_id;
+    END
+    """,
+]
+
+SEARCH_INDEX_TRIGGERS = (
+    "news_articles_fts_insert", "news_articles_fts_delete", "news_articles_fts_update",
+    "article_bodies_fts_insert", "article_bodies_fts_update", "article_bodies_fts_delete",
+)
+
+def ensure_search_index(connection) -> None:
+    """Create the search index on an existing database and fill it from current rows"""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_articles_fts'"
+    ).first()
+    if exists:
+        return
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO news_articles_fts(news_articles_fts) VALUES ('rebuild')")
+
+def drop_search_index(connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for trigger in SEARCH_INDEX_TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+    connection.exec_driver_sql("DROP TABLE IF EXISTS news_articles_fts")
+    connection.exec_driver_sql("DROP VIEW IF EXISTS news_articles_search_source")
+
+# The triggers span news_articles and article_bodies, so they are created once all tables exist
+event.listen(Base.metadata, "after_create", lambda target, connection, **kw: ensure_search_index(connection))
+event.listen(Base.metadata, "before_drop", lambda target, connection, **kw: drop_search_index(connection))
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+from datetime import datetime
+
+class ArticleRefresh(Base):
+    """Re-fetch schedule of a recently saved article, with what is needed to skip unchanged pages"""
+    __tablename__ = "article_refresh"
+    
+    article_id = Column(Integer, ForeignKey("news_articles.id"), primary_key=True)
+    domain = Column(String, nullable=False)
+    # None once the last step of REFRESH_SCHEDULE has run
+    next_refresh_at = Column(DateTime, index=True)
+    refreshes = Column(Integer, nullable=False, default=0)
+    last_checked_at = Column(DateTime)
+    # Validators from the last response, sent back as If-None-Match / If-Modified-Since
+    etag = Column(String)
+    last_modified = Column(String)
+    # sha256 of the raw page, and of the extracted title and text
+    page_hash = Column(String(64))
+    content_hash = Column(String(64))
+    
+    article = relationship("NewsArticle", back_populates="refresh")
+
+class ArticleRevision(Base):
+    """An earlier version of an article, stored as the diff that turns the next version back into it"""
+    __tablename__ = "article_revisions"
+    
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("news_articles.id"), nullable=False)
+    # The version this change produced; version 1 is the first extraction
+    revision = Column(Integer, nullable=False)
+    # Set when the title changed too
+    previous_title = Column(String)
+    codec = Column(String(8), nullable=False)
+    diff = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("article_id", "revision", name="uq_article_revisions_article_id_revision"),
+    )
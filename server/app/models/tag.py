@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+article_tags = Table(
+    "article_tags",
+    Base.metadata,
+    Column("article_id", Integer, ForeignKey("news_articles.id"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    Index("ix_article_tags_tag_id", "tag_id", "article_id"),
+)
+
+class Tag(Base):
+    __tablename__ = "tags"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    
+    articles = relationship("NewsArticle", secondary=article_tags, back_populates="tags")
@@ -11,5 +11,7 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Articles older than this many days are deleted by the retention job; None keeps everything
+    retention_days = Column(Integer)
     
     news_articles = relationship("NewsArticle", back_populates="user")
\ No newline at end of file
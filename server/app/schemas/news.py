@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl, ConfigDict
+from pydantic import BaseModel, HttpUrl, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, List
 
@@ -21,5 +21,77 @@ class NewsResponse(NewsBase):
     meta_lang: Optional[str]
     created_at: datetime
     user_id: int
+    duplicate_of_id: Optional[int] = None
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class NewsListItem(BaseModel):
+    """List row: every NewsResponse field except the article body"""
+    id: int
+    url: str
+    title: Optional[str]
+    publish_date: Optional[datetime]
+    image_url: Optional[str]
+    processed_image_url: Optional[str]
+    video_url: Optional[str]
+    processed_video_url: Optional[str]
+    meta_keywords: Optional[str]
+    meta_lang: Optional[str]
+    created_at: datetime
+    user_id: int
+    duplicate_of_id: Optional[int] = None
+
+class NewsSearchResult(BaseModel):
+    id: int
+    url: str
+    title: Optional[str]
+    title_highlight: Optional[str]
+    snippet: Optional[str]
+    publish_date: Optional[datetime]
+    created_at: datetime
+    image_url: Optional[str]
+    score: float
+
+class NewsSearchResponse(BaseModel):
+    results: List[NewsSearchResult]
+    next_cursor: Optional[str]
+
+class JobResponse(BaseModel):
+    id: int
+    url: str
+    state: str
+    attempts: int
+    next_attempt_at: Optional[datetime]
+    error: Optional[str]
+    article_id: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class BulkDeleteRequest(BaseModel):
+    """Articles to delete: those with the given ids, saved before a time, or on a domain; filters combine"""
+    ids: Optional[List[int]] = Field(None, max_length=10000)
+    before: Optional[datetime] = None
+    domain: Optional[str] = Field(None, max_length=253)
+
+class BulkDeleteResponse(BaseModel):
+    deleted: int
+
+class RetentionPolicy(BaseModel):
+    # None keeps articles forever
+    retention_days: Optional[int] = Field(None, ge=1, le=36500)
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class RevisionSummary(BaseModel):
+    revision: int
+    created_at: Optional[datetime]
+    title_changed: bool
+    # Lines of the newer version that this revision replaced
+    changed_lines: int
+
+class RevisionVersion(BaseModel):
+    revision: int
+    title: Optional[str]
+    content: str
@@ -1,63 +1,260 @@
 import asyncio
-import aiohttp
-from typing import Dict, List, Optional
+import functools
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 import re
 from datetime import datetime
 import json
-from app.services.news_extractor import NewsExtractor
+from app.services.news_extractor import NO_TITLE, NewsExtractor
+from app.services.domain_profiles import DomainProfile, domain_profiles
+from app.services.extraction_result import HEAVY_SECTIONS, ExtractedArticle, Extraction, ExtractionFailure
+from app.services.fetch_governor import FetchRejected
+from app.services.page_fetch import FetchedPage, PageFetcher, PageRejected, split_head
+from app.services.metrics import stage
+from app.services.language_detector import language_detector
 
 class AdvancedNewsExtractor(NewsExtractor):
     @staticmethod
-    async def extract_with_metadata(url: str) -> Dict:
-        basic_content = NewsExtractor.extract_content(url)
+    async def extract_with_metadata(url: str, html: Optional[str] = None, executor: Optional[Executor] = None,
+                                    include: FrozenSet[str] = frozenset()) -> Extraction:
+        """Extract one article; with an executor the CPU-bound parsing runs there, off the event loop.
         
-        if not basic_content["success"]:
-            return basic_content
+        include names the HEAVY_SECTIONS to fill in; the others are not computed.
+        """
+        with stage("extract_with_metadata", url):
+            return await AdvancedNewsExtractor._extract_with_profile(url, html, executor, include)
+    
+    @staticmethod
+    async def _extract_with_profile(url: str, html: Optional[str] = None, executor: Optional[Executor] = None,
+                                    include: FrozenSet[str] = frozenset()) -> Extraction:
+        profile = domain_profiles.get(url)
+        started = time.perf_counter()
+        head = head_values = None
+        
+        if html is None:
+            try:
+                if profile.selectors:
+                    html = await AdvancedNewsExtractor._fetch_html(url)
+                else:
+                    # One governed download shared by newspaper and the enrichment steps; the head
+                    # metadata is parsed while the rest of the body is still arriving
+                    parse_head = functools.partial(AdvancedNewsExtractor._parse_head, url=url, profile=profile, include=include)
+                    if executor is None:
+                        on_head = parse_head
+                    else:
+                        # Off the loop like the full parse; the download carries on meanwhile
+                        loop = asyncio.get_running_loop()
+                        on_head = lambda head: loop.run_in_executor(executor, parse_head, head)
+                    page = await AdvancedNewsExtractor._fetch_page(url, on_head=on_head)
+                    html, head, head_values = page.html, page.head, page.head_result
+                    if isinstance(head_values, asyncio.Future):
+                        try:
+                            head_values = await head_values
+                        except Exception as e:
+                            # _enhance parses the head again from the full page
+                            print(f"Head parsing error for {url}: {e}")
+                            head_values = None
+            except FetchRejected as e:
+                return ExtractionFailure(f"Failed to fetch: {e}", retry_after=e.retry_after, retryable=True)
+            except PageRejected as e:
+                return ExtractionFailure(f"Failed to fetch: {e}")
+            except Exception as e:
+                # No second download: the governed fetch already counted this failure against the domain
+                status = getattr(e, "status", None)
+                return ExtractionFailure(f"Failed to fetch: {e}", retryable=status is None or status >= 500 or status == 429)
+        
+        parse = functools.partial(
+            AdvancedNewsExtractor._parse_page, url, html, profile, started, include, head, head_values
+        )
+        if executor is None:
+            return parse()
+        return await asyncio.get_running_loop().run_in_executor(executor, parse)
+    
+    @staticmethod
+    def _parse_page(url: str, html: str, profile: DomainProfile, started: float, include: FrozenSet[str],
+                    head: Optional[str] = None, head_values: Optional[Dict[str, Tuple[Any, float]]] = None) -> Extraction:
+        """Everything after the download; blocking, so batch callers run it on a worker pool"""
+        basic_content = None
+        # Fast path: configured selectors for known sites skip the newspaper parse
+        if profile.selectors:
+            try:
+                with stage("selector_extract", url):
+                    basic_content = AdvancedNewsExtractor._extract_with_selectors(html, url, profile.selectors)
+            except Exception as e:
+                print(f"Selector extraction error for {profile.domain}: {e}")
+        fast_path = basic_content is not None
+        
+        if basic_content is None:
+            basic_content = NewsExtractor.extract_content(url, html=html)
+            if not basic_content.success:
+                return basic_content
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    html = await response.text()
-                    
-                    og_data = AdvancedNewsExtractor._extract_og_metadata(html)
-                    structured_data = AdvancedNewsExtractor._extract_structured_data(html)
-                    
-                    # Enhanced date extraction from HTML
-                    enhanced_publish_date = AdvancedNewsExtractor._extract_publish_date_from_html(html)
-                    if enhanced_publish_date and not basic_content.get("publish_date"):
-                        basic_content["publish_date"] = enhanced_publish_date
-                    
-                    # Enhanced meta keywords extraction
-                    enhanced_keywords = AdvancedNewsExtractor._extract_meta_keywords_from_html(html)
-                    if enhanced_keywords:
-                        basic_content["meta_keywords"] = enhanced_keywords
-                    
-                    # Enhanced language detection
-                    enhanced_lang = AdvancedNewsExtractor._extract_meta_lang_from_html(html)
-                    if enhanced_lang:
-                        basic_content["meta_lang"] = enhanced_lang
-                    
-                    # Extract video URLs
-                    video_urls = AdvancedNewsExtractor._extract_video_urls(html, url)
-                    if video_urls:
-                        basic_content["video_url"] = video_urls[0] if video_urls else None
-                    
-                    enhanced_content = {
-                        **basic_content,
-                        "og_data": og_data,
-                        "structured_data": structured_data,
-                        "word_count": len(basic_content.get("content", "").split()),
-                        "reading_time": AdvancedNewsExtractor._calculate_reading_time(basic_content.get("content", "")),
-                        "language": basic_content.get("meta_lang") or AdvancedNewsExtractor._detect_language(basic_content.get("content", "")),
-                        "tags": AdvancedNewsExtractor._extract_tags(html),
-                        "video_urls": video_urls
-                    }
-                    
-                    return enhanced_content
-                    
+            return AdvancedNewsExtractor._enhance(basic_content, html, url, profile, include, head, head_values)
         except Exception as e:
-            return {**basic_content, "enhancement_error": str(e)}
+            basic_content.enhancement_error = str(e)
+            return basic_content
+        finally:
+            domain_profiles.record_extraction(profile, time.perf_counter() - started, fast_path)
+    
+    @staticmethod
+    async def _fetch_html(url: str) -> str:
+        return (await AdvancedNewsExtractor._fetch_page(url)).html
+    
+    @staticmethod
+    async def _fetch_page(url: str, on_head: Optional[Callable[[str], Any]] = None) -> FetchedPage:
+        with stage("html_fetch", url):
+            return await PageFetcher.fetch(url, on_head=on_head)
+    
+    @staticmethod
+    def _parse_head(head: str, url: str, profile: DomainProfile,
+                    include: FrozenSet[str] = frozenset()) -> Dict[str, Tuple[Any, float]]:
+        """Run the steps that only need the <head>, as soon as it has arrived; step -> (value, seconds)"""
+        steps = {
+            "og_data": AdvancedNewsExtractor._extract_og_metadata,
+            "meta_lang": AdvancedNewsExtractor._extract_meta_lang_from_html,
+            "structured_data": AdvancedNewsExtractor._extract_structured_data,
+        }
+        parsed = {}
+        for step, func in steps.items():
+            if step in HEAVY_SECTIONS and step not in include:
+                continue
+            if profile.should_run(step):
+                step_started = time.perf_counter()
+                with stage(step, url):
+                    parsed[step] = (func(head), time.perf_counter() - step_started)
+        return parsed
+    
+    @staticmethod
+    def _enhance(basic_content: ExtractedArticle, html: str, url: str, profile: DomainProfile,
+                 include: FrozenSet[str] = frozenset(), head: Optional[str] = None,
+                 head_values: Optional[Dict[str, Tuple[Any, float]]] = None) -> ExtractedArticle:
+        """Run the enrichment steps the domain profile considers useful, filling basic_content in place"""
+        if head_values is None:
+            head = split_head(html)
+            head_values = AdvancedNewsExtractor._parse_head(head, url, profile, include) if head is not None else {}
+        
+        def run(step, func, *args, empty=None, head_only=False):
+            if not profile.should_run(step):
+                domain_profiles.record_skip(profile, step)
+                return empty
+            early_value, early_seconds = head_values.get(step, (None, 0.0))
+            if head_only and step in head_values:
+                value, seconds = early_value, early_seconds
+            else:
+                step_started = time.perf_counter()
+                with stage(step, url):
+                    value = func(*args)
+                seconds = time.perf_counter() - step_started + early_seconds
+            domain_profiles.record_step(profile, step, bool(value), seconds)
+            return value if value is not None else empty
+        
+        result = basic_content
+        if "og_data" in include:
+            result.og_data = run("og_data", AdvancedNewsExtractor._extract_og_metadata, html, empty={}, head_only=True)
+        if "structured_data" in include:
+            if "structured_data" in head_values:
+                # JSON-LD from the head is already parsed; only the body is left to scan
+                head_structured_data = head_values["structured_data"][0]
+                result.structured_data = run(
+                    "structured_data",
+                    lambda rest: head_structured_data + AdvancedNewsExtractor._extract_structured_data(rest),
+                    html[len(head):],
+                    empty=[],
+                )
+            else:
+                result.structured_data = run("structured_data", AdvancedNewsExtractor._extract_structured_data, html, empty=[])
+        
+        # Enhanced date extraction from HTML
+        if not result.publish_date:
+            enhanced_publish_date = run("publish_date", AdvancedNewsExtractor._extract_publish_date_from_html, html)
+            if enhanced_publish_date:
+                result.publish_date = enhanced_publish_date
+        
+        # Enhanced meta keywords extraction
+        enhanced_keywords = run("meta_keywords", AdvancedNewsExtractor._extract_meta_keywords_from_html, html)
+        if enhanced_keywords:
+            result.meta_keywords = enhanced_keywords
+        
+        # Enhanced language detection
+        enhanced_lang = run("meta_lang", AdvancedNewsExtractor._extract_meta_lang_from_html, html, head_only=True)
+        if enhanced_lang:
+            result.meta_lang = enhanced_lang
+        
+        # Extract video URLs; the full list is only kept when asked for
+        video_urls = run("video_urls", AdvancedNewsExtractor._extract_video_urls, html, url, empty=[])
+        if video_urls:
+            result.video_url = video_urls[0]
+        if "video_urls" in include:
+            result.video_urls = video_urls
+        
+        result.tags = run("tags", AdvancedNewsExtractor._extract_tags, html, empty=[])
+        
+        content = result.content or ""
+        result.language = result.meta_lang
+        if not result.language:
+            result.language = run("language_detect", AdvancedNewsExtractor._detect_language, content)
+        
+        result.word_count = len(content.split())
+        result.reading_time = AdvancedNewsExtractor._calculate_reading_time(content)
+        return result
+    
+    @staticmethod
+    def _extract_with_selectors(html: str, url: str, selectors: Dict[str, str]) -> Optional[ExtractedArticle]:
+        """Extract basic content with configured CSS/XPath selectors, None if they don't match"""
+        from lxml import html as lxml_html
+        
+        doc = lxml_html.fromstring(html)
+        
+        def select(key):
+            expression = selectors.get(key)
+            if not expression:
+                return []
+            if expression.startswith("xpath:"):
+                return doc.xpath(expression[len("xpath:"):])
+            return doc.cssselect(expression)
+        
+        def text_of(node):
+            if isinstance(node, str):
+                return node.strip()
+            return node.text_content().strip()
+        
+        def attr_of(node, *attrs):
+            if isinstance(node, str):
+                return node.strip()
+            for attr in attrs:
+                if node.get(attr):
+                    return node.get(attr).strip()
+            return text_of(node)
+        
+        title_nodes = select("title")
+        content_nodes = select("content")
+        content = "\n\n".join(text for text in (text_of(node) for node in content_nodes) if text)
+        if not title_nodes or not content:
+            return None
+        
+        image_url = None
+        image_nodes = select("image")
+        if image_nodes:
+            image_url = urljoin(url, attr_of(image_nodes[0], "content", "src", "data-src"))
+        
+        publish_date = None
+        date_nodes = select("publish_date")
+        if date_nodes:
+            try:
+                date_str = attr_of(date_nodes[0], "datetime", "content")
+                publish_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            except ValueError:
+                publish_date = None
+        
+        return ExtractedArticle(
+            title=text_of(title_nodes[0]) or NO_TITLE,
+            content=content,
+            publish_date=publish_date,
+            image_url=image_url,
+        )
     
     @staticmethod
     def _extract_video_urls(html: str, base_url: str) -> List[str]:
@@ -355,11 +552,7 @@ class AdvancedNewsExtractor(NewsExtractor):
     
     @staticmethod
     def _detect_language(content: str) -> Optional[str]:
-        try:
-            from langdetect import detect
-            return detect(content)
-        except:
-            return None
+        return language_detector.detect(content)
     
     @staticmethod
     def _extract_tags(html: str) -> List[str]:
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, FrozenSet, Iterable, Iterator, Optional
+from app.config import settings
+from app.services.advanced_extractor import AdvancedNewsExtractor
+from app.services.extraction_result import Extraction, ExtractionFailure
+from app.services.page_fetch import PageFetcher
+
+
+@dataclass(slots=True)
+class ExtractionResult:
+    """Outcome of one URL in a batch, at its position in the input"""
+    index: int
+    url: str
+    extracted: Extraction
+    seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.extracted.success
+
+    @property
+    def error(self) -> Optional[str]:
+        return None if self.extracted.success else self.extracted.error
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        """Set when the fetch governor deferred the URL; seconds until its domain accepts requests"""
+        return None if self.extracted.success else self.extracted.retry_after
+
+
+async def _extract_one(index: int, url: str, session, executor: ThreadPoolExecutor,
+                       include: FrozenSet[str]) -> ExtractionResult:
+    PageFetcher.bind_session(session)
+    started = time.perf_counter()
+    try:
+        extracted = await AdvancedNewsExtractor.extract_with_metadata(url, executor=executor, include=include)
+    except Exception as e:
+        extracted = ExtractionFailure(str(e) or e.__class__.__name__)
+    return ExtractionResult(index=index, url=url, extracted=extracted, seconds=time.perf_counter() - started)
+
+
+async def extract_many(urls: Iterable[str], concurrency: Optional[int] = None, parse_workers: Optional[int] = None,
+                       include: FrozenSet[str] = frozenset()) -> AsyncIterator[ExtractionResult]:
+    """Extract many URLs, yielding results as they complete.
+
+    At most `concurrency` URLs are in flight, sharing one connection pool; parsing runs on
+    `parse_workers` threads so the event loop keeps downloading. URLs are read from `urls`
+    only as results are consumed, so a slow consumer holds back new fetches. include names the
+    HEAVY_SECTIONS to compute for each article.
+    """
+    concurrency = concurrency or settings.BATCH_EXTRACT_CONCURRENCY
+    executor = ThreadPoolExecutor(parse_workers or settings.BATCH_PARSE_WORKERS, thread_name_prefix="parse")
+    pending = set()
+    queue = enumerate(urls)
+
+    def start_next() -> None:
+        for index, url in queue:
+            pending.add(asyncio.ensure_future(_extract_one(index, url, session, executor, include)))
+            return
+
+    session = PageFetcher.open_session(concurrency)
+    try:
+        for _ in range(concurrency):
+            start_next()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                start_next()
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await session.close()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_many_sync(urls: Iterable[str], concurrency: Optional[int] = None, parse_workers: Optional[int] = None,
+                      include: FrozenSet[str] = frozenset()) -> Iterator[ExtractionResult]:
+    """Blocking form of extract_many for scripts and Celery workers; must not run inside an event loop"""
+    loop = asyncio.new_event_loop()
+    results = extract_many(urls, concurrency, parse_workers, include)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
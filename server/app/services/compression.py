@@ -0,0 +1,36 @@
+import zlib
+from typing import Optional, Tuple
+from app.config import settings
+
+RAW = "raw"
+ZLIB = "zlib"
+
+
+class BodyCodec:
+    """Compression for stored article bodies; the codec is saved next to each body"""
+
+    @staticmethod
+    def encode(text: str) -> Tuple[str, bytes]:
+        data = text.encode("utf-8")
+        # Short bodies barely shrink, so they are stored as is
+        if len(data) < settings.BODY_COMPRESSION_MIN_BYTES:
+            return RAW, data
+        compressed = zlib.compress(data, settings.BODY_COMPRESSION_LEVEL)
+        if len(compressed) >= len(data):
+            return RAW, data
+        return ZLIB, compressed
+
+    @staticmethod
+    def decode(codec: str, data: bytes) -> str:
+        if codec == ZLIB:
+            data = zlib.decompress(data)
+        elif codec != RAW:
+            raise ValueError(f"Unknown body codec: {codec}")
+        return data.decode("utf-8")
+
+    @staticmethod
+    def sql_decode(codec: Optional[str], data: Optional[bytes]) -> Optional[str]:
+        """`article_body_text(codec, body)` SQL function used by the search index"""
+        if codec is None or data is None:
+            return None
+        return BodyCodec.decode(codec, data)
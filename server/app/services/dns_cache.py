@@ -0,0 +1,154 @@
+import asyncio
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.services.metrics import registry, Counter
+
+dns_lookups_total = registry.register(Counter(
+    "dns_lookups_total",
+    "Host name lookups for outbound fetches by result: hit, miss, negative_hit or failed",
+    ("result",),
+))
+
+Key = Tuple[str, int, int]
+
+
+def interleave_families(hosts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Alternate address families, keeping the resolver's order within each (RFC 8305 section 4).
+
+    aiohttp tries addresses one after another with FETCH_CONNECT_TIMEOUT each; interleaving means
+    a host with broken IPv6 falls back to IPv4 after one attempt instead of after all of them.
+    """
+    if not hosts:
+        return hosts
+    first = [host for host in hosts if host["family"] == hosts[0]["family"]]
+    other = [host for host in hosts if host["family"] != hosts[0]["family"]]
+    ordered = []
+    for index in range(max(len(first), len(other))):
+        ordered.extend(group[index] for group in (first, other) if index < len(group))
+    return ordered
+
+
+class DnsCache:
+    """Process-wide cache of getaddrinfo answers shared by every event loop and aiohttp session.
+
+    Answers are kept for DNS_CACHE_TTL seconds and failed lookups for DNS_NEGATIVE_TTL; at most
+    DNS_MAX_LOOKUPS lookups run at once, and concurrent lookups of one name share a single call.
+    `lookup` is the blocking resolver, socket.getaddrinfo unless replaced (tests use a stub).
+    """
+
+    def __init__(self, lookup: Optional[Callable[..., List]] = None):
+        self.lookup = lookup or socket.getaddrinfo
+        self._answers: "OrderedDict[Key, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[Key, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._answers.clear()
+            self._pending.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Its own threads, so slow lookups never hold up the loop's default executor
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(settings.DNS_MAX_LOOKUPS, thread_name_prefix="dns")
+            return self._executor
+
+    def _cached(self, key: Key):
+        with self._lock:
+            entry = self._answers.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._answers[key]
+                return None
+            self._answers.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key: Key, answer, ttl: float) -> None:
+        with self._lock:
+            self._answers[key] = (time.monotonic() + ttl, answer)
+            self._answers.move_to_end(key)
+            while len(self._answers) > settings.DNS_CACHE_SIZE:
+                self._answers.popitem(last=False)
+
+    def _resolve_blocking(self, key: Key) -> List[Dict[str, Any]]:
+        host, port, family = key
+        try:
+            infos = self.lookup(host, port, family=family, type=socket.SOCK_STREAM, flags=socket.AI_ADDRCONFIG)
+        except socket.gaierror as e:
+            dns_lookups_total.inc("failed")
+            self._store(key, e, settings.DNS_NEGATIVE_TTL)
+            raise
+        hosts = []
+        for info_family, _, proto, _, address in infos:
+            # Link-local IPv6 (scope id set) needs getnameinfo; not something news sites use
+            if info_family == socket.AF_INET6 and (len(address) < 3 or address[3]):
+                continue
+            hosts.append({
+                "hostname": host,
+                "host": address[0],
+                "port": address[1],
+                "family": info_family,
+                "proto": proto,
+                "flags": socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+            })
+        hosts = interleave_families(hosts)
+        self._store(key, hosts, settings.DNS_CACHE_TTL)
+        return hosts
+
+    def _answer(self, key: Key) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Future]]:
+        """A cached answer, or the lookup to wait for (started here if nobody else has)"""
+        answer = self._cached(key)
+        if isinstance(answer, socket.gaierror):
+            dns_lookups_total.inc("negative_hit")
+            # A fresh exception each time, so tracebacks don't pile up on the cached one
+            raise socket.gaierror(answer.errno, answer.strerror)
+        if answer is not None:
+            dns_lookups_total.inc("hit")
+            return answer, None
+        pool = self._pool()
+        with self._lock:
+            pending = self._pending.get(key)
+            started = pending is None
+            if started:
+                pending = self._pending[key] = pool.submit(self._resolve_blocking, key)
+        if started:
+            dns_lookups_total.inc("miss")
+            # Outside the lock: the callback runs right here if the lookup has already finished
+            pending.add_done_callback(lambda done: self._forget(key, done))
+        return None, pending
+
+    def _forget(self, key: Key, done: Future) -> None:
+        with self._lock:
+            if self._pending.get(key) is done:
+                del self._pending[key]
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_UNSPEC) -> List[Dict[str, Any]]:
+        hosts, pending = self._answer((host.lower(), port, family))
+        if hosts is not None:
+            return list(hosts)
+        # shield: a cancelled fetch must not cancel a lookup other fetches are waiting on
+        return list(await asyncio.shield(asyncio.wrap_future(pending)))
+
+
+dns_cache = DnsCache()
+
+
+class CachingResolver:
+    """aiohttp resolver (resolve/close) answering from the process-wide DnsCache"""
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_UNSPEC) -> List[Dict[str, Any]]:
+        return await dns_cache.resolve(host, port, family)
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+from app.config import settings
+
+# Enrichment steps run by AdvancedNewsExtractor on top of the basic newspaper parse.
+ENRICHMENT_STEPS = (
+    "og_data",
+    "structured_data",
+    "publish_date",
+    "meta_keywords",
+    "meta_lang",
+    "video_urls",
+    "tags",
+    # Text-based detection, only needed when the page declares no language
+    "language_detect",
+)
+
+
+@dataclass
+class StepStats:
+    runs: int = 0
+    hits: int = 0
+    skipped: int = 0
+    total_seconds: float = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "hits": self.hits,
+            "skipped": self.skipped,
+            "avg_ms": round(self.total_seconds / self.runs * 1000, 3) if self.runs else None,
+        }
+
+
+@dataclass
+class DomainProfile:
+    domain: str
+    # Configured CSS selectors (or "xpath:" prefixed expressions) for the fast path
+    selectors: Dict[str, str] = field(default_factory=dict)
+    # Configured set of enrichment steps; None means the steps are learned
+    steps: Optional[Set[str]] = None
+    extractions: int = 0
+    fast_path_extractions: int = 0
+    total_seconds: float = 0.0
+    step_stats: Dict[str, StepStats] = field(default_factory=lambda: {step: StepStats() for step in ENRICHMENT_STEPS})
+
+    @property
+    def is_learning(self) -> bool:
+        return self.steps is None and self.extractions < settings.DOMAIN_PROFILE_LEARNING_SAMPLES
+
+    def should_run(self, step: str) -> bool:
+        """Decide whether an enrichment step is worth running for this domain"""
+        if self.steps is not None:
+            return step in self.steps
+        if self.is_learning:
+            return True
+        # Periodically re-probe every step so a redesigned site is picked up again
+        reprobe = settings.DOMAIN_PROFILE_REPROBE_INTERVAL
+        if reprobe and self.extractions % reprobe == 0:
+            return True
+        return self.step_stats[step].hits > 0
+
+    def as_dict(self) -> Dict:
+        return {
+            "domain": self.domain,
+            "configured": self.steps is not None or bool(self.selectors),
+            "learning": self.is_learning,
+            "extractions": self.extractions,
+            "fast_path_extractions": self.fast_path_extractions,
+            "avg_ms": round(self.total_seconds / self.extractions * 1000, 3) if self.extractions else None,
+            "steps": {step: stats.as_dict() for step, stats in self.step_stats.items()},
+        }
+
+
+class DomainProfileStore:
+    """Per-domain extraction profiles, configured from a JSON file or learned at runtime"""
+
+    def __init__(self, config_path: Optional[str] = None):
+        self._profiles: Dict[str, DomainProfile] = {}
+        self._configured: Dict[str, Dict] = {}
+        self._config_path = config_path
+        self._lock = threading.Lock()
+        if config_path:
+            self.load_config(config_path)
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        netloc = urlparse(url).netloc.lower()
+        if netloc.startswith("www."):
+            netloc = netloc[4:]
+        return netloc
+
+    def load_config(self, path: str) -> None:
+        """Load configured profiles, e.g. {"example.com": {"selectors": {...}, "steps": [...]}}"""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading domain profiles from {path}: {e}")
+            return
+
+        with self._lock:
+            for domain, entry in config.items():
+                domain = domain.lower()
+                self._configured[domain] = entry
+                self._profiles.pop(domain, None)
+
+    def get(self, url: str) -> DomainProfile:
+        domain = self.domain_of(url)
+        with self._lock:
+            profile = self._profiles.get(domain)
+            if profile is None:
+                entry = self._configured.get(domain, {})
+                steps = entry.get("steps")
+                profile = DomainProfile(
+                    domain=domain,
+                    selectors=dict(entry.get("selectors", {})),
+                    steps=set(steps) if steps is not None else None,
+                )
+                self._profiles[domain] = profile
+            return profile
+
+    def record_step(self, profile: DomainProfile, step: str, produced: bool, seconds: float) -> None:
+        with self._lock:
+            stats = profile.step_stats[step]
+            stats.runs += 1
+            stats.total_seconds += seconds
+            if produced:
+                stats.hits += 1
+
+    def record_skip(self, profile: DomainProfile, step: str) -> None:
+        with self._lock:
+            profile.step_stats[step].skipped += 1
+
+    def record_extraction(self, profile: DomainProfile, seconds: float, fast_path: bool) -> None:
+        with self._lock:
+            profile.extractions += 1
+            profile.total_seconds += seconds
+            if fast_path:
+                profile.fast_path_extractions += 1
+
+    def snapshot(self) -> list:
+        with self._lock:
+            profiles = sorted(self._profiles.values(), key=lambda p: p.extractions, reverse=True)
+            return [profile.as_dict() for profile in profiles]
+
+    def reset(self) -> None:
+        """Forget learned profiles and any configuration loaded after startup"""
+        with self._lock:
+            self._profiles.clear()
+            self._configured.clear()
+        if self._config_path:
+            self.load_config(self._config_path)
+
+
+domain_profiles = DomainProfileStore(settings.DOMAIN_PROFILES_PATH)
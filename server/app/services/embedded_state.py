@@ -0,0 +1,235 @@
+import html as html_lib
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import orjson
+
+# Keys an article-like object uses for each field, in order of preference
+TITLE_KEYS = ("headline", "title", "name")
+BODY_KEYS = ("articleBody", "body", "content", "bodyHtml", "html", "text", "fullText", "description")
+DATE_KEYS = ("datePublished", "publishedAt", "published_at", "publishDate", "publish_date", "firstPublished",
+             "publicationDate", "pubDate", "createdAt", "created_at", "date")
+IMAGE_KEYS = ("image", "imageUrl", "image_url", "mainImage", "featuredImage", "thumbnail", "thumbnailUrl", "cover", "og_image")
+VIDEO_KEYS = ("video", "videoUrl", "video_url", "contentUrl")
+
+_SCRIPT = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+_SCRIPT_ID = re.compile(r"""\bid\s*=\s*["']?([\w-]+)""", re.IGNORECASE)
+_ASSIGNMENT = re.compile(r"^\s*(?:window\.|var\s+|let\s+|const\s+|self\.)?(__[A-Z0-9_]+__)\s*=\s*", re.DOTALL)
+_JSON_PARSE = re.compile(r"""^JSON\.parse\(\s*(["'])(.*)\1\s*\)\s*;?\s*$""", re.DOTALL)
+_UNESCAPED_QUOTE = re.compile(r'(?<!\\)"')
+_TAG = re.compile(r"<[^>]+>")
+_BLOCK_TAG = re.compile(r"</?(?:p|div|br|h[1-6]|li|blockquote|section|article)\b[^>]*>", re.IGNORECASE)
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+
+# Cheap substring checks that decide whether a page is worth scanning at all
+STATE_MARKERS = ("__NEXT_DATA__", "__NUXT", "__INITIAL_STATE__", "__PRELOADED_STATE__", "__APOLLO_STATE__")
+
+
+def _loads(text: str) -> Any:
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # Assignments often continue after the object (`...};window.x=1`); take the leading value
+        return json.JSONDecoder().raw_decode(text.strip())[0]
+
+
+def _js_string(quote: str, literal: str) -> str:
+    """Value of a JS string literal; single-quoted ones are rewritten as JSON strings first"""
+    if quote == "'":
+        literal = _UNESCAPED_QUOTE.sub(r'\\"', literal.replace("\\'", "'"))
+    return json.loads(f'"{literal}"')
+
+
+def _html_to_text(value: str) -> str:
+    if "<" not in value:
+        return value.strip()
+    text = _BLOCK_TAG.sub("\n", value)
+    text = html_lib.unescape(_TAG.sub("", text))
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n\n".join(line for line in lines if line)
+
+
+def _text_of(value: Any) -> str:
+    """Body text from a string (plain or HTML) or a list of content blocks"""
+    if isinstance(value, str):
+        return _html_to_text(value)
+    if isinstance(value, list):
+        parts = [_text_of(block) for block in value]
+        return "\n\n".join(part for part in parts if part)
+    if isinstance(value, dict):
+        for key in ("text", "html", "content", "value", "body", "children"):
+            if key in value:
+                return _text_of(value[key])
+    return ""
+
+
+def _first(node: Dict, keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = node.get(key)
+        if value:
+            return value
+    return None
+
+
+def _url_of(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return value if value.startswith(("http://", "https://", "//")) else None
+    if isinstance(value, list) and value:
+        return _url_of(value[0])
+    if isinstance(value, dict):
+        return _url_of(_first(value, ("url", "src", "contentUrl", "href", "original")))
+    return None
+
+
+def _date_of(value: Any) -> Optional[datetime]:
+    if isinstance(value, (int, float)) and value > 0:
+        # Epoch seconds or milliseconds
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _walk(node: Any, depth: int = 0) -> Iterator[Dict]:
+    """Every dict in the state tree, parents before children"""
+    if depth > 40:
+        return
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                yield from _walk(value, depth + 1)
+    elif isinstance(node, list):
+        for value in node:
+            if isinstance(value, (dict, list)):
+                yield from _walk(value, depth + 1)
+
+
+def _unflatten_nuxt(data: List) -> Any:
+    """Nuxt 3 payloads are devalue-serialized: a flat array where numbers point at other entries"""
+    resolved: Dict[int, Any] = {}
+
+    def resolve(index: Any) -> Any:
+        if not isinstance(index, int) or isinstance(index, bool) or index < 0 or index >= len(data):
+            return None
+        if index in resolved:
+            return resolved[index]
+        value = data[index]
+        if isinstance(value, dict):
+            result = resolved[index] = {}
+            for key, child in value.items():
+                result[key] = resolve(child)
+        elif isinstance(value, list):
+            if value and isinstance(value[0], str) and value[0] in ("Reactive", "ShallowReactive", "Ref", "ShallowRef", "EmptyRef"):
+                result = resolved[index] = resolve(value[1]) if len(value) > 1 else None
+            elif value and isinstance(value[0], str) and value[0] == "Date":
+                result = resolved[index] = value[1] if len(value) > 1 else None
+            else:
+                result = resolved[index] = []
+                result.extend(resolve(child) for child in value)
+        else:
+            result = resolved[index] = value
+        return result
+
+    return resolve(0)
+
+
+def _next_root(state: Any) -> Any:
+    props = state.get("props", {}) if isinstance(state, dict) else {}
+    return props.get("pageProps", props) or state
+
+
+def _nuxt_root(state: Any) -> Any:
+    if isinstance(state, list):
+        state = _unflatten_nuxt(state)
+    if isinstance(state, dict):
+        return {key: state[key] for key in ("data", "state", "pinia", "fetch") if key in state} or state
+    return state
+
+
+# Adapter per framework: which embedded blob it reads and where in it the page data lives
+ADAPTERS: Dict[str, Callable[[Any], Any]] = {
+    "next": _next_root,
+    "nuxt": _nuxt_root,
+    "initial_state": lambda state: state,
+}
+
+
+class EmbeddedStateExtractor:
+    """Article fields from the JSON state SPA frameworks embed in the page, without rendering it"""
+
+    @staticmethod
+    def has_state(html: str) -> bool:
+        return any(marker in html for marker in STATE_MARKERS)
+
+    @staticmethod
+    def find_states(html: str) -> Iterator[Tuple[str, Any]]:
+        """(framework, parsed state) for each embedded blob, each parsed once"""
+        for match in _SCRIPT.finditer(html):
+            attrs, body = match.group(1), match.group(2)
+            script_id = _SCRIPT_ID.search(attrs)
+            script_id = script_id.group(1) if script_id else ""
+            framework, text = None, None
+            if script_id == "__NEXT_DATA__":
+                framework, text = "next", body
+            elif script_id in ("__NUXT_DATA__", "__NUXT__") and "json" in attrs.lower():
+                framework, text = "nuxt", body
+            else:
+                assignment = _ASSIGNMENT.match(body)
+                if assignment:
+                    framework = "nuxt" if assignment.group(1) == "__NUXT__" else "initial_state"
+                    text = body[assignment.end():]
+            if framework is None:
+                continue
+            try:
+                embedded = _JSON_PARSE.match(text)
+                if embedded:
+                    # window.__STATE__ = JSON.parse("...") holds the JSON as a string literal
+                    text = _js_string(*embedded.groups())
+                yield framework, _loads(text)
+            except ValueError:
+                # Not JSON, e.g. Nuxt 2's `(function(a,b){...})` payload
+                continue
+
+    @staticmethod
+    def _best_article(root: Any) -> Optional[Dict]:
+        """The article-like object with the longest body that also has a title"""
+        best, best_length = None, 0
+        for node in _walk(root):
+            title = _first(node, TITLE_KEYS)
+            if not isinstance(title, str):
+                continue
+            for key in BODY_KEYS:
+                if key not in node:
+                    continue
+                text = _text_of(node[key])
+                if len(text) > best_length:
+                    best, best_length = {"node": node, "title": title.strip(), "content": text}, len(text)
+                break
+        return best
+
+    @staticmethod
+    def extract(html: str) -> Optional[Dict]:
+        """Title, content, publish_date, image_url and video_url, or None if no usable state is found"""
+        if not EmbeddedStateExtractor.has_state(html):
+            return None
+        best = None
+        for framework, state in EmbeddedStateExtractor.find_states(html):
+            candidate = EmbeddedStateExtractor._best_article(ADAPTERS[framework](state))
+            if candidate and (best is None or len(candidate["content"]) > len(best["content"])):
+                best = {**candidate, "framework": framework}
+        if best is None:
+            return None
+        node = best["node"]
+        return {
+            "title": best["title"],
+            "content": best["content"],
+            "publish_date": _date_of(_first(node, DATE_KEYS)),
+            "image_url": _url_of(_first(node, IMAGE_KEYS)),
+            "video_url": _url_of(_first(node, VIDEO_KEYS)),
+            "framework": best["framework"],
+        }
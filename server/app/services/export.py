@@ -0,0 +1,171 @@
+import csv
+import io
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+import orjson
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.article_body import ArticleBody
+from app.models.fingerprint import ArticleFingerprint
+from app.models.news import NewsArticle
+from app.services.compression import BodyCodec
+from app.services.news_queries import NewsQueryService
+
+# Columns of an exported article, in output order; content is decoded from article_bodies
+EXPORT_COLUMNS = (
+    NewsArticle.id,
+    NewsArticle.url,
+    NewsArticle.title,
+    NewsArticle.publish_date,
+    NewsArticle.created_at,
+    NewsArticle.image_url,
+    NewsArticle.processed_image_url,
+    NewsArticle.video_url,
+    NewsArticle.processed_video_url,
+    NewsArticle.meta_keywords,
+    NewsArticle.meta_lang,
+    ArticleFingerprint.duplicate_of_id,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS) + ("content",)
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its contents out chunk by chunk, for writers that need a file"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+class ArticleExporter:
+    """A user's articles as NDJSON, CSV or Parquet, read with a streaming cursor and written in chunks"""
+
+    @staticmethod
+    def rows(db: Session, user_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None,
+             domain: Optional[str] = None) -> Iterator[Dict]:
+        """Articles saved in [since, until), oldest first; read EXPORT_BATCH_SIZE rows per query.
+
+        Each batch is a separate query, keyed on the last (created_at, id) sent, that is read to the
+        end before any of it is yielded. An open cursor would hold SQLite's read lock, and with it
+        every writer, for as long as the client takes to download the export.
+        """
+        query = (
+            db.query(*EXPORT_COLUMNS, ArticleBody.codec, ArticleBody.body)
+            .outerjoin(ArticleFingerprint, ArticleFingerprint.article_id == NewsArticle.id)
+            .outerjoin(ArticleBody, ArticleBody.article_id == NewsArticle.id)
+            .filter(NewsArticle.user_id == user_id)
+        )
+        if since is not None:
+            query = query.filter(NewsArticle.created_at >= since)
+        if until is not None:
+            query = query.filter(NewsArticle.created_at < until)
+        if domain:
+            query = query.filter(NewsQueryService.domain_filter(domain))
+        query = query.order_by(NewsArticle.created_at, NewsArticle.id)
+
+        columns = len(EXPORT_COLUMNS)
+        batch = query.limit(settings.EXPORT_BATCH_SIZE).all()
+        while batch:
+            for row in batch:
+                item = dict(zip(EXPORT_FIELDS, row[:columns]))
+                codec, body = row[columns], row[columns + 1]
+                item["content"] = BodyCodec.decode(codec, body) if codec is not None else None
+                yield item
+            if len(batch) < settings.EXPORT_BATCH_SIZE:
+                return
+            last = batch[-1]
+            batch = query.filter(ArticleExporter._after(last.created_at, last.id)).limit(settings.EXPORT_BATCH_SIZE).all()
+
+    @staticmethod
+    def _after(created_at: Optional[datetime], article_id: int):
+        """Rows sorting after (created_at, id); SQLite sorts articles without created_at first"""
+        if created_at is None:
+            return or_(NewsArticle.created_at.isnot(None), NewsArticle.id > article_id)
+        return or_(
+            NewsArticle.created_at > created_at,
+            and_(NewsArticle.created_at == created_at, NewsArticle.id > article_id),
+        )
+
+    @staticmethod
+    def ndjson(rows: Iterator[Dict]) -> Iterator[bytes]:
+        buffer = bytearray()
+        for row in rows:
+            buffer += orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+            if len(buffer) >= settings.EXPORT_CHUNK_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    @staticmethod
+    def csv(rows: Iterator[Dict]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (row[field] for field in EXPORT_FIELDS)
+            ])
+            if buffer.tell() >= settings.EXPORT_CHUNK_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def parquet(rows: Iterator[Dict]) -> Iterator[bytes]:
+        """One row group per EXPORT_BATCH_SIZE rows, sent as soon as it is written"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("id", pa.int64()), ("url", pa.string()), ("title", pa.string()),
+            ("publish_date", pa.timestamp("us")), ("created_at", pa.timestamp("us")),
+            ("image_url", pa.string()), ("processed_image_url", pa.string()),
+            ("video_url", pa.string()), ("processed_video_url", pa.string()),
+            ("meta_keywords", pa.string()), ("meta_lang", pa.string()),
+            ("duplicate_of_id", pa.int64()), ("content", pa.string()),
+        ])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        batch: List[Dict] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= settings.EXPORT_BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+                yield sink.drain()
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def stream(fmt: str, rows: Iterator[Dict]) -> Iterator[bytes]:
+        return getattr(ArticleExporter, fmt)(rows)
+
+    @staticmethod
+    def parquet_available() -> bool:
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            return False
+        return True
@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+import json
+from typing import Any, Dict, FrozenSet, List, Optional, Union
+from app.models.news import NewsArticle
+
+# Parts of a result that are only computed when the caller asks for them
+HEAVY_SECTIONS: FrozenSet[str] = frozenset(("og_data", "structured_data", "video_urls"))
+
+
+@dataclass(slots=True)
+class ExtractedArticle:
+    """A successful extraction; built once and filled in place by the enrichment steps"""
+    title: str
+    content: str
+    publish_date: Optional[datetime] = None
+    image_url: Optional[str] = None
+    meta_keywords: Optional[str] = None
+    meta_lang: Optional[str] = None
+    video_url: Optional[str] = None
+    language: Optional[str] = None
+    word_count: int = 0
+    reading_time: int = 0
+    tags: List[str] = field(default_factory=list)
+    # Heavy sections (HEAVY_SECTIONS), None unless requested
+    og_data: Optional[Dict[str, str]] = None
+    structured_data: Optional[List[Dict]] = None
+    video_urls: Optional[List[str]] = None
+    enhancement_error: Optional[str] = None
+
+    success = True
+
+    def to_article(self, url: str, user_id: int) -> NewsArticle:
+        return NewsArticle(
+            url=url,
+            title=self.title,
+            content=self.content,
+            publish_date=self.publish_date or None,
+            image_url=self.image_url,
+            video_url=self.video_url,
+            # Tags are stored as the article's keywords
+            meta_keywords=json.dumps(self.tags) if self.tags else None,
+            meta_lang=self.language,
+            user_id=user_id,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"success": True, **{f.name: getattr(self, f.name) for f in fields(self)}}
+
+
+@dataclass(slots=True)
+class ExtractionFailure:
+    error: str
+    # Set when the fetch governor held the request back; seconds until the domain accepts requests
+    retry_after: Optional[float] = None
+    # The download was deferred or failed in a way a later attempt may not; parse failures are final
+    retryable: bool = False
+
+    success = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"success": False, "error": self.error, "retry_after": self.retry_after}
+
+
+Extraction = Union[ExtractedArticle, ExtractionFailure]
@@ -0,0 +1,387 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Deque, Dict, Optional, Tuple
+from app.config import settings
+from app.services.domain_profiles import DomainProfileStore
+from app.services.metrics import registry, Counter, Gauge
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Statuses that mean the origin is struggling; 429 only asks us to slow down
+_SERVER_ERRORS = range(500, 600)
+_THROTTLE_STATUSES = (429, 503)
+
+fetch_rejections_total = registry.register(Counter(
+    "fetch_rejections_total",
+    "Outbound fetches refused by the fetch governor before any request was sent",
+    ("reason", "domain"),
+))
+
+
+class FetchRejected(Exception):
+    """Raised instead of fetching; retry_after says when the domain may accept requests again"""
+
+    def __init__(self, domain: str, reason: str, retry_after: float):
+        super().__init__(f"{reason} for {domain}, retry in {retry_after:.1f}s")
+        self.domain = domain
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(when.timestamp() - now, 0.0)
+
+
+class TokenBucket:
+    """Requests per second with a burst allowance; reserve() hands out tokens in arrival order"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return how long to wait before using it"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def cancel(self) -> None:
+        self.tokens += 1
+
+
+class CircuitBreaker:
+    """Fails fast after repeated errors, then lets a single probe through to test recovery"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self, now: float) -> Optional[float]:
+        """None if a request may go out, otherwise the seconds until the next probe"""
+        if self.state == CLOSED:
+            return None
+        if self.state == OPEN:
+            remaining = self.opened_at + self.reset_timeout - now
+            if remaining > 0:
+                return remaining
+            self.state = HALF_OPEN
+            self.probing = False
+        if self.probing:
+            return self.reset_timeout
+        self.probing = True
+        return None
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = now
+            self.probing = False
+
+
+class AdaptiveLimit:
+    """Concurrency limit per origin: grows by one per window of fast responses, shrinks when slow.
+
+    Latency is compared against a baseline that follows the fastest recent responses, so an
+    origin that slows down under load gets fewer parallel requests before it starts timing out.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, tolerance: float):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.baseline: Optional[float] = None
+
+    def record(self, latency: Optional[float], failed: bool) -> None:
+        if failed:
+            self.limit = max(self.minimum, self.limit / 2)
+            return
+        if latency is None:
+            return
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            # Drift up slowly so an origin that is permanently slower gets a new baseline
+            self.baseline += (latency - self.baseline) * 0.05
+        if latency > self.baseline * self.tolerance:
+            self.limit = max(self.minimum, self.limit * 0.75)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+
+class DomainState:
+    def __init__(self, domain: str):
+        self.domain = domain
+        self.bucket = TokenBucket(settings.FETCH_DOMAIN_RATE, settings.FETCH_DOMAIN_BURST)
+        self.breaker = CircuitBreaker(settings.FETCH_CIRCUIT_FAILURES, settings.FETCH_CIRCUIT_RESET)
+        self.concurrency = AdaptiveLimit(
+            settings.FETCH_INITIAL_CONCURRENCY,
+            settings.FETCH_MIN_CONCURRENCY, settings.FETCH_MAX_CONCURRENCY, settings.FETCH_LATENCY_TOLERANCE
+        )
+        self.in_flight = 0
+        # Set from Retry-After or a crawl delay; no request starts before it
+        self.paused_until = 0.0
+        self.waiters: Deque[Callable[[], None]] = deque()
+
+
+class FetchSlot:
+    """One governed request; report the response status so throttling and errors are recognised"""
+
+    def __init__(self, domain: str, observe_latency: bool = True):
+        self.domain = domain
+        self.observe_latency = observe_latency
+        self.status: Optional[int] = None
+        self.retry_after: Optional[float] = None
+        self.started = time.monotonic()
+
+    def record_response(self, status: int, headers=None) -> None:
+        self.status = status
+        if status in _THROTTLE_STATUSES and headers is not None:
+            self.retry_after = parse_retry_after(headers.get("Retry-After"))
+
+
+class FetchGovernor:
+    """Per-domain politeness for every outbound fetch of this process.
+
+    Each domain gets a token bucket, a circuit breaker and an adaptive concurrency limit.
+    Requests wait for their turn up to FETCH_MAX_WAIT seconds; anything that would wait
+    longer (an open circuit, a long Retry-After) raises FetchRejected straight away.
+    State is per process: every API and Celery worker governs its own requests.
+    """
+
+    def __init__(self):
+        self._domains: Dict[str, DomainState] = {}
+        self._lock = threading.Lock()
+
+    def state(self, domain: str) -> DomainState:
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None:
+                state = self._domains[domain] = DomainState(domain)
+            return state
+
+    def reset(self) -> None:
+        with self._lock:
+            self._domains.clear()
+
+    def pause(self, url: str, seconds: float) -> None:
+        """Hold back requests to the URL's domain, e.g. after a Retry-After"""
+        state = self.state(DomainProfileStore.domain_of(url))
+        with self._lock:
+            state.paused_until = max(state.paused_until, time.monotonic() + seconds)
+
+    def crawl_delay(self, url: str, seconds: Optional[float]) -> None:
+        """Space requests to the URL's domain at least `seconds` apart (robots.txt Crawl-delay); None restores the defaults"""
+        state = self.state(DomainProfileStore.domain_of(url))
+        with self._lock:
+            if seconds:
+                state.bucket.rate = min(settings.FETCH_DOMAIN_RATE, 1 / seconds)
+                state.bucket.burst = 1.0
+            else:
+                state.bucket.rate = settings.FETCH_DOMAIN_RATE
+                state.bucket.burst = settings.FETCH_DOMAIN_BURST
+            state.bucket.tokens = min(state.bucket.tokens, state.bucket.burst)
+
+    def _reject(self, state: DomainState, reason: str, retry_after: float):
+        fetch_rejections_total.inc(reason, registry.domain_label(state.domain))
+        return FetchRejected(state.domain, reason, retry_after)
+
+    def _admit(self, state: DomainState) -> float:
+        """Check the breaker, pause and bucket; returns how long to sleep before the request"""
+        now = time.monotonic()
+        with self._lock:
+            retry_in = state.breaker.allow(now)
+            if retry_in is not None:
+                raise self._reject(state, "circuit_open", retry_in)
+            paused = max(state.paused_until - now, 0.0)
+            wait = max(paused, state.bucket.reserve(now + paused))
+            if wait > settings.FETCH_MAX_WAIT:
+                state.bucket.cancel()
+                if state.breaker.state == HALF_OPEN:
+                    state.breaker.probing = False
+                raise self._reject(state, "throttled", wait)
+            return wait
+
+    def _try_acquire(self, state: DomainState, wake: Callable[[], None]) -> bool:
+        with self._lock:
+            if state.in_flight < int(state.concurrency.limit):
+                state.in_flight += 1
+                return True
+            state.waiters.append(wake)
+            return False
+
+    def _forget_waiter(self, state: DomainState, wake: Callable[[], None]) -> None:
+        with self._lock:
+            try:
+                state.waiters.remove(wake)
+            except ValueError:
+                pass
+
+    def _release(self, state: DomainState, slot: FetchSlot, failed: bool) -> None:
+        now = time.monotonic()
+        status = slot.status
+        throttled = status in _THROTTLE_STATUSES
+        failed = failed or (status is not None and status in _SERVER_ERRORS)
+        with self._lock:
+            state.in_flight -= 1
+            if slot.retry_after:
+                state.paused_until = max(state.paused_until, now + slot.retry_after)
+            if failed:
+                state.breaker.record_failure(now)
+            else:
+                state.breaker.record_success()
+            latency = now - slot.started if slot.observe_latency else None
+            state.concurrency.record(latency, failed or throttled)
+            # Wake everyone waiting; those that don't fit under the new limit queue up again
+            waiters = list(state.waiters)
+            state.waiters.clear()
+        for wake in waiters:
+            try:
+                wake()
+            except RuntimeError:
+                # The waiter's event loop is closed, so nothing is waiting there any more
+                pass
+
+    def _end_probe(self, state: DomainState) -> None:
+        with self._lock:
+            if state.breaker.state == HALF_OPEN:
+                state.breaker.probing = False
+
+    def _give_up(self, state: DomainState, reason: str) -> FetchRejected:
+        self._end_probe(state)
+        return self._reject(state, reason, settings.FETCH_MAX_WAIT)
+
+    @asynccontextmanager
+    async def slot(self, url: str, observe_latency: bool = True):
+        """`async with governor.slot(url) as slot:` around one request from the event loop"""
+        state = self.state(DomainProfileStore.domain_of(url))
+        deadline = time.monotonic() + settings.FETCH_MAX_WAIT
+        wait = self._admit(state)
+        loop = asyncio.get_running_loop()
+        try:
+            if wait:
+                await asyncio.sleep(wait)
+            while True:
+                ready = loop.create_future()
+                wake = lambda: loop.call_soon_threadsafe(lambda: ready.done() or ready.set_result(None))
+                if self._try_acquire(state, wake):
+                    break
+                try:
+                    await asyncio.wait_for(ready, max(deadline - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    raise self._give_up(state, "concurrency")
+                finally:
+                    # Also when cancelled: the wake must not outlive this task and its loop
+                    self._forget_waiter(state, wake)
+        except asyncio.CancelledError:
+            self._end_probe(state)
+            raise
+
+        slot = FetchSlot(state.domain, observe_latency)
+        failed = False
+        try:
+            yield slot
+        except Exception:
+            failed = slot.status is None
+            raise
+        finally:
+            self._release(state, slot, failed)
+
+    @contextmanager
+    def sync_slot(self, url: str, observe_latency: bool = True):
+        """Blocking form of slot() for threads and Celery workers, never for a thread running an event loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            # Waiting here would freeze the loop, including the requests holding this domain's slots
+            raise RuntimeError("sync_slot called on an event loop thread; use slot() or run it in a thread")
+        state = self.state(DomainProfileStore.domain_of(url))
+        deadline = time.monotonic() + settings.FETCH_MAX_WAIT
+        wait = self._admit(state)
+        if wait:
+            time.sleep(wait)
+
+        while True:
+            ready = threading.Event()
+            if self._try_acquire(state, ready.set):
+                break
+            try:
+                if not ready.wait(max(deadline - time.monotonic(), 0)):
+                    raise self._give_up(state, "concurrency")
+            finally:
+                self._forget_waiter(state, ready.set)
+
+        slot = FetchSlot(state.domain, observe_latency)
+        failed = False
+        try:
+            yield slot
+        except Exception:
+            failed = slot.status is None
+            raise
+        finally:
+            self._release(state, slot, failed)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                domain: {
+                    "circuit": state.breaker.state,
+                    "concurrency_limit": int(state.concurrency.limit),
+                    "in_flight": state.in_flight,
+                    "paused_for": round(max(state.paused_until - time.monotonic(), 0.0), 3),
+                }
+                for domain, state in self._domains.items()
+            }
+
+
+fetch_governor = FetchGovernor()
+
+
+def _concurrency_limits() -> Dict[Tuple[str, ...], float]:
+    return {
+        (registry.domain_label(domain),): stats["concurrency_limit"]
+        for domain, stats in fetch_governor.snapshot().items()
+    }
+
+
+registry.register(Gauge(
+    "fetch_domain_concurrency_limit",
+    "Adaptive concurrency limit for outbound fetches per domain",
+    ("domain",),
+    collect=_concurrency_limits,
+))
@@ -0,0 +1,102 @@
+import time
+from types import SimpleNamespace
+import aiohttp
+from aiohttp.client_exceptions import ClientConnectorCertificateError, ClientConnectorError, ClientConnectorSSLError
+from aiohttp.connector import cert_errors, ssl_errors
+from aiohttp.helpers import ceil_timeout
+from app.config import settings
+from app.services.dns_cache import CachingResolver
+from app.services.metrics import record_stage, registry
+
+# Extraction stages recorded for every aiohttp fetch, next to html_fetch which spans all of them
+DNS_STAGE = "fetch_dns"
+CONNECT_STAGE = "fetch_connect"
+TLS_STAGE = "fetch_tls"
+TTFB_STAGE = "fetch_ttfb"
+
+
+class TimedConnector(aiohttp.TCPConnector):
+    """TCPConnector that connects first and then upgrades to TLS, so the two are timed separately.
+
+    aiohttp opens TCP and TLS in one create_connection call; here the TLS handshake is a separate
+    start_tls on the connected socket, with the same timeout and error types as aiohttp's own path.
+    """
+
+    async def _wrap_create_connection(self, *args, req, timeout, client_error=ClientConnectorError, **kwargs):
+        sslcontext = kwargs.pop("ssl", None)
+        server_hostname = kwargs.pop("server_hostname", None)
+        domain = registry.domain_label(req.url.raw_host or "")
+        started = time.perf_counter()
+        transport, protocol = await super()._wrap_create_connection(
+            *args, req=req, timeout=timeout, client_error=client_error, **kwargs
+        )
+        connected = time.perf_counter()
+        record_stage(CONNECT_STAGE, domain, connected - started)
+        if not sslcontext:
+            return transport, protocol
+
+        try:
+            async with ceil_timeout(timeout.sock_connect, ceil_threshold=timeout.ceil_threshold):
+                tls_transport = await self._loop.start_tls(
+                    transport, protocol, sslcontext, server_hostname=server_hostname
+                )
+        except BaseException as exc:
+            transport.close()
+            if isinstance(exc, cert_errors):
+                raise ClientConnectorCertificateError(req.connection_key, exc) from exc
+            if isinstance(exc, ssl_errors):
+                raise ClientConnectorSSLError(req.connection_key, exc) from exc
+            if isinstance(exc, OSError) and not isinstance(exc, TimeoutError):
+                raise client_error(req.connection_key, exc) from exc
+            raise
+        protocol.connection_made(tls_transport)
+        record_stage(TLS_STAGE, domain, time.perf_counter() - connected)
+        return tls_transport, protocol
+
+
+class FetchTiming:
+    """Connector and trace hooks that report DNS, connect, TLS and time-to-first-byte per domain"""
+
+    @staticmethod
+    def connector(limit: int) -> TimedConnector:
+        # aiohttp's own per-connector DNS cache is off: the process-wide one outlives sessions
+        return TimedConnector(
+            limit=limit, limit_per_host=settings.FETCH_MAX_CONCURRENCY,
+            resolver=CachingResolver(), use_dns_cache=False,
+        )
+
+    @staticmethod
+    def trace_config() -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig(trace_config_ctx_factory=lambda trace_request_ctx: SimpleNamespace(
+            domain="", dns_started=None, headers_sent=None
+        ))
+        trace.on_request_start.append(FetchTiming._on_request_start)
+        trace.on_dns_resolvehost_start.append(FetchTiming._on_dns_start)
+        trace.on_dns_resolvehost_end.append(FetchTiming._on_dns_end)
+        trace.on_request_headers_sent.append(FetchTiming._on_headers_sent)
+        trace.on_request_end.append(FetchTiming._on_request_end)
+        return trace
+
+    @staticmethod
+    async def _on_request_start(session, ctx, params) -> None:
+        ctx.domain = registry.domain_label(params.url.raw_host or "")
+
+    @staticmethod
+    async def _on_dns_start(session, ctx, params) -> None:
+        ctx.dns_started = time.perf_counter()
+
+    @staticmethod
+    async def _on_dns_end(session, ctx, params) -> None:
+        if ctx.dns_started is not None:
+            record_stage(DNS_STAGE, ctx.domain, time.perf_counter() - ctx.dns_started)
+            ctx.dns_started = None
+
+    @staticmethod
+    async def _on_headers_sent(session, ctx, params) -> None:
+        ctx.headers_sent = time.perf_counter()
+
+    @staticmethod
+    async def _on_request_end(session, ctx, params) -> None:
+        # Fired once the response headers are in: request sent → first byte of the answer
+        if ctx.headers_sent is not None:
+            record_stage(TTFB_STAGE, ctx.domain, time.perf_counter() - ctx.headers_sent)
@@ -0,0 +1,132 @@
+import hashlib
+import re
+import struct
+import zlib
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.fingerprint import ArticleFingerprint, ArticleFingerprintBand
+from app.models.news import NewsArticle
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# 10 bands of 5 rows: pairs above ~0.8 Jaccard similarity almost always share a band,
+# unrelated articles practically never do
+BANDS = 10
+ROWS = 5
+NUM_PERMUTATIONS = BANDS * ROWS
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _permutations() -> List[Tuple[int, int]]:
+    # Fixed seed so signatures stay comparable across processes and releases
+    seed = hashlib.sha256(b"news-minhash").digest()
+    params = []
+    for i in range(NUM_PERMUTATIONS):
+        digest = hashlib.blake2b(seed + i.to_bytes(2, "big"), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % (_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "big") % _PRIME
+        params.append((a, b))
+    return params
+
+
+_PERMUTATIONS = _permutations()
+_SIGNATURE_FORMAT = f"<{NUM_PERMUTATIONS}I"
+
+
+class FingerprintService:
+    @staticmethod
+    def shingles(text: str, shingle_size: int = 3) -> set:
+        words = _WORD_PATTERN.findall(text.casefold())
+        return {
+            zlib.crc32(" ".join(words[i:i + shingle_size]).encode("utf-8"))
+            for i in range(len(words) - shingle_size + 1)
+        }
+    
+    @staticmethod
+    def minhash(text: str) -> Optional[Tuple[int, ...]]:
+        """MinHash signature of the text's word shingles, None for texts too short to compare"""
+        if len(_WORD_PATTERN.findall(text)) < settings.DUPLICATE_MIN_WORDS:
+            return None
+        shingles = FingerprintService.shingles(text)
+        return tuple(
+            min(((a * shingle + b) % _PRIME) & _MAX_HASH for shingle in shingles)
+            for a, b in _PERMUTATIONS
+        )
+    
+    @staticmethod
+    def band_keys(signature: Tuple[int, ...]) -> List[int]:
+        keys = []
+        for band in range(BANDS):
+            rows = struct.pack(f"<H{ROWS}I", band, *signature[band * ROWS:(band + 1) * ROWS])
+            # Signed 64-bit so the key fits an SQLite integer
+            keys.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), "big", signed=True))
+        return keys
+    
+    @staticmethod
+    def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERMUTATIONS
+    
+    @staticmethod
+    def pack(signature: Tuple[int, ...]) -> bytes:
+        return struct.pack(_SIGNATURE_FORMAT, *signature)
+    
+    @staticmethod
+    def unpack(data: bytes) -> Tuple[int, ...]:
+        return struct.unpack(_SIGNATURE_FORMAT, data)
+    
+    @staticmethod
+    def find_duplicate(db: Session, user_id: int, signature: Tuple[int, ...]) -> Optional[Tuple[NewsArticle, float]]:
+        """Most similar earlier article of the user above the threshold, as (article, similarity)"""
+        candidates = db.query(ArticleFingerprint).join(
+            ArticleFingerprintBand,
+            ArticleFingerprintBand.article_id == ArticleFingerprint.article_id
+        ).filter(
+            ArticleFingerprintBand.user_id == user_id,
+            ArticleFingerprintBand.band_key.in_(FingerprintService.band_keys(signature))
+        ).distinct().all()
+        
+        best = None
+        for candidate in candidates:
+            similarity = FingerprintService.similarity(signature, FingerprintService.unpack(candidate.signature))
+            if similarity >= settings.DUPLICATE_MIN_SIMILARITY and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        
+        if best is None:
+            return None
+        candidate, similarity = best
+        # Link to the original story rather than to another copy of it
+        original_id = candidate.duplicate_of_id or candidate.article_id
+        original = db.query(NewsArticle).filter(NewsArticle.id == original_id).first()
+        if original is None:
+            original = db.query(NewsArticle).filter(NewsArticle.id == candidate.article_id).first()
+        return (original, similarity) if original else None
+    
+    @staticmethod
+    def build(article: NewsArticle, signature: Tuple[int, ...], duplicate_of: Optional[NewsArticle] = None) -> ArticleFingerprint:
+        return ArticleFingerprint(
+            article=article,
+            user_id=article.user_id,
+            signature=FingerprintService.pack(signature),
+            duplicate_of_id=duplicate_of.id if duplicate_of else None,
+            bands=[
+                ArticleFingerprintBand(user_id=article.user_id, band_key=key)
+                for key in FingerprintService.band_keys(signature)
+            ],
+        )
+    
+    @staticmethod
+    def forget(db: Session, article_ids: List[int]) -> None:
+        """Drop the fingerprints of articles being deleted and unlink copies pointing at them"""
+        db.query(ArticleFingerprint).filter(
+            ArticleFingerprint.duplicate_of_id.in_(article_ids)
+        ).update({ArticleFingerprint.duplicate_of_id: None}, synchronize_session=False)
+        db.query(ArticleFingerprintBand).filter(
+            ArticleFingerprintBand.article_id.in_(article_ids)
+        ).delete(synchronize_session=False)
+        db.query(ArticleFingerprint).filter(
+            ArticleFingerprint.article_id.in_(article_ids)
+        ).delete(synchronize_session=False)
@@ -0,0 +1,65 @@
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.news import NewsArticle
+from app.services.extraction_result import ExtractedArticle
+from app.services.fingerprint import FingerprintService
+from app.services.media_processor import MediaProcessor
+from app.services.metrics import stage
+from app.services.refresh import RefreshService
+from app.services.tags import TagService
+
+
+class ArticleIngest:
+    """Turns an extraction result into a stored article; shared by /extract and extraction jobs"""
+
+    @staticmethod
+    def build(db: Session, url: str, user_id: int,
+              extracted: ExtractedArticle) -> Tuple[NewsArticle, Optional[NewsArticle]]:
+        """Article with tags and fingerprint, and the earlier article it duplicates if any"""
+        article = extracted.to_article(url, user_id)
+        TagService.attach(db, article, extracted.tags)
+        RefreshService.schedule(article)
+
+        # Flag near-duplicates of articles the user already has (e.g. republished wire stories)
+        duplicate_of = None
+        with stage("fingerprint", url):
+            signature = FingerprintService.minhash(extracted.content or "")
+            if signature is not None:
+                duplicate = FingerprintService.find_duplicate(db, user_id, signature)
+                duplicate_of = duplicate[0] if duplicate else None
+                article.fingerprint = FingerprintService.build(article, signature, duplicate_of)
+
+        # For now the video URL is stored as is; video processing can be added here
+        if article.video_url:
+            article.processed_video_url = article.video_url
+        return article, duplicate_of
+
+    @staticmethod
+    def process_media(article: NewsArticle, duplicate_of: Optional[NewsArticle]) -> bool:
+        """Watermark the image inline; True when it has to be queued for the media worker instead"""
+        if duplicate_of is not None and settings.SKIP_MEDIA_FOR_DUPLICATES:
+            # Reuse the original's watermarked image instead of processing the copy again
+            if not article.image_url or article.image_url != duplicate_of.image_url:
+                return False
+            if duplicate_of.processed_image_url:
+                article.processed_image_url = duplicate_of.processed_image_url
+                return False
+            # The original's image is still queued for the media worker; process the copy's too
+        if not article.image_url:
+            return False
+        if settings.MEDIA_PROCESSING == "worker":
+            return True
+        with stage("watermark", article.url):
+            article.processed_image_url = MediaProcessor.add_watermark(article.image_url, settings.WATERMARK_TEXT)
+        return False
+
+    @staticmethod
+    def queue_media(article: NewsArticle) -> None:
+        """Hand the image to the media worker; call after the article is committed"""
+        # Celery is only imported in this mode; the API process never loads the media libraries
+        from app.services.task_queue import watermark_article_image
+        try:
+            watermark_article_image.delay(article.id, article.image_url, settings.WATERMARK_TEXT)
+        except Exception as e:
+            print(f"Failed to queue watermark for article {article.id}: {e}")
@@ -0,0 +1,325 @@
+import asyncio
+import hashlib
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.lifecycle import in_flight
+from app.services.fetch_governor import FetchRejected
+from app.services.page_fetch import PageRejected
+from app.models.job import ExtractionJob, QUEUED, FETCHING, PARSING, MEDIA, DONE, FAILED, ACTIVE_STATES
+from app.models.news import NewsArticle
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "yclid", "mc_cid", "mc_eid")
+
+
+class JobService:
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Canonical form of a URL for idempotency: the same article always maps to one key"""
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        query = sorted(
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith(_TRACKING_PARAMS)
+        )
+        return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+    @staticmethod
+    def idempotency_key(user_id: int, url: str) -> str:
+        return hashlib.sha256(f"{user_id}:{JobService.normalize_url(url)}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def submit(db: Session, user_id: int, url: str) -> Tuple[ExtractionJob, bool]:
+        """Queue an extraction unless the user already has one for this URL; returns (job, queued)"""
+        key = JobService.idempotency_key(user_id, url)
+        job = db.query(ExtractionJob).filter(ExtractionJob.idempotency_key == key).first()
+        if job is None:
+            job = ExtractionJob(user_id=user_id, url=url, idempotency_key=key)
+            db.add(job)
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent submit of the same URL won the insert
+                db.rollback()
+                return db.query(ExtractionJob).filter(ExtractionJob.idempotency_key == key).one(), False
+            db.refresh(job)
+            return job, True
+
+        # Failed jobs, and finished ones whose article was deleted since, start over
+        article_gone = job.state == DONE and (
+            job.article_id is None or db.get(NewsArticle, job.article_id) is None
+        )
+        if job.state == FAILED or article_gone:
+            now = datetime.utcnow()
+            restarted = db.execute(
+                update(ExtractionJob)
+                .where(ExtractionJob.id == job.id, ExtractionJob.state == job.state)
+                .values(state=QUEUED, attempts=0, error=None, article_id=None, claimed_by=None,
+                        claimed_at=None, next_attempt_at=now, updated_at=now)
+            ).rowcount == 1
+            db.commit()
+            db.refresh(job)
+            return job, restarted
+        return job, False
+
+    @staticmethod
+    def _claimable(now: datetime):
+        """Queued jobs that are due, and active jobs whose worker stopped renewing its lease"""
+        lease_expired = now - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        return or_(
+            and_(ExtractionJob.state == QUEUED, ExtractionJob.next_attempt_at <= now),
+            and_(ExtractionJob.state.in_(ACTIVE_STATES), ExtractionJob.claimed_at <= lease_expired),
+        )
+
+    @staticmethod
+    def claim(db: Session, job_id: int, worker: str) -> bool:
+        """Take the lease on a job; a single conditional UPDATE, so only one worker can win it"""
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(ExtractionJob)
+            .where(ExtractionJob.id == job_id, JobService._claimable(now))
+            .values(state=FETCHING, attempts=ExtractionJob.attempts + 1, claimed_by=worker,
+                    claimed_at=now, error=None, updated_at=now)
+        ).rowcount == 1
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def due(db: Session, limit: int = 100) -> List[Tuple[int, datetime]]:
+        """(id, time it becomes claimable) of queued jobs and jobs with a lease, oldest first"""
+        lease = timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        rows = db.query(
+            ExtractionJob.id, ExtractionJob.state, ExtractionJob.next_attempt_at, ExtractionJob.claimed_at
+        ).filter(
+            ExtractionJob.state.in_((QUEUED,) + ACTIVE_STATES)
+        ).order_by(ExtractionJob.next_attempt_at).limit(limit).all()
+        return [
+            (row.id, row.next_attempt_at if row.state == QUEUED else (row.claimed_at or datetime.utcnow()) + lease)
+            for row in rows
+        ]
+
+    @staticmethod
+    def stalled(db: Session, limit: int = 100) -> List[int]:
+        """Jobs nobody is working on: queued a lease past their due time, or active with an expired lease"""
+        overdue = datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        rows = db.query(ExtractionJob.id).filter(
+            or_(
+                and_(ExtractionJob.state == QUEUED, ExtractionJob.next_attempt_at <= overdue),
+                and_(ExtractionJob.state.in_(ACTIVE_STATES), ExtractionJob.claimed_at <= overdue),
+            )
+        ).order_by(ExtractionJob.next_attempt_at).limit(limit).all()
+        return [row.id for row in rows]
+
+    @staticmethod
+    def advance(db: Session, job_id: int, worker: str, state: str) -> bool:
+        """Move a claimed job to its next state and renew the lease; False if the lease was lost"""
+        now = datetime.utcnow()
+        advanced = db.execute(
+            update(ExtractionJob)
+            .where(ExtractionJob.id == job_id, ExtractionJob.claimed_by == worker,
+                   ExtractionJob.state.in_(ACTIVE_STATES))
+            .values(state=state, claimed_at=now, updated_at=now)
+        ).rowcount == 1
+        db.commit()
+        return advanced
+
+    @staticmethod
+    def complete(db: Session, job_id: int, worker: str, article_id: int) -> bool:
+        """Mark the job done in the caller's transaction, so it commits together with the article"""
+        return db.execute(
+            update(ExtractionJob)
+            .where(ExtractionJob.id == job_id, ExtractionJob.claimed_by == worker,
+                   ExtractionJob.state.in_(ACTIVE_STATES))
+            .values(state=DONE, article_id=article_id, claimed_by=None, claimed_at=None,
+                    updated_at=datetime.utcnow())
+        ).rowcount == 1
+
+    @staticmethod
+    def retry_delay(attempts: int) -> float:
+        return min(settings.JOB_RETRY_BACKOFF * 2 ** max(attempts - 1, 0), settings.JOB_RETRY_BACKOFF_MAX)
+
+    @staticmethod
+    def fail(db: Session, job_id: int, worker: str, error: str, retryable: bool,
+             retry_after: Optional[float] = None, count_attempt: bool = True) -> Optional[float]:
+        """Requeue the job with backoff, or fail it for good; returns the retry delay if requeued.
+
+        retry_after is a lower bound for the delay (e.g. from the origin's Retry-After); attempts
+        that never reached the origin pass count_attempt=False so they don't use up retries.
+        """
+        job = db.get(ExtractionJob, job_id)
+        if job is None or job.claimed_by != worker:
+            return None
+        now = datetime.utcnow()
+        delay = None
+        attempts = job.attempts if count_attempt else job.attempts - 1
+        values = {"error": error[:2000], "attempts": attempts, "claimed_by": None, "claimed_at": None, "updated_at": now}
+        if retryable and (attempts < settings.JOB_MAX_ATTEMPTS or not count_attempt):
+            delay = max(JobService.retry_delay(max(attempts, 1)), retry_after or 0)
+            values.update(state=QUEUED, next_attempt_at=now + timedelta(seconds=delay))
+        else:
+            values.update(state=FAILED)
+        failed = db.execute(
+            update(ExtractionJob)
+            .where(ExtractionJob.id == job_id, ExtractionJob.claimed_by == worker)
+            .values(**values)
+        ).rowcount == 1
+        db.commit()
+        return delay if failed else None
+
+
+class JobRunner:
+    """Runs extraction jobs: in this process's event loop, or on the Celery extract queue"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._scheduled = set()
+        self._tasks = set()
+        self._parse_executor: Optional[ThreadPoolExecutor] = None
+
+    def parse_executor(self) -> ThreadPoolExecutor:
+        # Inline jobs share the API worker's loop with every request; the parse must not run on it
+        if self._parse_executor is None:
+            self._parse_executor = ThreadPoolExecutor(settings.BATCH_PARSE_WORKERS, thread_name_prefix="job-parse")
+        return self._parse_executor
+
+    def schedule(self, job_id: int, delay: float = 0.0) -> None:
+        if settings.JOB_RUNNER == "celery":
+            from app.services.task_queue import run_extraction_job
+            run_extraction_job.apply_async((job_id,), countdown=max(delay, 0))
+            return
+        if job_id in self._scheduled:
+            return
+        self._scheduled.add(job_id)
+        asyncio.get_running_loop().call_later(max(delay, 0), self._start, job_id)
+
+    def _start(self, job_id: int) -> None:
+        self._scheduled.discard(job_id)
+        if in_flight.draining:
+            # Left queued; whichever worker sweeps next picks it up
+            return
+        task = asyncio.ensure_future(self._run_tracked(job_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_tracked(self, job_id: int) -> None:
+        with in_flight.track():
+            await self.run(job_id)
+
+    def sweep(self) -> int:
+        """Schedule every job still waiting to run, e.g. those left by a restarted worker"""
+        db = self.session_factory()
+        try:
+            due = JobService.due(db)
+        finally:
+            db.close()
+        now = datetime.utcnow()
+        for job_id, claimable_at in due:
+            self.schedule(job_id, (claimable_at - now).total_seconds())
+        return len(due)
+
+    def startup_sweep(self) -> None:
+        """Requeue what a previous run left behind; called once in the gunicorn master with Celery"""
+        if settings.JOB_RUNNER != "celery":
+            return
+        try:
+            print(f"Requeued {self.sweep()} pending extraction jobs")
+        except Exception as e:
+            # e.g. a database whose migrations the workers have yet to apply; beat recovers later
+            print(f"Could not requeue pending extraction jobs: {e}")
+
+    def recover(self) -> int:
+        """Resend stalled jobs, whose queue message was lost or whose worker died, to be run now"""
+        db = self.session_factory()
+        try:
+            stalled = JobService.stalled(db)
+        finally:
+            db.close()
+        for job_id in stalled:
+            self.schedule(job_id)
+        return len(stalled)
+
+    async def sweep_forever(self, interval: float) -> None:
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Extraction job sweep failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def run(self, job_id: int) -> None:
+        """Claim a job and take it through fetching, parsing and media to done"""
+        from app.services.advanced_extractor import AdvancedNewsExtractor
+        from app.services.ingest import ArticleIngest
+
+        db = self.session_factory()
+        try:
+            if not JobService.claim(db, job_id, self.worker_id):
+                return
+            job = db.get(ExtractionJob, job_id)
+            url, user_id = job.url, job.user_id
+
+            try:
+                html = await AdvancedNewsExtractor._fetch_html(url)
+            except FetchRejected as e:
+                # Held back by the fetch governor; nothing was sent, so the attempt is not counted
+                self._fail(db, job_id, f"Fetch deferred: {e}", retryable=True,
+                           retry_after=e.retry_after, count_attempt=False)
+                return
+            except PageRejected as e:
+                self._fail(db, job_id, str(e), retryable=False)
+                return
+            except Exception as e:
+                self._fail(db, job_id, f"Fetch failed: {e}", retryable=True)
+                return
+
+            if not JobService.advance(db, job_id, self.worker_id, PARSING):
+                return
+            extracted = await AdvancedNewsExtractor.extract_with_metadata(url, html=html, executor=self.parse_executor())
+            if not extracted.success:
+                # The page was downloaded; parsing it again would give the same result
+                self._fail(db, job_id, extracted.error or "Extraction failed", retryable=False)
+                return
+
+            if not JobService.advance(db, job_id, self.worker_id, MEDIA):
+                return
+            article, duplicate_of = ArticleIngest.build(db, url, user_id, extracted)
+            # Inline watermarking blocks on the image download and render, so it runs in a thread
+            queue_watermark = await asyncio.to_thread(ArticleIngest.process_media, article, duplicate_of)
+            db.add(article)
+            db.flush()
+            if not JobService.complete(db, job_id, self.worker_id, article.id):
+                # Another worker took the job over after our lease expired
+                db.rollback()
+                return
+            db.commit()
+
+            if queue_watermark:
+                ArticleIngest.queue_media(article)
+        except Exception as e:
+            db.rollback()
+            self._fail(db, job_id, str(e) or e.__class__.__name__, retryable=True)
+        finally:
+            db.close()
+
+    def _fail(self, db: Session, job_id: int, error: str, retryable: bool, **options) -> None:
+        delay = JobService.fail(db, job_id, self.worker_id, error, retryable, **options)
+        if delay is not None:
+            self.schedule(job_id, delay)
+
+
+job_runner = JobRunner()
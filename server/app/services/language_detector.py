@@ -0,0 +1,114 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+from app.config import settings
+
+
+class LanguageDetector:
+    """Deterministic langdetect wrapper with one shared profile factory and a result cache"""
+
+    def __init__(self, sample_chars: int = 2000, cache_size: int = 10000, seed: int = 0):
+        self.sample_chars = sample_chars
+        self.cache_size = cache_size
+        self.seed = seed
+        self._factory = None
+        self._cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def load(self) -> None:
+        """Load the language profiles; cheap to call again once loaded"""
+        if self._factory is not None:
+            return
+        with self._load_lock:
+            if self._factory is not None:
+                return
+            from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+
+            factory = DetectorFactory()
+            factory.load_profile(PROFILES_DIRECTORY)
+            factory.seed = self.seed
+            self._factory = factory
+
+    def _sample(self, text: str) -> str:
+        """Bounded prefix of the text, cut at a word boundary"""
+        text = text.strip()
+        if len(text) <= self.sample_chars:
+            return text
+        cut = text.rfind(" ", 0, self.sample_chars)
+        return text[:cut if cut > 0 else self.sample_chars]
+
+    @staticmethod
+    def _key(sample: str) -> bytes:
+        return hashlib.blake2b(sample.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def _cached(self, key: bytes):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return True, self._cache[key]
+        return False, None
+
+    def _store(self, key: bytes, language: Optional[str]) -> None:
+        with self._lock:
+            self._cache[key] = language
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _detect_sample(self, sample: str) -> Optional[str]:
+        from langdetect.lang_detect_exception import LangDetectException
+
+        self.load()
+        detector = self._factory.create()
+        detector.append(sample)
+        try:
+            return detector.detect()
+        except LangDetectException:
+            return None
+
+    def detect(self, text: Optional[str]) -> Optional[str]:
+        if not text or not text.strip():
+            return None
+        sample = self._sample(text)
+        key = self._key(sample)
+        hit, language = self._cached(key)
+        if hit:
+            return language
+        language = self._detect_sample(sample)
+        self._store(key, language)
+        return language
+
+    def detect_many(self, texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """Detect a batch of texts, running the detector once per distinct sample"""
+        results: List[Optional[str]] = []
+        pending = {}
+        for index, text in enumerate(texts):
+            results.append(None)
+            if not text or not text.strip():
+                continue
+            sample = self._sample(text)
+            key = self._key(sample)
+            hit, language = self._cached(key)
+            if hit:
+                results[index] = language
+            else:
+                pending.setdefault(key, (sample, []))[1].append(index)
+
+        for key, (sample, indexes) in pending.items():
+            language = self._detect_sample(sample)
+            self._store(key, language)
+            for index in indexes:
+                results[index] = language
+        return results
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+language_detector = LanguageDetector(
+    sample_chars=settings.LANGUAGE_SAMPLE_CHARS,
+    cache_size=settings.LANGUAGE_CACHE_SIZE,
+)
@@ -1,61 +1,92 @@
-from PIL import Image, ImageDraw, ImageFont
-import moviepy.editor as mp
-import requests
 from io import BytesIO
 import os
 import uuid
+from app.config import settings
+from app.services.fetch_governor import fetch_governor
+from app.services.metrics import stage
 
+# PIL, moviepy (numpy, imageio, ffmpeg probing) and requests are imported where they are
+# used, so API processes that never touch media don't load them.
 class MediaProcessor:
     @staticmethod
-    def add_watermark(image_url: str, watermark_text: str) -> str:
+    def preload() -> None:
+        """Import the media libraries up front, e.g. in a media worker before it forks"""
+        import PIL.Image, PIL.ImageDraw, PIL.ImageFont  # noqa: F401
+        import moviepy.editor  # noqa: F401
+        import requests  # noqa: F401
+    
+    @staticmethod
+    def add_watermark(image_url: str, watermark_text: str, raise_errors: bool = False) -> str:
+        """Watermark a remote image; on failure the original URL is returned unless raise_errors"""
+        import requests
+        from PIL import Image, ImageDraw, ImageFont
+        
         try:
-            response = requests.get(image_url)
-            img = Image.open(BytesIO(response.content))
-            
-            draw = ImageDraw.Draw(img)
+            with stage("image_download", image_url), fetch_governor.sync_slot(image_url) as slot:
+                response = requests.get(image_url, timeout=(settings.FETCH_CONNECT_TIMEOUT, settings.FETCH_READ_TIMEOUT))
+                slot.record_response(response.status_code, response.headers)
+                response.raise_for_status()
             
-            width, height = img.size
-            try:
-                font = ImageFont.truetype("arial.ttf", size=int(height/20))
-            except:
-                font = ImageFont.load_default()
-            
-            bbox = font.getbbox(watermark_text)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            x = width - text_width - 10
-            y = height - text_height - 10
-            
-            draw.text((x, y), watermark_text, fill=(255, 255, 255, 128), font=font)
+            with stage("watermark_render", image_url):
+                img = Image.open(BytesIO(response.content))
+                
+                draw = ImageDraw.Draw(img)
+                
+                width, height = img.size
+                try:
+                    font = ImageFont.truetype("arial.ttf", size=int(height/20))
+                except:
+                    font = ImageFont.load_default()
+                
+                bbox = font.getbbox(watermark_text)
+                text_width = bbox[2] - bbox[0]
+                text_height = bbox[3] - bbox[1]
+                x = width - text_width - 10
+                y = height - text_height - 10
+                
+                draw.text((x, y), watermark_text, fill=(255, 255, 255, 128), font=font)
             
             filename = f"watermarked_{uuid.uuid4().hex}.jpg"
-            filepath = f"static/images/{filename}"
+            filepath = os.path.join(settings.STATIC_DIR, "images", filename)
             
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            img.save(filepath)
+            with stage("image_save", image_url):
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                img.save(filepath)
             
-            return filepath
+            # Served by the /static mount regardless of where STATIC_DIR is
+            return f"static/images/{filename}"
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Watermark error: {e}")
             return image_url
     
     @staticmethod
-    def add_video_intro(video_url: str, intro_path: str) -> str:
+    def add_video_intro(video_url: str, intro_path: str, raise_errors: bool = False) -> str:
+        import moviepy.editor as mp
+        
         try:
             intro = mp.VideoFileClip(intro_path)
-            main_video = mp.VideoFileClip(video_url)
+            # ffmpeg reads the remote video itself; opening it still takes a slot for its domain
+            if video_url.startswith(("http://", "https://")):
+                with fetch_governor.sync_slot(video_url, observe_latency=False):
+                    main_video = mp.VideoFileClip(video_url)
+            else:
+                main_video = mp.VideoFileClip(video_url)
             
             final_video = mp.concatenate_videoclips([intro, main_video])
             
             filename = f"intro_added_{uuid.uuid4().hex}.mp4"
-            filepath = f"static/videos/{filename}"
+            filepath = os.path.join(settings.STATIC_DIR, "videos", filename)
             
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             final_video.write_videofile(filepath)
             
-            return filepath
+            return f"static/videos/{filename}"
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Video processing error: {e}")
             return video_url
\ No newline at end of file
@@ -0,0 +1,199 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Domains get their own label value up to this many; the rest are folded into "other"
+MAX_DOMAIN_LABELS = 200
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def samples(self) -> List[str]:
+        try:
+            values = self.collect() if self.collect else {}
+        except Exception as e:
+            logger.warning("Failed to collect %s: %s", self.name, e)
+            return []
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in values.items()]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._values.items()]
+
+        lines = []
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, inf)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+        self._domains = set()
+        self._domains_lock = threading.Lock()
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def domain_label(self, url_or_domain: str) -> str:
+        """Bound label cardinality by folding unseen domains into "other" past the limit"""
+        domain = urlparse(url_or_domain).netloc if "//" in url_or_domain else url_or_domain
+        domain = domain.lower()
+        if domain.startswith("www."):
+            domain = domain[4:]
+        if domain in self._domains:
+            return domain
+        with self._domains_lock:
+            if len(self._domains) >= MAX_DOMAIN_LABELS:
+                return "other"
+            self._domains.add(domain)
+        return domain
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+extraction_stage_seconds = registry.register(Histogram(
+    "extraction_stage_seconds",
+    "Time spent in each extraction stage",
+    ("stage", "domain"),
+))
+extraction_stage_errors_total = registry.register(Counter(
+    "extraction_stage_errors_total",
+    "Extraction stages that raised an exception",
+    ("stage", "domain"),
+))
+http_requests_total = registry.register(Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ("method", "route", "status"),
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ("method", "route"),
+))
+
+
+# Callbacks receiving (stage, domain, seconds) for every finished stage, e.g. benchmarks
+stage_listeners: List[Callable[[str, str, float], None]] = []
+
+
+@contextmanager
+def stage(name: str, domain: str = ""):
+    """Time a block as one extraction stage: `with stage("newspaper_parse", url): ...`"""
+    domain = registry.domain_label(domain) if domain else ""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        extraction_stage_errors_total.inc(name, domain)
+        raise
+    finally:
+        record_stage(name, domain, time.perf_counter() - started)
+
+
+def record_stage(name: str, domain: str, elapsed: float) -> None:
+    """Report a stage timed elsewhere, e.g. by aiohttp trace callbacks; `domain` is already a label"""
+    extraction_stage_seconds.observe(elapsed, name, domain)
+    for listener in stage_listeners:
+        listener(name, domain, elapsed)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("stage=%s domain=%s seconds=%.6f", name, domain, elapsed)
@@ -1,52 +1,73 @@
-import requests
-from newspaper import Article
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Optional
 from datetime import datetime
 import json
 import re
+from app.config import settings
+from app.services.embedded_state import EmbeddedStateExtractor
+from app.services.extraction_result import ExtractedArticle, Extraction, ExtractionFailure
+from app.services.metrics import stage
+from app.services.page_fetch import PageFetcher
+
+if TYPE_CHECKING:
+    from newspaper import Article
+
+# Stand-ins stored when newspaper finds no title or text; never real article text
+NO_TITLE = "No title available"
+NO_CONTENT = "No content available"
 
 class NewsExtractor:
     @staticmethod
-    def extract_content(url: str) -> Dict:
+    def extract_content(url: str, html: Optional[str] = None) -> Extraction:
+        # Imported on first use: newspaper pulls in nltk, lxml and PIL
+        from newspaper import Article
+        
         try:
             article = Article(url)
-            article.download()
-            article.parse()
-            
-            title = article.title or "No title available"
-            content = article.text or "No content available"
-            image_url = None
+            with stage("newspaper_download", url):
+                # Already fetched HTML is handed to newspaper instead of downloading again
+                if html is None:
+                    html = NewsExtractor._download(url)
+                article.download(input_html=html)
+            with stage("newspaper_parse", url):
+                article.parse()
             
-            if article.top_image:
-                image_url = article.top_image
-            elif article.images:
-                image_url = article.images[0]
+            result = ExtractedArticle(
+                title=article.title or NO_TITLE,
+                content=article.text or NO_CONTENT,
+                image_url=article.top_image or (article.images[0] if article.images else None),
+            )
             
-            # Enhanced date extraction
-            publish_date = NewsExtractor._extract_publish_date(article)
+            with stage("newspaper_metadata", url):
+                # Enhanced date extraction
+                result.publish_date = NewsExtractor._extract_publish_date(article)
+                
+                # Extract meta information
+                result.meta_keywords = NewsExtractor._extract_meta_keywords(article)
+                result.meta_lang = NewsExtractor._extract_meta_lang(article)
             
-            # Extract meta information
-            meta_keywords = NewsExtractor._extract_meta_keywords(article)
-            meta_lang = NewsExtractor._extract_meta_lang(article)
+            # Client-rendered pages leave newspaper almost nothing; their text is in the embedded state
+            if len(article.text or "") < settings.EMBEDDED_STATE_MIN_CHARS:
+                with stage("embedded_state", url):
+                    state = EmbeddedStateExtractor.extract(html)
+                if state and len(state["content"]) > len(article.text or ""):
+                    result.content = state["content"]
+                    if not article.title:
+                        result.title = state["title"]
+                    result.image_url = result.image_url or state["image_url"]
+                    result.publish_date = result.publish_date or state["publish_date"]
             
-            return {
-                "title": title,
-                "content": content,
-                "publish_date": publish_date,
-                "image_url": image_url,
-                "meta_keywords": meta_keywords,
-                "meta_lang": meta_lang,
-                "success": True
-            }
+            return result
             
         except Exception as e:
-            return {
-                "error": f"Failed to extract content: {str(e)}",
-                "success": False
-            }
+            return ExtractionFailure(f"Failed to extract content: {str(e)}")
+    
+    @staticmethod
+    def _download(url: str) -> str:
+        """Blocking governed download, for callers without an event loop"""
+        return PageFetcher.fetch_sync(url).html
     
     @staticmethod
-    def _extract_publish_date(article: Article) -> datetime:
+    def _extract_publish_date(article: "Article") -> datetime:
         """Enhanced date extraction from article metadata"""
         # Try the standard publish_date first
         if article.publish_date:
@@ -100,7 +121,7 @@ class NewsExtractor:
         return None
     
     @staticmethod
-    def _extract_meta_keywords(article: Article) -> str:
+    def _extract_meta_keywords(article: "Article") -> str:
         """Extract meta keywords from article"""
         try:
             if hasattr(article, 'html') and article.html:
@@ -137,7 +158,7 @@ class NewsExtractor:
         return None
     
     @staticmethod
-    def _extract_meta_lang(article: Article) -> str:
+    def _extract_meta_lang(article: "Article") -> str:
         """Extract meta language from article"""
         try:
             if hasattr(article, 'html') and article.html:
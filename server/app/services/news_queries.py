@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models.fingerprint import ArticleFingerprint
+from app.models.news import NewsArticle
+from app.models.tag import Tag
+from app.services.tags import TagService
+
+# Columns sent by the list endpoint; the article body is left to the detail view
+LIST_COLUMNS = (
+    NewsArticle.id,
+    NewsArticle.url,
+    NewsArticle.title,
+    NewsArticle.publish_date,
+    NewsArticle.image_url,
+    NewsArticle.processed_image_url,
+    NewsArticle.video_url,
+    NewsArticle.processed_video_url,
+    NewsArticle.meta_keywords,
+    NewsArticle.meta_lang,
+    NewsArticle.created_at,
+    NewsArticle.user_id,
+    ArticleFingerprint.duplicate_of_id,
+)
+
+LIST_FIELDS = tuple(column.key for column in LIST_COLUMNS)
+
+
+class NewsQueryService:
+    @staticmethod
+    def domain_filter(domain: str):
+        """URLs on the domain itself or its www. host, over http or https"""
+        domain = domain.strip().lower()
+        if domain.startswith("www."):
+            domain = domain[4:]
+        escaped = domain.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return or_(*(
+            NewsArticle.url.like(f"{scheme}://{host}{escaped}/%", escape="\\")
+            for scheme in ("http", "https") for host in ("", "www.")
+        ))
+    
+    @staticmethod
+    def list_for_user(db: Session, user_id: int, tag: Optional[str] = None) -> List[Dict]:
+        """List rows as plain dicts, read as column tuples without loading ORM objects"""
+        query = (
+            db.query(*LIST_COLUMNS)
+            .outerjoin(ArticleFingerprint, ArticleFingerprint.article_id == NewsArticle.id)
+            .filter(NewsArticle.user_id == user_id)
+        )
+        if tag:
+            query = query.filter(NewsArticle.tags.any(Tag.name == TagService.fold(tag)))
+        rows = query.order_by(NewsArticle.id).all()
+        return [dict(zip(LIST_FIELDS, row)) for row in rows]
@@ -0,0 +1,300 @@
+import codecs
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from app.config import settings
+from app.services.fetch_governor import fetch_governor
+from app.services.robots import robots_cache
+
+# Content types worth parsing; responses without a Content-Type are let through
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Bytes looked at to pick a charset when the headers don't name one (the WHATWG prescan size)
+CHARSET_PRESCAN_BYTES = 1024
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE)
+_HEAD_END = re.compile(r"</head\s*>|<body[\s>]", re.IGNORECASE)
+_HEAD_END_BYTES = re.compile(rb"</head\s*>|<body[\s>]", re.IGNORECASE)
+# aiohttp session bound by a batch to its own tasks; None means one session per request
+_shared_session: ContextVar[Any] = ContextVar("shared_session", default=None)
+
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+class PageRejected(Exception):
+    """The response is not something to parse: wrong content type or declared too large"""
+
+
+class RobotsDisallowed(PageRejected):
+    """robots.txt asks us not to fetch the URL; nothing was requested"""
+
+    def __init__(self, url: str):
+        super().__init__(f"Disallowed by robots.txt: {url}")
+        self.url = url
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    status: int
+    charset: str
+    html: str
+    # Markup up to </head>, and whatever on_head returned for it while the body was still arriving
+    head: Optional[str] = None
+    head_result: Any = None
+    # True when the body was cut off at FETCH_MAX_BYTES
+    truncated: bool = False
+    # Validators for conditional requests on the next fetch
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        """304 to a conditional request: the stored copy is current and there is no body"""
+        return self.status == 304
+
+
+def _valid_codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    for param in (content_type or "").split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            return _valid_codec(value)
+    return None
+
+
+def detect_charset(content_type: Optional[str], prefix: bytes) -> str:
+    """Pick the charset once: Content-Type header, byte order mark, <meta charset>, then the bytes"""
+    charset = charset_from_content_type(content_type)
+    if charset:
+        return charset
+    for bom, name in _BOMS:
+        if prefix.startswith(bom):
+            return name
+    match = _META_CHARSET.search(prefix[:CHARSET_PRESCAN_BYTES])
+    if match:
+        charset = _valid_codec(match.group(1).decode("ascii", "ignore"))
+        if charset:
+            return charset
+    try:
+        # A multi-byte character may be cut at the end of the prefix, hence the incremental decoder
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    from charset_normalizer import from_bytes
+
+    best = from_bytes(prefix).best()
+    return best.encoding if best is not None else "windows-1252"
+
+
+def split_head(html: str) -> Optional[str]:
+    """Markup before </head> (or <body> when the head isn't closed), None if neither is there"""
+    match = _HEAD_END.search(html)
+    return html[:match.start()] if match else None
+
+
+def check_response(headers, max_bytes: int) -> None:
+    """Reject a response from its headers alone, before any of the body is read"""
+    content_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        raise PageRejected(f"Not an HTML page: {content_type}")
+    length = headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise PageRejected(f"Page too large: {length} bytes")
+
+
+class PageReader:
+    """Decodes a body fed in chunks, stopping at the byte cap and reporting </head> as it arrives"""
+
+    def __init__(self, url: str, status: int, content_type: Optional[str], max_bytes: int,
+                 on_head: Optional[Callable[[str], Any]] = None, headers=None):
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self.etag = headers.get("ETag") if headers is not None else None
+        self.last_modified = headers.get("Last-Modified") if headers is not None else None
+        self.max_bytes = max_bytes
+        self.on_head = on_head
+        self.received = 0
+        self.truncated = False
+        self.charset: Optional[str] = None
+        self.head: Optional[str] = None
+        self.head_result: Any = None
+        self._pending = b""
+        self._decoder = None
+        self._parts: List[str] = []
+        self._text_length = 0
+        self._tail = ""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a chunk; False once the cap is reached and the rest of the body should be dropped"""
+        room = self.max_bytes - self.received
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            self.truncated = True
+        self.received += len(chunk)
+        if self._decoder is None:
+            self._pending += chunk
+            # A short head is decoded as soon as it is complete rather than after the full prescan
+            if len(self._pending) >= CHARSET_PRESCAN_BYTES or self.truncated or _HEAD_END_BYTES.search(self._pending):
+                self._start_decoding()
+        else:
+            self._decode(chunk)
+        return not self.truncated
+
+    def _start_decoding(self) -> None:
+        self.charset = detect_charset(self.content_type, self._pending)
+        self._decoder = codecs.getincrementaldecoder(self.charset)(errors="replace")
+        pending, self._pending = self._pending, b""
+        self._decode(pending)
+
+    def _decode(self, data: bytes, final: bool = False) -> None:
+        text = self._decoder.decode(data, final=final)
+        if not text:
+            return
+        offset = self._text_length - len(self._tail)
+        self._parts.append(text)
+        self._text_length += len(text)
+        if self.head is not None:
+            return
+        # Only the new text plus a short tail is searched, in case the tag straddles two chunks
+        window = self._tail + text
+        match = _HEAD_END.search(window)
+        if match is None:
+            self._tail = window[-16:]
+            return
+        self.head = "".join(self._parts)[:offset + match.start()]
+        if self.on_head is not None:
+            try:
+                self.head_result = self.on_head(self.head)
+            except Exception as e:
+                print(f"Head parsing error for {self.url}: {e}")
+
+    def finish(self) -> FetchedPage:
+        if self._decoder is None:
+            self._start_decoding()
+        self._decode(b"", final=True)
+        return FetchedPage(
+            url=self.url,
+            status=self.status,
+            charset=self.charset,
+            html="".join(self._parts),
+            head=self.head,
+            head_result=self.head_result,
+            truncated=self.truncated,
+            etag=self.etag,
+            last_modified=self.last_modified,
+        )
+
+
+class PageFetcher:
+    """Governed, streaming HTML download with a byte cap; one implementation for async and sync callers"""
+
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def timeout():
+        import aiohttp
+
+        return aiohttp.ClientTimeout(
+            total=settings.FETCH_TOTAL_TIMEOUT,
+            sock_connect=settings.FETCH_CONNECT_TIMEOUT,
+            sock_read=settings.FETCH_READ_TIMEOUT,
+        )
+
+    @staticmethod
+    def open_session(limit: int):
+        """One connection pool for many fetches; bind it to each task with bind_session()"""
+        import aiohttp
+        from app.services.fetch_timing import FetchTiming
+
+        return aiohttp.ClientSession(
+            connector=FetchTiming.connector(limit), timeout=PageFetcher.timeout(),
+            trace_configs=[FetchTiming.trace_config()],
+            # The agent robots.txt is read for, so the site can tell which rules we follow
+            headers={"User-Agent": settings.ROBOTS_USER_AGENT},
+        )
+
+    @staticmethod
+    def bind_session(session) -> None:
+        """Use the session for this task's fetches; tasks get their own context, so nothing leaks out"""
+        _shared_session.set(session)
+
+    @staticmethod
+    def conditional_headers(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+        """Request headers that let the origin answer 304 when the page hasn't changed"""
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    @staticmethod
+    async def fetch(url: str, on_head: Optional[Callable[[str], Any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> FetchedPage:
+        if not await robots_cache.allowed(url):
+            raise RobotsDisallowed(url)
+        session = _shared_session.get()
+        async with fetch_governor.slot(url) as slot:
+            if session is None:
+                async with PageFetcher.open_session(settings.FETCH_MAX_CONCURRENCY) as own_session:
+                    reader = await PageFetcher._read(own_session, url, slot, on_head, headers)
+            else:
+                reader = await PageFetcher._read(session, url, slot, on_head, headers)
+        return PageFetcher._finish(reader)
+
+    @staticmethod
+    async def _read(session, url: str, slot, on_head: Optional[Callable[[str], Any]],
+                    headers: Optional[Dict[str, str]] = None) -> PageReader:
+        async with session.get(url, headers=headers) as response:
+            slot.record_response(response.status, response.headers)
+            response.raise_for_status()
+            check_response(response.headers, settings.FETCH_MAX_BYTES)
+            reader = PageReader(url, response.status, response.headers.get("Content-Type"),
+                                settings.FETCH_MAX_BYTES, on_head, response.headers)
+            if response.status == 304:
+                return reader
+            async for chunk in response.content.iter_chunked(PageFetcher.CHUNK_SIZE):
+                if not reader.feed(chunk):
+                    break
+        return reader
+
+    @staticmethod
+    def fetch_sync(url: str, on_head: Optional[Callable[[str], Any]] = None,
+                   headers: Optional[Dict[str, str]] = None) -> FetchedPage:
+        import requests
+
+        if not robots_cache.allowed_sync(url):
+            raise RobotsDisallowed(url)
+        timeout = (settings.FETCH_CONNECT_TIMEOUT, settings.FETCH_READ_TIMEOUT)
+        headers = {"User-Agent": settings.ROBOTS_USER_AGENT, **(headers or {})}
+        with fetch_governor.sync_slot(url) as slot:
+            with requests.get(url, timeout=timeout, stream=True, headers=headers) as response:
+                slot.record_response(response.status_code, response.headers)
+                response.raise_for_status()
+                check_response(response.headers, settings.FETCH_MAX_BYTES)
+                reader = PageReader(url, response.status_code, response.headers.get("Content-Type"),
+                                    settings.FETCH_MAX_BYTES, on_head, response.headers)
+                if response.status_code != 304:
+                    for chunk in response.iter_content(PageFetcher.CHUNK_SIZE):
+                        if not reader.feed(chunk):
+                            break
+        return PageFetcher._finish(reader)
+
+    @staticmethod
+    def _finish(reader: PageReader) -> FetchedPage:
+        page = reader.finish()
+        if page.truncated:
+            print(f"Page truncated at {settings.FETCH_MAX_BYTES} bytes: {page.url}")
+        return page
@@ -0,0 +1,54 @@
+import gc
+from app.config import settings
+
+
+class SharedAssets:
+    """Read-only extraction assets loaded once in a parent process and shared copy-on-write by its forks.
+
+    Pages stay shared only while nothing writes to them, and a cyclic GC pass in a child writes to the
+    header of every object it visits. The parent therefore loads with the collector paused (no freed
+    holes between the objects) and then freezes everything it holds, which collections skip.
+    """
+
+    @staticmethod
+    def load_extraction() -> None:
+        """Modules, stopword lists and language profiles the extractor otherwise loads on first use"""
+        import aiohttp, bs4, charset_normalizer, lxml.html, requests  # noqa: F401
+        import nltk  # noqa: F401
+        from newspaper import Article  # noqa: F401
+        from newspaper.text import StopWords
+        from newspaper.utils import get_available_languages
+        from app.services import batch_extractor, fetch_timing  # noqa: F401
+        from app.services.language_detector import language_detector
+
+        # StopWords caches each language's list on the class, so every later Article reuses it
+        for language in get_available_languages():
+            try:
+                StopWords(language)
+            except Exception as e:
+                print(f"Stopwords for {language} not preloaded: {e}")
+        language_detector.load()
+
+    @staticmethod
+    def load(media: bool = False) -> None:
+        if settings.EXTRACTION_PRELOAD:
+            SharedAssets.load_extraction()
+        if media:
+            from app.services.media_processor import MediaProcessor
+
+            MediaProcessor.preload()
+
+    @staticmethod
+    def preload(media: bool = False) -> None:
+        """Load and freeze; call in the parent before it starts forking workers"""
+        gc.disable()
+        try:
+            SharedAssets.load(media)
+        finally:
+            SharedAssets.freeze()
+            gc.enable()
+
+    @staticmethod
+    def freeze() -> None:
+        """Move everything allocated so far to the permanent generation, e.g. before forking a replacement worker"""
+        gc.freeze()
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class QueueProfile:
+    """Task limits for one Celery queue plus the worker sizing it is meant to run with"""
+    pool: str
+    concurrency: Optional[int]  # None: one process per CPU
+    prefetch_multiplier: int
+    soft_time_limit: int
+    time_limit: int
+    max_retries: int
+    retry_backoff: int
+    retry_backoff_max: int
+    result_expires: int
+    max_tasks_per_child: Optional[int] = None
+
+    def task_options(self) -> Dict:
+        return {
+            "soft_time_limit": self.soft_time_limit,
+            "time_limit": self.time_limit,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "retry_backoff_max": self.retry_backoff_max,
+            "retry_jitter": True,
+            "result_expires": self.result_expires,
+            # Acknowledge after the task finishes, so a crashed worker's task is redelivered
+            "acks_late": True,
+            "reject_on_worker_lost": True,
+        }
+
+    def worker_command(self, queue: str) -> str:
+        parts = [
+            "celery -A app.services.task_queue worker",
+            f"-Q {queue} -n {queue}@%h",
+            f"--pool {self.pool}",
+            f"--prefetch-multiplier {self.prefetch_multiplier}",
+        ]
+        if self.concurrency:
+            parts.append(f"--concurrency {self.concurrency}")
+        if self.max_tasks_per_child:
+            parts.append(f"--max-tasks-per-child {self.max_tasks_per_child}")
+        return " ".join(parts) + " --loglevel=info"
+
+
+QUEUE_PROFILES: Dict[str, QueueProfile] = {
+    # Fetch/extract: mostly waiting on the network, so more processes than cores and a deeper
+    # prefetch. Prefork rather than threads, which would not enforce the time limits.
+    "extract": QueueProfile(
+        pool="prefork", concurrency=16, prefetch_multiplier=4,
+        soft_time_limit=60, time_limit=90,
+        max_retries=3, retry_backoff=5, retry_backoff_max=300,
+        result_expires=3600,
+    ),
+    # Watermarks and cleanup: short CPU bursts, one process per core
+    "image": QueueProfile(
+        pool="prefork", concurrency=None, prefetch_multiplier=2,
+        soft_time_limit=30, time_limit=60,
+        max_retries=3, retry_backoff=2, retry_backoff_max=60,
+        result_expires=3600,
+    ),
+    # Video intros: minutes of CPU each, so no prefetch and few processes, recycled for moviepy leaks
+    "video": QueueProfile(
+        pool="prefork", concurrency=2, prefetch_multiplier=1,
+        soft_time_limit=600, time_limit=900,
+        max_retries=1, retry_backoff=60, retry_backoff_max=600,
+        result_expires=6 * 3600, max_tasks_per_child=10,
+    ),
+}
+
+
+if __name__ == "__main__":
+    for queue, profile in QUEUE_PROFILES.items():
+        print(profile.worker_command(queue))
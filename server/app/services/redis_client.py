@@ -0,0 +1,15 @@
+import redis
+from app.config import settings
+
+_client = None
+
+def get_redis() -> redis.Redis:
+    """Shared client with short timeouts, for probes and metrics that must not hang"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5
+        )
+    return _client
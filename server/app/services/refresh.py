@@ -0,0 +1,324 @@
+import asyncio
+import difflib
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import orjson
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.news import NewsArticle
+from app.models.revision import ArticleRefresh, ArticleRevision
+from app.services.compression import BodyCodec
+from app.services.page_fetch import PageFetcher
+
+# Outcomes of one refresh, cheapest first
+NOT_MODIFIED = "not_modified"  # the origin answered 304 to the conditional request
+SAME_PAGE = "same_page"  # byte-identical page, not parsed
+UNCHANGED = "unchanged"  # parsed, same title and text
+REVISED = "revised"
+FAILED = "failed"
+
+
+class RevisionDiff:
+    """Line diffs between two versions of an article, as [start, end, replacement lines] edits"""
+
+    @staticmethod
+    def make(source: str, target: str) -> List:
+        """Edits that turn source into target; unchanged lines are not stored"""
+        a = source.splitlines(keepends=True)
+        b = target.splitlines(keepends=True)
+        return [
+            [i1, i2, b[j1:j2]]
+            for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+            if tag != "equal"
+        ]
+
+    @staticmethod
+    def apply(source: str, edits: List) -> str:
+        lines = source.splitlines(keepends=True)
+        parts = []
+        position = 0
+        for start, end, replacement in edits:
+            parts.extend(lines[position:start])
+            parts.extend(replacement)
+            position = end
+        parts.extend(lines[position:])
+        return "".join(parts)
+
+    @staticmethod
+    def encode(edits: List) -> Tuple[str, bytes]:
+        return BodyCodec.encode(orjson.dumps(edits).decode("utf-8"))
+
+    @staticmethod
+    def decode(codec: str, data: bytes) -> List:
+        return orjson.loads(BodyCodec.decode(codec, data))
+
+
+@dataclass
+class DueArticle:
+    article_id: int
+    url: str
+    domain: str
+    created_at: Optional[datetime]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    page_hash: Optional[str]
+
+
+@dataclass
+class RefreshOutcome:
+    article_id: int
+    status: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    page_hash: Optional[str] = None
+    # Set when the page was parsed
+    title: Optional[str] = None
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+
+class RefreshService:
+    @staticmethod
+    def domain(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    @staticmethod
+    def next_refresh(first_seen: datetime, now: datetime) -> Optional[datetime]:
+        """First REFRESH_SCHEDULE step still ahead; steps missed while nothing was running are skipped"""
+        for offset in settings.REFRESH_SCHEDULE:
+            refresh_at = first_seen + timedelta(seconds=offset)
+            if refresh_at > now:
+                return refresh_at
+        return None
+
+    @staticmethod
+    def content_hash(title: Optional[str], content: Optional[str]) -> str:
+        return hashlib.sha256(f"{title or ''}\n{content or ''}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def schedule(article: NewsArticle) -> None:
+        """Put a newly built article on the refresh schedule"""
+        if not settings.REFRESH_SCHEDULE:
+            return
+        now = datetime.utcnow()
+        article.refresh = ArticleRefresh(
+            domain=RefreshService.domain(article.url),
+            next_refresh_at=RefreshService.next_refresh(now, now),
+            content_hash=RefreshService.content_hash(article.title, article.content),
+        )
+
+    @staticmethod
+    def claim(db: Session, now: datetime, limit: int) -> List[DueArticle]:
+        """Take up to limit due articles, leasing them for REFRESH_LEASE_SECONDS so other workers skip them"""
+        rows = db.query(
+            ArticleRefresh.article_id, NewsArticle.url, ArticleRefresh.domain, NewsArticle.created_at,
+            ArticleRefresh.etag, ArticleRefresh.last_modified, ArticleRefresh.page_hash,
+            ArticleRefresh.next_refresh_at,
+        ).join(
+            NewsArticle, NewsArticle.id == ArticleRefresh.article_id
+        ).filter(
+            ArticleRefresh.next_refresh_at <= now
+        ).order_by(ArticleRefresh.next_refresh_at).limit(limit).all()
+
+        leased_until = now + timedelta(seconds=settings.REFRESH_LEASE_SECONDS)
+        claimed = []
+        for *fields, next_refresh_at in rows:
+            # Conditional on the value just read: of two workers claiming the same row, one wins
+            taken = db.execute(
+                update(ArticleRefresh)
+                .where(ArticleRefresh.article_id == fields[0], ArticleRefresh.next_refresh_at == next_refresh_at)
+                .values(next_refresh_at=leased_until)
+            ).rowcount == 1
+            if taken:
+                claimed.append(DueArticle(*fields))
+        db.commit()
+        return claimed
+
+    @staticmethod
+    async def check(item: DueArticle, executor=None) -> RefreshOutcome:
+        """Conditional fetch, then a hash of the page, and a parse only when the page bytes changed"""
+        from app.services.advanced_extractor import AdvancedNewsExtractor
+        from app.services.news_extractor import NO_CONTENT, NO_TITLE
+
+        try:
+            page = await PageFetcher.fetch(
+                item.url, headers=PageFetcher.conditional_headers(item.etag, item.last_modified)
+            )
+        except Exception as e:
+            return RefreshOutcome(item.article_id, FAILED, error=str(e) or e.__class__.__name__)
+
+        outcome = RefreshOutcome(
+            item.article_id, NOT_MODIFIED,
+            etag=page.etag or item.etag, last_modified=page.last_modified or item.last_modified,
+            page_hash=item.page_hash,
+        )
+        if page.not_modified:
+            return outcome
+        page_hash = hashlib.sha256(page.html.encode("utf-8")).hexdigest()
+        if page_hash == item.page_hash:
+            outcome.status = SAME_PAGE
+            return outcome
+
+        extracted = await AdvancedNewsExtractor.extract_with_metadata(item.url, html=page.html, executor=executor)
+        if not extracted.success:
+            outcome.status = FAILED
+            outcome.error = extracted.error
+            return outcome
+        content = extracted.content or ""
+        if content == NO_CONTENT or len(content.strip()) < settings.EMBEDDED_STATE_MIN_CHARS:
+            # A consent wall, paywall or broken parse; the stored text stays current and the page is tried again
+            outcome.status = FAILED
+            outcome.error = "No article text"
+            return outcome
+        outcome.status = UNCHANGED
+        outcome.page_hash = page_hash
+        # Without a title of its own the page keeps the stored one
+        outcome.title = extracted.title if extracted.title != NO_TITLE else None
+        outcome.content = content
+        return outcome
+
+    @staticmethod
+    def apply(db: Session, item: DueArticle, outcome: RefreshOutcome, now: datetime) -> str:
+        """Store one outcome in the caller's transaction: reschedule, and add a revision if the text changed"""
+        state = db.get(ArticleRefresh, item.article_id)
+        if state is None:
+            # Deleted while it was being fetched
+            return outcome.status
+        state.refreshes += 1
+        state.last_checked_at = now
+        state.next_refresh_at = RefreshService.next_refresh(item.created_at or now, now)
+        if outcome.status == FAILED:
+            print(f"Refresh of {item.url} failed: {outcome.error}")
+            return FAILED
+        state.etag, state.last_modified, state.page_hash = outcome.etag, outcome.last_modified, outcome.page_hash
+        if outcome.content is None:
+            return outcome.status
+
+        title = outcome.title if outcome.title is not None else state.article.title
+        content_hash = RefreshService.content_hash(title, outcome.content)
+        if content_hash == state.content_hash:
+            return UNCHANGED
+        RefreshService.revise(db, state.article, title, outcome.content, now)
+        state.content_hash = content_hash
+        return REVISED
+
+    @staticmethod
+    def revise(db: Session, article: NewsArticle, title: Optional[str], content: str, now: datetime) -> ArticleRevision:
+        """Make the new text current, keeping the previous version as the diff back to it"""
+        latest = db.query(func.max(ArticleRevision.revision)).filter(
+            ArticleRevision.article_id == article.id
+        ).scalar() or 1
+        codec, diff = RevisionDiff.encode(RevisionDiff.make(content, article.content or ""))
+        revision = ArticleRevision(
+            article_id=article.id,
+            revision=latest + 1,
+            previous_title=article.title if article.title != title else None,
+            codec=codec,
+            diff=diff,
+            created_at=now,
+        )
+        db.add(revision)
+        article.title = title
+        article.content = content
+        return revision
+
+
+class RevisionHistory:
+    """Reads earlier versions back by applying the stored diffs to the current text, newest first"""
+
+    @staticmethod
+    def revisions(db: Session, article_id: int) -> List[ArticleRevision]:
+        return db.query(ArticleRevision).filter(
+            ArticleRevision.article_id == article_id
+        ).order_by(ArticleRevision.revision.desc()).all()
+
+    @staticmethod
+    def summary(db: Session, article: NewsArticle) -> List[Dict]:
+        """Every version with when it was saved; version 1 is the first extraction"""
+        versions = []
+        for revision in RevisionHistory.revisions(db, article.id):
+            edits = RevisionDiff.decode(revision.codec, revision.diff)
+            versions.append({
+                "revision": revision.revision,
+                "created_at": revision.created_at,
+                "title_changed": revision.previous_title is not None,
+                "changed_lines": sum(end - start for start, end, _ in edits),
+            })
+        versions.append({"revision": 1, "created_at": article.created_at, "title_changed": False, "changed_lines": 0})
+        return versions
+
+    @staticmethod
+    def version(db: Session, article: NewsArticle, number: int) -> Optional[Dict]:
+        """Title and text of the article as of version `number`, None if there is no such version"""
+        title, content = article.title, article.content or ""
+        revisions = RevisionHistory.revisions(db, article.id)
+        latest = revisions[0].revision if revisions else 1
+        if not 1 <= number <= latest:
+            return None
+        for revision in revisions:
+            if revision.revision <= number:
+                break
+            content = RevisionDiff.apply(content, RevisionDiff.decode(revision.codec, revision.diff))
+            if revision.previous_title is not None:
+                title = revision.previous_title
+        return {"revision": number, "title": title, "content": content}
+
+
+class RefreshScheduler:
+    """Takes due articles, re-fetches them domain by domain and stores what changed"""
+
+    @staticmethod
+    async def run(limit: Optional[int] = None, session_factory=SessionLocal) -> Dict[str, int]:
+        """One pass over due articles; returns how many ended in each outcome"""
+        db = session_factory()
+        try:
+            due = RefreshService.claim(db, datetime.utcnow(), limit or settings.REFRESH_BATCH_SIZE)
+            if not due:
+                return {}
+            by_domain: Dict[str, List[DueArticle]] = {}
+            for item in due:
+                by_domain.setdefault(item.domain, []).append(item)
+
+            counts = Counter()
+            domains = asyncio.Semaphore(settings.BATCH_EXTRACT_CONCURRENCY)
+            executor = ThreadPoolExecutor(settings.BATCH_PARSE_WORKERS, thread_name_prefix="refresh")
+            session = PageFetcher.open_session(settings.BATCH_EXTRACT_CONCURRENCY)
+
+            async def refresh_domain(items: List[DueArticle]):
+                # A domain's articles go one after another over the shared pool; domains run side by side
+                async with domains:
+                    PageFetcher.bind_session(session)
+                    return items, [await RefreshService.check(item, executor) for item in items]
+
+            try:
+                for finished in asyncio.as_completed([refresh_domain(items) for items in by_domain.values()]):
+                    items, outcomes = await finished
+                    # One transaction per domain
+                    now = datetime.utcnow()
+                    for item, outcome in zip(items, outcomes):
+                        counts[RefreshService.apply(db, item, outcome, now)] += 1
+                    db.commit()
+            finally:
+                await session.close()
+                executor.shutdown(wait=False, cancel_futures=True)
+            return dict(counts)
+        finally:
+            db.close()
+
+    @staticmethod
+    async def run_forever(interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                counts = await RefreshScheduler.run()
+                if counts.get(REVISED):
+                    print(f"Refreshed articles: {counts}")
+            except Exception as e:
+                print(f"Article refresh failed: {e}")
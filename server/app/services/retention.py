@@ -0,0 +1,179 @@
+import asyncio
+import glob
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.article_body import ArticleBody
+from app.models.job import ExtractionJob
+from app.models.news import NewsArticle
+from app.models.revision import ArticleRefresh, ArticleRevision
+from app.models.tag import article_tags
+from app.models.user import User
+from app.services.fingerprint import FingerprintService
+
+# Files written by MediaProcessor, relative to STATIC_DIR
+MEDIA_PATTERNS = ("images/watermarked_*.jpg", "videos/intro_added_*.mp4")
+
+
+class ArticleDeletion:
+    """Deletes articles with set-based statements, one bounded batch per transaction"""
+
+    @staticmethod
+    def media_path(url: Optional[str]) -> Optional[str]:
+        """File behind a processed media URL (static/images/..., static/videos/...); None for anything else"""
+        if not url or not url.startswith("static/"):
+            return None
+        folder, _, filename = url[len("static/"):].partition("/")
+        if folder not in ("images", "videos") or not filename or "/" in filename or filename.startswith("."):
+            return None
+        return os.path.join(settings.STATIC_DIR, folder, filename)
+
+    @staticmethod
+    def referenced_media(db: Session, urls: Iterable[str]) -> Set[str]:
+        """The media URLs still used by some article; copies share their original's processed image"""
+        urls = set(urls)
+        if not urls:
+            return set()
+        rows = db.query(NewsArticle.processed_image_url, NewsArticle.processed_video_url).filter(
+            or_(NewsArticle.processed_image_url.in_(list(urls)), NewsArticle.processed_video_url.in_(list(urls)))
+        ).all()
+        return {url for row in rows for url in row if url in urls}
+
+    @staticmethod
+    def remove_media(urls: Iterable[str]) -> None:
+        for url in urls:
+            path = ArticleDeletion.media_path(url)
+            if path is None:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Could not remove {path}: {e}")
+
+    @staticmethod
+    def delete_ids(db: Session, article_ids: List[int]) -> Set[str]:
+        """Delete the articles and their derived rows in the caller's transaction.
+
+        Returns the processed media URLs no other article uses; remove them once the transaction commits.
+        """
+        if not article_ids:
+            return set()
+        media = {
+            url
+            for row in db.query(NewsArticle.processed_image_url, NewsArticle.processed_video_url)
+            .filter(NewsArticle.id.in_(article_ids))
+            for url in row if url
+        }
+        FingerprintService.forget(db, article_ids)
+        db.execute(delete(article_tags).where(article_tags.c.article_id.in_(article_ids)))
+        for model in (ArticleRefresh, ArticleRevision):
+            db.execute(
+                delete(model).where(model.article_id.in_(article_ids)),
+                execution_options={"synchronize_session": False},
+            )
+        db.execute(
+            update(ExtractionJob).where(ExtractionJob.article_id.in_(article_ids)).values(article_id=None),
+            execution_options={"synchronize_session": False},
+        )
+        # The search index triggers drop the body text first, then the article's row
+        db.execute(
+            delete(ArticleBody).where(ArticleBody.article_id.in_(article_ids)),
+            execution_options={"synchronize_session": False},
+        )
+        db.execute(
+            delete(NewsArticle).where(NewsArticle.id.in_(article_ids)),
+            execution_options={"synchronize_session": False},
+        )
+        return media - ArticleDeletion.referenced_media(db, media)
+
+    @staticmethod
+    def delete_where(db: Session, condition, batch_size: Optional[int] = None, pause: float = 0.0) -> int:
+        """Delete every article matching the condition, batch_size per commit; returns how many were deleted.
+
+        Each batch is its own short write transaction, with `pause` seconds between batches so other
+        writers get the database in between.
+        """
+        batch_size = batch_size or settings.DELETE_BATCH_SIZE
+        deleted = 0
+        while True:
+            ids = [
+                row.id for row in
+                db.query(NewsArticle.id).filter(condition).order_by(NewsArticle.id).limit(batch_size)
+            ]
+            if not ids:
+                break
+            try:
+                unused_media = ArticleDeletion.delete_ids(db, ids)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            ArticleDeletion.remove_media(unused_media)
+            deleted += len(ids)
+            if len(ids) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+        return deleted
+
+    @staticmethod
+    def sweep_orphan_media(db: Session, max_age: float = 86400) -> int:
+        """Remove processed media files older than max_age seconds that no article refers to"""
+        cutoff = time.time() - max_age
+        candidates = set()
+        for pattern in MEDIA_PATTERNS:
+            for path in glob.glob(os.path.join(settings.STATIC_DIR, pattern)):
+                if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                    folder = os.path.basename(os.path.dirname(path))
+                    candidates.add(f"static/{folder}/{os.path.basename(path)}")
+        urls = sorted(candidates)
+        removed = 0
+        for start in range(0, len(urls), settings.DELETE_BATCH_SIZE):
+            batch = urls[start:start + settings.DELETE_BATCH_SIZE]
+            orphans = set(batch) - ArticleDeletion.referenced_media(db, batch)
+            ArticleDeletion.remove_media(orphans)
+            removed += len(orphans)
+        return removed
+
+
+class RetentionService:
+    """Per-user retention: articles older than the user's retention_days are deleted"""
+
+    @staticmethod
+    def enforce(db: Session, now: Optional[datetime] = None) -> int:
+        now = now or datetime.utcnow()
+        deleted = 0
+        policies = db.query(User.id, User.retention_days).filter(User.retention_days.isnot(None)).all()
+        for user_id, days in policies:
+            deleted += ArticleDeletion.delete_where(
+                db,
+                and_(NewsArticle.user_id == user_id, NewsArticle.created_at < now - timedelta(days=days)),
+                pause=settings.RETENTION_BATCH_PAUSE,
+            )
+        return deleted
+
+    @staticmethod
+    def enforce_once() -> int:
+        db = SessionLocal()
+        try:
+            return RetentionService.enforce(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    async def enforce_forever(interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                deleted = await asyncio.to_thread(RetentionService.enforce_once)
+                if deleted:
+                    print(f"Retention deleted {deleted} articles")
+            except Exception as e:
+                print(f"Retention run failed: {e}")
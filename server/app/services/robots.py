@@ -0,0 +1,337 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from hashlib import sha1
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from app.config import settings
+from app.services.domain_profiles import DomainProfileStore
+from app.services.fetch_governor import FetchRejected, fetch_governor
+from app.services.metrics import registry, Counter
+
+# RFC 9309: crawlers must read at least 500 KiB of robots.txt; anything past that is ignored
+ROBOTS_MAX_BYTES = 500 * 1024
+
+_MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+robots_fetches_total = registry.register(Counter(
+    "robots_fetches_total",
+    "robots.txt downloads by outcome; cached rules are not counted",
+    ("outcome",),
+))
+
+
+class RobotsRules:
+    """One host's rules for our user agent, compiled once; allowed() is a scan over prefixes and regexes.
+
+    unreachable marks the disallow-all stand-in for a robots.txt that couldn't be read.
+    """
+
+    __slots__ = ("rules", "crawl_delay", "unreachable", "_matchers")
+
+    def __init__(self, rules: List[Tuple[bool, str]], crawl_delay: Optional[float] = None, unreachable: bool = False):
+        self.rules = rules
+        self.crawl_delay = crawl_delay
+        self.unreachable = unreachable
+        # Longest pattern wins, and allow wins a tie; the first match in this order decides
+        ordered = sorted(rules, key=lambda rule: (-len(rule[1]), not rule[0]))
+        self._matchers = [
+            (allow, pattern, RobotsRules._compile(pattern) if "*" in pattern or pattern.endswith("$") else None)
+            for allow, pattern in ordered
+        ]
+
+    @staticmethod
+    def _compile(pattern: str):
+        anchored = pattern.endswith("$")
+        body = pattern[:-1] if anchored else pattern
+        return re.compile(".*".join(re.escape(part) for part in body.split("*")) + (r"\Z" if anchored else "")).match
+
+    def allowed(self, path: str) -> bool:
+        for allow, prefix, match in self._matchers:
+            if (match(path) if match is not None else path.startswith(prefix)):
+                return allow
+        return True
+
+    def as_dict(self) -> Dict:
+        return {"rules": self.rules, "crawl_delay": self.crawl_delay, "unreachable": self.unreachable}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RobotsRules":
+        return cls(
+            [(bool(allow), pattern) for allow, pattern in data["rules"]],
+            data.get("crawl_delay"), data.get("unreachable", False),
+        )
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str) -> "RobotsRules":
+        """The groups for our product token, or the * groups when none name it"""
+        agent = user_agent.split("/")[0].strip().lower()
+        groups: List[Tuple[List[str], List[Tuple[bool, str]], List[float]]] = []
+        in_rules = True
+        for line in text.splitlines():
+            key, _, value = line.split("#", 1)[0].partition(":")
+            key, value = key.strip().lower(), value.strip()
+            if key == "user-agent":
+                # Consecutive user-agent lines share one group
+                if in_rules:
+                    groups.append(([], [], []))
+                    in_rules = False
+                groups[-1][0].append(value.lower())
+            elif key in ("allow", "disallow") and groups:
+                in_rules = True
+                # An empty Disallow allows everything, which is the default anyway
+                if value:
+                    groups[-1][1].append((key == "allow", value))
+            elif key == "crawl-delay" and groups:
+                in_rules = True
+                try:
+                    groups[-1][2].append(float(value))
+                except ValueError:
+                    pass
+
+        matching = [group for group in groups if agent in group[0]]
+        if not matching:
+            matching = [group for group in groups if "*" in group[0]]
+        rules = [rule for group in matching for rule in group[1]]
+        delays = [delay for group in matching for delay in group[2] if delay > 0]
+        return cls(rules, min(max(delays), settings.ROBOTS_MAX_CRAWL_DELAY) if delays else None)
+
+
+# Hosts without a robots.txt (4xx)
+ALLOW_ALL = RobotsRules([])
+# Hosts whose robots.txt couldn't be read (5xx, network errors) and that have no earlier rules (RFC 9309 2.3.1.4)
+UNREACHABLE = RobotsRules([(False, "/")], unreachable=True)
+
+
+class RobotsCache:
+    """robots.txt per origin, parsed once per process and shared between workers.
+
+    Lookups go memory → shared store (Redis or local files) → download. A missing robots.txt
+    (4xx) is cached like any other for ROBOTS_TTL. When the download fails, the last rules known
+    for the host stay in force for ROBOTS_ERROR_TTL, or, without any, nothing may be fetched
+    (FetchRejected) until it is tried again. Crawl-delay is handed to the fetch governor as the
+    domain's request rate.
+    """
+
+    def __init__(self):
+        self._memory: Dict[str, Tuple[RobotsRules, float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    @staticmethod
+    def path_of(url: str) -> str:
+        parts = urlsplit(url)
+        return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._pending.clear()
+
+    def _fresh(self, origin: str) -> Optional[RobotsRules]:
+        """This process's rules for the origin, if they haven't expired"""
+        with self._lock:
+            entry = self._memory.get(origin)
+        if entry is not None and entry[1] > time.time():
+            return entry[0]
+        return None
+
+    def _adopt(self, origin: str, stored: Optional[Tuple[RobotsRules, float]]) -> Optional[RobotsRules]:
+        if stored is None:
+            return None
+        rules, expires = stored
+        self._remember(origin, rules, expires)
+        return rules
+
+    def cached(self, origin: str) -> Optional[RobotsRules]:
+        """Blocking: a miss in memory reads the shared store"""
+        rules = self._fresh(origin)
+        return rules if rules is not None else self._adopt(origin, RobotsStore.load(origin))
+
+    def _remember(self, origin: str, rules: RobotsRules, expires: float) -> None:
+        with self._lock:
+            self._memory[origin] = (rules, expires)
+        fetch_governor.crawl_delay(origin, rules.crawl_delay)
+
+    def _last_known(self, origin: str) -> Optional[RobotsRules]:
+        """The most recent rules for the origin, expired or not"""
+        with self._lock:
+            entry = self._memory.get(origin)
+        if entry is not None:
+            return entry[0]
+        stored = RobotsStore.load(origin, stale=True)
+        return stored[0] if stored is not None else None
+
+    def _store(self, origin: str, rules: Optional[RobotsRules], ttl: float) -> RobotsRules:
+        """Blocking; rules is None when the download failed"""
+        if rules is None:
+            rules = self._last_known(origin) or UNREACHABLE
+        expires = time.time() + ttl
+        self._remember(origin, rules, expires)
+        RobotsStore.save(origin, rules, expires)
+        return rules
+
+    def _check(self, url: str, rules: RobotsRules) -> bool:
+        if rules.unreachable:
+            # Not the site's answer, so not final: callers retry once the error TTL has run out
+            raise FetchRejected(DomainProfileStore.domain_of(url), "robots_unreachable", settings.ROBOTS_ERROR_TTL)
+        return rules.allowed(self.path_of(url))
+
+    async def allowed(self, url: str) -> bool:
+        if not settings.ROBOTS_ENABLED:
+            return True
+        origin = self.origin(url)
+        rules = self._fresh(origin)
+        if rules is None:
+            # The shared store is a file or a Redis round trip; neither belongs on the event loop
+            rules = self._adopt(origin, await asyncio.to_thread(RobotsStore.load, origin))
+        if rules is None:
+            rules = await self._fetch_once(origin)
+        return self._check(url, rules)
+
+    def allowed_sync(self, url: str) -> bool:
+        if not settings.ROBOTS_ENABLED:
+            return True
+        origin = self.origin(url)
+        rules = self.cached(origin)
+        if rules is None:
+            rules = self._store(origin, *self._download_sync(origin))
+        return self._check(url, rules)
+
+    async def _fetch_once(self, origin: str) -> RobotsRules:
+        """One download per origin at a time; concurrent lookups in the same event loop wait for it"""
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(origin)
+        if pending is not None and pending.get_loop() is loop:
+            return await asyncio.shield(pending)
+        future = self._pending[origin] = loop.create_future()
+        try:
+            rules = await asyncio.to_thread(self._store, origin, *await self._download(origin))
+            future.set_result(rules)
+            return rules
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here so an unawaited future doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            if self._pending.get(origin) is future:
+                del self._pending[origin]
+
+    @staticmethod
+    def _interpret(status: Optional[int], text: Optional[str],
+                   cache_control: Optional[str]) -> Tuple[Optional[RobotsRules], float]:
+        """Rules and how long to keep them, from the response; None when it failed (status None: no response)"""
+        if status is not None and 200 <= status < 300:
+            robots_fetches_total.inc("ok")
+            ttl = settings.ROBOTS_TTL
+            match = _MAX_AGE.search(cache_control or "")
+            if match:
+                ttl = min(max(int(match.group(1)), settings.ROBOTS_ERROR_TTL), settings.ROBOTS_TTL)
+            return RobotsRules.parse(text or "", settings.ROBOTS_USER_AGENT), ttl
+        if status is not None and 400 <= status < 500:
+            # No robots.txt: everything is allowed, and that is worth remembering as long as a real one
+            robots_fetches_total.inc("not_found")
+            return ALLOW_ALL, settings.ROBOTS_TTL
+        robots_fetches_total.inc("error")
+        return None, settings.ROBOTS_ERROR_TTL
+
+    async def _download(self, origin: str) -> Tuple[Optional[RobotsRules], float]:
+        from app.services.page_fetch import PageFetcher
+
+        url = f"{origin}/robots.txt"
+        try:
+            async with fetch_governor.slot(url) as slot:
+                async with PageFetcher.open_session(1) as session:
+                    async with session.get(url) as response:
+                        slot.record_response(response.status, response.headers)
+                        data = await response.content.read(ROBOTS_MAX_BYTES)
+                        text = data.decode("utf-8", errors="replace")
+                        return self._interpret(response.status, text, response.headers.get("Cache-Control"))
+        except Exception as e:
+            print(f"robots.txt download failed for {origin}: {e}")
+            return self._interpret(None, None, None)
+
+    def _download_sync(self, origin: str) -> Tuple[Optional[RobotsRules], float]:
+        import requests
+
+        url = f"{origin}/robots.txt"
+        try:
+            with fetch_governor.sync_slot(url) as slot:
+                with requests.get(url, timeout=(settings.FETCH_CONNECT_TIMEOUT, settings.FETCH_READ_TIMEOUT),
+                                  headers={"User-Agent": settings.ROBOTS_USER_AGENT}, stream=True) as response:
+                    slot.record_response(response.status_code, response.headers)
+                    data = response.raw.read(ROBOTS_MAX_BYTES, decode_content=True)
+                    text = data.decode("utf-8", errors="replace")
+                    return self._interpret(response.status_code, text, response.headers.get("Cache-Control"))
+        except Exception as e:
+            print(f"robots.txt download failed for {origin}: {e}")
+            return self._interpret(None, None, None)
+
+
+class RobotsStore:
+    """Cross-process tier: Redis with the TTL as key expiry, or one JSON file per origin in ROBOTS_CACHE_DIR"""
+
+    @staticmethod
+    def _key(origin: str) -> str:
+        return f"robots:{origin}"
+
+    @staticmethod
+    def _path(origin: str) -> str:
+        return os.path.join(settings.ROBOTS_CACHE_DIR, sha1(origin.encode("utf-8")).hexdigest() + ".json")
+
+    @staticmethod
+    def load(origin: str, stale: bool = False) -> Optional[Tuple[RobotsRules, float]]:
+        """Stored rules and their expiry; stale also returns expired files (Redis drops keys when they expire)"""
+        try:
+            if settings.ROBOTS_CACHE == "redis":
+                from app.services.redis_client import get_redis
+
+                raw = get_redis().get(RobotsStore._key(origin))
+            else:
+                with open(RobotsStore._path(origin), "rb") as f:
+                    raw = f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"robots.txt cache read failed for {origin}: {e}")
+            return None
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        if data["expires"] <= time.time() and not stale:
+            return None
+        return RobotsRules.from_dict(data), data["expires"]
+
+    @staticmethod
+    def save(origin: str, rules: RobotsRules, expires: float) -> None:
+        raw = json.dumps({**rules.as_dict(), "expires": expires})
+        try:
+            if settings.ROBOTS_CACHE == "redis":
+                from app.services.redis_client import get_redis
+
+                get_redis().set(RobotsStore._key(origin), raw, ex=max(int(expires - time.time()), 1))
+                return
+            os.makedirs(settings.ROBOTS_CACHE_DIR, exist_ok=True)
+            # Written aside and renamed, so another worker never reads half a file
+            fd, tmp_path = tempfile.mkstemp(dir=settings.ROBOTS_CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(raw)
+            os.replace(tmp_path, RobotsStore._path(origin))
+        except Exception as e:
+            print(f"robots.txt cache write failed for {origin}: {e}")
+
+
+robots_cache = RobotsCache()
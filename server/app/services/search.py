@@ -0,0 +1,121 @@
+import base64
+import html
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import DateTime, text
+from sqlalchemy.orm import Session
+
+# Sentinels wrapped around matches by SQLite, swapped for <mark> after escaping the text
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+# bm25 column weights for title, content, meta_keywords; owner only scopes the match
+_RANK = "bm25(news_articles_fts, 10.0, 1.0, 5.0, 0.0)"
+
+_SEARCH_SQL = f"""
+    SELECT a.id, a.url, a.title, a.publish_date, a.created_at, a.image_url,
+           {_RANK} AS score,
+           highlight(news_articles_fts, 0, '{_MARK_START}', '{_MARK_END}') AS title_highlight,
+           snippet(news_articles_fts, 1, '{_MARK_START}', '{_MARK_END}', '…', :snippet_tokens) AS snippet
+    FROM news_articles_fts
+    JOIN news_articles a ON a.id = news_articles_fts.rowid
+    WHERE news_articles_fts MATCH :query
+      AND a.user_id = :user_id
+      {{keyset}}
+    ORDER BY score, news_articles_fts.rowid
+    LIMIT :limit
+"""
+
+# Rows after the cursor's (rank, rowid); earlier matches are dropped before sorting and snippets
+_KEYSET = (
+    f"AND ({_RANK} > :after_score "
+    f"OR ({_RANK} = :after_score AND news_articles_fts.rowid > :after_id))"
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchService:
+    @staticmethod
+    def build_match_query(query: str, user_id: int) -> Optional[str]:
+        """Turn free text into an FTS5 query over the user's rows: every word must match, the last one as a prefix"""
+        tokens = _TOKEN_PATTERN.findall(query)
+        if not tokens:
+            return None
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += "*"
+        return f'owner : "{int(user_id)}" AND {{title content meta_keywords}} : ({" ".join(terms)})'
+
+    @staticmethod
+    def encode_cursor(score: float, article_id: int) -> str:
+        raw = json.dumps([score, article_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[float, int]:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        try:
+            score, article_id = json.loads(base64.urlsafe_b64decode(padded))
+            return float(score), int(article_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid search cursor: {cursor}")
+
+    @staticmethod
+    def _render_highlight(value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return html.escape(value).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+    @staticmethod
+    def search(
+        db: Session,
+        user_id: int,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        snippet_tokens: int = 24,
+    ) -> Dict:
+        """Ranked full-text search over one user's articles with keyset pagination on (rank, rowid).
+
+        bm25 uses statistics of the whole index, so if articles are added, edited or deleted
+        between two pages the scores move and a result near the cursor can be repeated or skipped.
+        """
+        match_query = SearchService.build_match_query(query, user_id)
+        if match_query is None:
+            return {"results": [], "next_cursor": None}
+
+        params = {
+            "query": match_query,
+            "user_id": user_id,
+            "limit": limit + 1,
+            "snippet_tokens": snippet_tokens,
+        }
+        keyset = ""
+        if cursor:
+            params["after_score"], params["after_id"] = SearchService.decode_cursor(cursor)
+            keyset = _KEYSET
+
+        statement = text(_SEARCH_SQL.format(keyset=keyset)).columns(publish_date=DateTime, created_at=DateTime)
+        rows = db.execute(statement, params).mappings().all()
+
+        results: List[Dict] = []
+        for row in rows[:limit]:
+            results.append({
+                "id": row["id"],
+                "url": row["url"],
+                "title": row["title"],
+                "title_highlight": SearchService._render_highlight(row["title_highlight"]),
+                "snippet": SearchService._render_highlight(row["snippet"]),
+                "publish_date": row["publish_date"],
+                "created_at": row["created_at"],
+                "image_url": row["image_url"],
+                "score": row["score"],
+            })
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = SearchService.encode_cursor(last["score"], last["id"])
+
+        return {"results": results, "next_cursor": next_cursor}
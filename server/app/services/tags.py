@@ -0,0 +1,79 @@
+import json
+from typing import Iterable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.news import NewsArticle
+from app.models.tag import Tag, article_tags
+
+MAX_TAG_LENGTH = 100
+
+
+class TagService:
+    @staticmethod
+    def fold(name: str) -> str:
+        """Case-fold a tag name so "Ekonomi", "EKONOMİ" and "ekonomi" are one tag"""
+        # casefold() turns the Turkish dotted capital İ into i + combining dot, so map it first
+        return " ".join(name.replace("İ", "i").casefold().split())[:MAX_TAG_LENGTH]
+    
+    @staticmethod
+    def normalize(names: Iterable[str]) -> List[str]:
+        """Case-fold, strip and collapse whitespace, drop empties and duplicates, keep first-seen order"""
+        seen = set()
+        normalized = []
+        for name in names:
+            if not isinstance(name, str):
+                continue
+            name = TagService.fold(name)
+            if name and name not in seen:
+                seen.add(name)
+                normalized.append(name)
+        return normalized
+    
+    @staticmethod
+    def parse_meta_keywords(meta_keywords: Optional[str]) -> List[str]:
+        """Tag names from the JSON list stored in NewsArticle.meta_keywords"""
+        if not meta_keywords:
+            return []
+        try:
+            names = json.loads(meta_keywords)
+        except ValueError:
+            return []
+        if isinstance(names, str):
+            names = [names]
+        return TagService.normalize(names) if isinstance(names, list) else []
+    
+    @staticmethod
+    def get_or_create(db: Session, names: List[str]) -> List[Tag]:
+        if not names:
+            return []
+        existing = {tag.name: tag for tag in db.query(Tag).filter(Tag.name.in_(names)).all()}
+        for name in names:
+            if name in existing:
+                continue
+            try:
+                # Savepoint so a concurrent insert of the same tag doesn't abort the caller's transaction
+                with db.begin_nested():
+                    tag = Tag(name=name)
+                    db.add(tag)
+                existing[name] = tag
+            except IntegrityError:
+                existing[name] = db.query(Tag).filter(Tag.name == name).one()
+        return [existing[name] for name in names]
+    
+    @staticmethod
+    def attach(db: Session, article: NewsArticle, names: Iterable[str]) -> None:
+        article.tags = TagService.get_or_create(db, TagService.normalize(names))
+    
+    @staticmethod
+    def top_tags(db: Session, user_id: int, limit: int = 10):
+        return db.query(
+            Tag.name,
+            func.count(article_tags.c.article_id).label("count")
+        ).join(
+            article_tags, article_tags.c.tag_id == Tag.id
+        ).join(
+            NewsArticle, NewsArticle.id == article_tags.c.article_id
+        ).filter(
+            NewsArticle.user_id == user_id
+        ).group_by(Tag.id).order_by(func.count(article_tags.c.article_id).desc(), Tag.name).limit(limit).all()
@@ -1,7 +1,14 @@
-from celery import Celery
+import json
+from typing import Optional
+from celery import Celery, Task
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_init
+from celery.utils.time import get_exponential_backoff_interval
 from app.config import settings
+from app.database import SessionLocal
 from app.services.media_processor import MediaProcessor
-import os
+from app.services.preload import SharedAssets
+from app.services.queues import QUEUE_PROFILES
 
 celery_app = Celery(
     "tgrt_full_stack_technical_task",
@@ -9,50 +16,207 @@ celery_app = Celery(
     backend=settings.REDIS_URL
 )
 
+# Filled by @queue_task below: task name -> {"queue": ...}
+TASK_ROUTES = {}
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_routes=TASK_ROUTES,
+    task_default_queue="extract",
+    # Default expiry for results; queues shorten or extend it per task
+    result_expires=settings.CELERY_RESULT_EXPIRES,
+    # Unacknowledged (acks_late) tasks are redelivered after this; must exceed the longest time limit
+    broker_transport_options={
+        "visibility_timeout": 2 * max(profile.time_limit for profile in QUEUE_PROFILES.values()),
+    },
 )
 
-@celery_app.task
-def process_image_watermark(image_url: str, watermark_text: str) -> str:
+
+class ProfiledTask(Task):
+    """Task carrying its queue profile; applies the profile's result expiry"""
+    result_expires = None
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        # Eagerly applied tasks don't store a result
+        if not self.result_expires or self.ignore_result or self.request.is_eager:
+            return
+        if hasattr(self.backend, "expire"):
+            self.backend.expire(self.backend.get_key_for_task(task_id), self.result_expires)
+
+
+def queue_task(queue: str, **options):
+    """Register a task on one queue with that queue's limits, retry policy and result expiry"""
+    profile = QUEUE_PROFILES[queue]
+
+    def decorator(func):
+        name = f"{__name__}.{func.__name__}"
+        TASK_ROUTES[name] = {"queue": queue}
+        return celery_app.task(bind=True, base=ProfiledTask, name=name, **{**profile.task_options(), **options})(func)
+    return decorator
+
+
+def retry_or_fallback(task: Task, exc: Exception, fallback, countdown: Optional[float] = None):
+    """Retry after countdown, or with exponential backoff and jitter; once retries run out, return the fallback"""
+    if isinstance(exc, SoftTimeLimitExceeded) or task.request.retries >= task.max_retries:
+        print(f"{task.name} failed after {task.request.retries} retries: {exc}")
+        return fallback
+    if not countdown:
+        countdown = get_exponential_backoff_interval(
+            task.retry_backoff, task.request.retries, task.retry_backoff_max, task.retry_jitter
+        )
+    raise task.retry(exc=exc, countdown=countdown)
+
+
+@worker_init.connect
+def preload_shared_assets(**kwargs):
+    # Runs in the worker's main process, so the pool children share what it loads copy-on-write
+    SharedAssets.preload(media=settings.MEDIA_WORKER_PRELOAD)
+
+@queue_task("extract")
+def extract_article(self, url: str) -> dict:
+    """Fetch and extract one article; the result is JSON-safe"""
+    import asyncio
+    from app.services.advanced_extractor import AdvancedNewsExtractor
+    
     try:
-        result = MediaProcessor.add_watermark(image_url, watermark_text)
-        return result
+        extracted = asyncio.run(AdvancedNewsExtractor.extract_with_metadata(url))
     except Exception as e:
-        print(f"Error processing image: {e}")
-        return image_url
+        return retry_or_fallback(self, e, {"success": False, "error": str(e)})
+    if not extracted.success and extracted.retryable:
+        # Failures come back as results, not exceptions; a deferral says when the domain is open again
+        return retry_or_fallback(
+            self, RuntimeError(extracted.error), _json_safe(extracted.as_dict()), countdown=extracted.retry_after
+        )
+    return _json_safe(extracted.as_dict())
+
+@queue_task("extract")
+def extract_articles(self, urls: list) -> list:
+    """Extract a batch of URLs concurrently over one connection pool; results in completion order.
+
+    The batch shares the extract queue's time limit, so callers split large lists into chunks.
+    """
+    from app.services.batch_extractor import extract_many_sync
+    
+    return [
+        _json_safe({"url": result.url, **result.extracted.as_dict()})
+        for result in extract_many_sync(urls)
+    ]
+
+def _json_safe(extracted: dict) -> dict:
+    return json.loads(json.dumps(extracted, default=lambda value: value.isoformat() if hasattr(value, "isoformat") else str(value)))
+
+@queue_task("extract", ignore_result=True, max_retries=0)
+def run_extraction_job(self, job_id: int) -> None:
+    """Run one persistent extraction job; the job row tracks attempts and schedules its own retries"""
+    import asyncio
+    from app.services.jobs import job_runner
+    
+    asyncio.run(job_runner.run(job_id))
+
+@queue_task("extract", ignore_result=True, max_retries=0)
+def recover_extraction_jobs(self) -> None:
+    """Requeue jobs left stalled by a lost message or a worker that died mid-job"""
+    from app.services.jobs import job_runner
+    
+    if settings.JOB_RUNNER != "celery":
+        # Inline runners sweep from the API workers themselves
+        return
+    recovered = job_runner.recover()
+    if recovered:
+        print(f"Requeued {recovered} stalled extraction jobs")
 
-@celery_app.task
-def process_video_intro(video_url: str, intro_path: str) -> str:
+@queue_task("image")
+def process_image_watermark(self, image_url: str, watermark_text: str) -> str:
     try:
-        result = MediaProcessor.add_video_intro(video_url, intro_path)
-        return result
+        return MediaProcessor.add_watermark(image_url, watermark_text, raise_errors=True)
     except Exception as e:
-        print(f"Error processing video: {e}")
-        return video_url
-
-@celery_app.task
-def cleanup_temp_files():
-    try:
-        import time
-        import glob
-        
-        current_time = time.time()
-        temp_patterns = [
-            "static/images/watermarked_*.jpg",
-            "static/videos/intro_added_*.mp4"
-        ]
-        
-        for pattern in temp_patterns:
-            for file_path in glob.glob(pattern):
-                if os.path.isfile(file_path):
-                    file_age = current_time - os.path.getmtime(file_path)
-                    if file_age > 86400:  # 24 hours
-                        os.remove(file_path)
-                        print(f"Cleaned up: {file_path}")
+        return retry_or_fallback(self, e, image_url)
+
+@queue_task("image", ignore_result=True)
+def watermark_article_image(self, article_id: int, image_url: str, watermark_text: str) -> str:
+    """Watermark an article's image and store the result on the article"""
+    from app.models.news import NewsArticle
+    
+    try:
+        result = MediaProcessor.add_watermark(image_url, watermark_text, raise_errors=True)
+    except Exception as e:
+        # Out of retries: the article keeps showing the original image
+        return retry_or_fallback(self, e, image_url)
+    
+    db = SessionLocal()
+    try:
+        article = db.get(NewsArticle, article_id)
+        if article is not None and article.image_url == image_url:
+            article.processed_image_url = result
+            db.commit()
+    finally:
+        db.close()
+    return result
+
+@queue_task("video")
+def process_video_intro(self, video_url: str, intro_path: str) -> str:
+    try:
+        return MediaProcessor.add_video_intro(video_url, intro_path, raise_errors=True)
     except Exception as e:
-        print(f"Error during cleanup: {e}")
\ No newline at end of file
+        return retry_or_fallback(self, e, video_url)
+
+@queue_task("image", ignore_result=True, max_retries=0)
+def cleanup_temp_files(self):
+    """Remove watermarked images and intro videos older than a day that no article uses any more"""
+    from app.services.retention import ArticleDeletion
+    
+    db = SessionLocal()
+    try:
+        removed = ArticleDeletion.sweep_orphan_media(db)
+        if removed:
+            print(f"Cleaned up {removed} unused media files")
+    except Exception as e:
+        print(f"Error during cleanup: {e}")
+    finally:
+        db.close()
+
+@queue_task("extract", ignore_result=True, max_retries=0)
+def enforce_retention(self):
+    """Delete articles past their owner's retention period.
+
+    Database work like refresh_articles, so it runs with the extract workers rather than taking a
+    watermark process. Every batch commits on its own, so a run cut short by the time limit is
+    picked up by the next one.
+    """
+    from app.services.retention import RetentionService
+    
+    try:
+        deleted = RetentionService.enforce_once()
+    except SoftTimeLimitExceeded:
+        print("Retention run hit its time limit; the next run continues")
+        return
+    if deleted:
+        print(f"Retention deleted {deleted} articles")
+
+@queue_task("extract", ignore_result=True, max_retries=0)
+def refresh_articles(self):
+    """Re-fetch articles whose next refresh is due; claimed articles left over are retried after their lease"""
+    import asyncio
+    from app.services.refresh import RefreshScheduler
+    
+    try:
+        counts = asyncio.run(RefreshScheduler.run())
+    except SoftTimeLimitExceeded:
+        print("Article refresh hit its time limit; the rest is retried after the lease")
+        return
+    if counts:
+        print(f"Refreshed articles: {counts}")
+
+celery_app.conf.beat_schedule = {
+    "enforce-retention": {"task": enforce_retention.name, "schedule": settings.RETENTION_INTERVAL},
+    "refresh-articles": {"task": refresh_articles.name, "schedule": settings.REFRESH_INTERVAL},
+    "cleanup-temp-files": {"task": cleanup_temp_files.name, "schedule": 3600.0},
+}
+if settings.JOB_RUNNER == "celery":
+    celery_app.conf.beat_schedule["recover-extraction-jobs"] = {
+        "task": recover_extraction_jobs.name, "schedule": settings.JOB_SWEEP_INTERVAL,
+    }
@@ -0,0 +1,39 @@
+"""gunicorn worker that reports itself unready before it stops accepting connections.
+
+uvicorn stops listening as soon as SIGTERM arrives and only runs the lifespan shutdown once the
+open connections are done, so /health/ready would never get to answer 503. This worker marks
+the process as draining on SIGTERM and keeps serving for SHUTDOWN_READY_DELAY seconds, long
+enough for a load balancer's readiness probe to take it out of rotation, before uvicorn's
+usual graceful shutdown starts. A second SIGTERM (or SIGINT) stops it right away.
+"""
+import asyncio
+import signal
+import sys
+from types import FrameType
+from typing import Optional
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+from app.config import settings
+from app.lifecycle import in_flight
+
+
+class DrainingServer(Server):
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        if sig != signal.SIGTERM or in_flight.draining or settings.SHUTDOWN_READY_DELAY <= 0:
+            super().handle_exit(sig, frame)
+            return
+        in_flight.draining = True
+        # Called from the loop (add_signal_handler), so the exit can be scheduled on it
+        asyncio.get_event_loop().call_later(settings.SHUTDOWN_READY_DELAY, super().handle_exit, sig, frame)
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    async def _serve(self) -> None:
+        # UvicornWorker._serve with DrainingServer in place of uvicorn's Server
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
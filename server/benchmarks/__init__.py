@@ -0,0 +1 @@
+# Offline benchmarks; run from the server directory, e.g. `python -m benchmarks.extraction_bench`
@@ -0,0 +1,133 @@
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, "corpus")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+SERVER_DIR = os.path.dirname(BENCHMARK_DIR)
+
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+
+def corpus_pages() -> List[str]:
+    return sorted(name for name in os.listdir(CORPUS_DIR) if name.endswith(".html"))
+
+
+def read_page(name: str) -> str:
+    with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# Real news words first, so they get the highest Zipf weights in synthetic articles
+NEWS_WORDS = (
+    "deprem seçim ekonomi enflasyon faiz borsa ihracat futbol milli takım belediye "
+    "hükümet meclis bakan açıklama toplantı istanbul ankara izmir sağlık eğitim "
+    "transit council budget election market inflation football minister hospital school"
+).split()
+
+
+def synthetic_vocabulary(size: int, rng) -> Tuple[List[str], List[float]]:
+    """Vocabulary for synthetic articles with Zipf-like weights: a few very common words, most rare"""
+    syllables = ["ka", "le", "mi", "to", "ra", "su", "ne", "bi", "do", "ya", "ge", "lo", "ze", "tu"]
+    generated = {"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(size)}
+    vocabulary = NEWS_WORDS + sorted(generated)
+    return vocabulary, [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class CorpusServer:
+    """Serves the corpus directory on a random localhost port"""
+
+    def __init__(self, directory: str = CORPUS_DIR):
+        handler = partial(_QuietHandler, directory=directory)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def url(self, name: str) -> str:
+        return f"{self.base_url}/{name}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def percentiles(samples: List[float], points=(50, 90, 99)) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles in milliseconds"""
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    result = {}
+    for p in points:
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        result[f"p{p}"] = round(ordered[index] * 1000, 3)
+    result["mean"] = round(sum(ordered) / len(ordered) * 1000, 3)
+    return result
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=SERVER_DIR, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def write_results(name: str, results: Dict, output: Optional[str] = None) -> str:
+    path = output or os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"benchmark": name, "environment": environment(), "results": results}, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare(baseline_path: str, results: Dict, key: str = "mean") -> List[str]:
+    """Human-readable latency deltas against a previous JSON result file"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    lines = []
+    for target, current in results.items():
+        before = baseline.get(target, {}).get("latency_ms", {}).get(key)
+        after = current.get("latency_ms", {}).get(key)
+        if before and after:
+            change = (after - before) / before * 100
+            lines.append(f"{target}: {before:.2f} ms -> {after:.2f} ms ({change:+.1f}%)")
+    return lines
@@ -0,0 +1,73 @@
+"""Near-duplicate lookup benchmark: MinHash LSH candidate query against N stored fingerprints.
+
+    python -m benchmarks.duplicate_bench --articles 200000
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import percentiles, write_results
+from app.database import Base
+from app.models import news, user  # noqa: F401  (register tables)
+from app.models.fingerprint import ArticleFingerprint, ArticleFingerprintBand
+from app.services.fingerprint import FingerprintService
+
+
+def synthetic_article(rng: random.Random, vocabulary, words: int = 300) -> str:
+    return " ".join(rng.choices(vocabulary, k=words))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--db", default=":memory:")
+    parser.add_argument("--output", help="result file (default benchmarks/results/duplicates.json)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary = [f"w{i}" for i in range(50_000)]
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.execute(news.NewsArticle.__table__.insert(), [{"id": 1, "url": "https://example.com/1", "user_id": 1}])
+
+    # Signatures are random here; only the index size matters for lookup latency
+    print(f"Storing {args.articles} fingerprints")
+    fingerprints, bands = [], []
+    for article_id in range(1, args.articles + 1):
+        signature = tuple(rng.getrandbits(32) for _ in range(50))
+        fingerprints.append({"article_id": article_id, "user_id": 1, "signature": FingerprintService.pack(signature)})
+        bands.extend({"user_id": 1, "band_key": key, "article_id": article_id} for key in FingerprintService.band_keys(signature))
+    db.execute(ArticleFingerprint.__table__.insert(), fingerprints)
+    db.execute(ArticleFingerprintBand.__table__.insert(), bands)
+    db.commit()
+
+    signing, lookups = [], []
+    for _ in range(args.lookups):
+        text = synthetic_article(rng, vocabulary)
+        started = time.perf_counter()
+        signature = FingerprintService.minhash(text)
+        signing.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        FingerprintService.find_duplicate(db, 1, signature)
+        lookups.append(time.perf_counter() - started)
+
+    results = {
+        "stored_fingerprints": args.articles,
+        "minhash_ms": percentiles(signing),
+        "lookup_ms": percentiles(lookups),
+    }
+    print(f"minhash p50 {results['minhash_ms']['p50']} ms, lookup p50 {results['lookup_ms']['p50']} ms, "
+          f"p99 {results['lookup_ms']['p99']} ms")
+    path = write_results("duplicates", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Extraction benchmark over the offline HTML corpus.
+
+    python -m benchmarks.extraction_bench --iterations 20 --mode http
+    python -m benchmarks.extraction_bench --compare benchmarks/results/baseline.json
+
+`--mode http` fetches pages from a local HTTP server; `--mode direct` hands the
+saved HTML straight to the extractors so only parsing is measured.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Callable, Dict
+
+from benchmarks.common import (
+    CorpusServer, compare, corpus_pages, peak_rss_bytes, percentiles, read_page, write_results
+)
+from app.services.advanced_extractor import AdvancedNewsExtractor
+from app.services.domain_profiles import domain_profiles
+from app.services.metrics import stage_listeners
+from app.services.news_extractor import NewsExtractor
+
+
+def _targets(mode: str) -> Dict[str, Callable]:
+    direct = mode == "direct"
+
+    def extract_content(url, html):
+        return NewsExtractor.extract_content(url, html=html if direct else None)
+
+    def extract_with_metadata(url, html):
+        return asyncio.run(AdvancedNewsExtractor.extract_with_metadata(url, html=html if direct else None))
+
+    return {
+        "NewsExtractor.extract_content": extract_content,
+        "AdvancedNewsExtractor.extract_with_metadata": extract_with_metadata,
+    }
+
+
+def run_target(func: Callable, server: CorpusServer, pages: Dict[str, str], iterations: int, warmup: int) -> Dict:
+    # Every target starts with an unlearned profile so runs are comparable
+    domain_profiles.reset()
+    for name, html in pages.items():
+        for _ in range(warmup):
+            func(server.url(name), html)
+
+    stage_samples = defaultdict(list)
+    listener = lambda stage, domain, seconds: stage_samples[stage].append(seconds)
+    stage_listeners.append(listener)
+
+    latencies = []
+    errors = Counter()
+    started = time.perf_counter()
+    try:
+        for _ in range(iterations):
+            for name, html in pages.items():
+                call_started = time.perf_counter()
+                result = func(server.url(name), html)
+                latencies.append(time.perf_counter() - call_started)
+                if not result.success:
+                    errors[result.error] += 1
+    finally:
+        stage_listeners.remove(listener)
+    elapsed = time.perf_counter() - started
+
+    # Memory is measured in a separate pass because tracemalloc slows allocation down
+    tracemalloc.start()
+    for name, html in pages.items():
+        func(server.url(name), html)
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "documents": len(latencies),
+        "failures": sum(errors.values()),
+        "errors": dict(errors.most_common(5)),
+        "throughput_docs_per_s": round(len(latencies) / elapsed, 3),
+        "latency_ms": percentiles(latencies),
+        "stages_ms": {name: {**percentiles(samples), "count": len(samples)} for name, samples in sorted(stage_samples.items())},
+        "peak_traced_bytes": peak_traced,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10, help="passes over the corpus per target")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed passes per page before measuring")
+    parser.add_argument("--mode", choices=("http", "direct"), default="http")
+    parser.add_argument("--target", action="append", help="only run the named target(s)")
+    parser.add_argument("--output", help="result file (default benchmarks/results/extraction.json)")
+    parser.add_argument("--compare", help="previous result file to compare against")
+    args = parser.parse_args()
+
+    pages = {name: read_page(name) for name in corpus_pages()}
+    results = {}
+    with CorpusServer() as server:
+        for target, func in _targets(args.mode).items():
+            if args.target and target not in args.target:
+                continue
+            results[target] = run_target(func, server, pages, args.iterations, args.warmup)
+            latency = results[target]["latency_ms"]
+            print(f"{target}: {results[target]['throughput_docs_per_s']} docs/s, "
+                  f"p50 {latency['p50']} ms, p99 {latency['p99']} ms")
+
+    for target in results:
+        results[target]["mode"] = args.mode
+    results["process"] = {"peak_rss_bytes": peak_rss_bytes()}
+
+    # Read the baseline before writing, it may be the same file
+    comparison = compare(args.compare, results) if args.compare else []
+    path = write_results("extraction", results, args.output)
+    print(f"Results written to {path}")
+    for line in comparison:
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Startup cost of each process type: import time (with a `-X importtime` breakdown)
+and resident memory right after import, measured in fresh interpreters.
+
+    python -m benchmarks.import_bench --repeat 5
+    python -m benchmarks.import_bench --compare benchmarks/results/imports_baseline.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.common import SERVER_DIR, compare, percentiles, write_results
+
+# What each kind of process imports before it can serve work
+PROFILES = {
+    "api": "import app.main",
+    "celery_worker": "import app.services.task_queue",
+    "media_worker": "import app.services.task_queue; from app.services.media_processor import MediaProcessor; MediaProcessor.preload()",
+    "extraction": "import app.main; import newspaper, aiohttp, bs4",
+}
+
+HEAVY_MODULES = ["PIL", "moviepy", "numpy", "imageio", "newspaper", "nltk", "aiohttp", "bs4", "lxml", "celery", "langdetect"]
+
+_PROBE = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+rss = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss = int(line.split()[1]) * 1024
+import json
+print(json.dumps({{"seconds": elapsed, "rss_bytes": rss, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_probe(statement: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _PROBE.format(statement=statement, heavy=HEAVY_MODULES)]
+    return subprocess.run(command, cwd=SERVER_DIR, capture_output=True, text=True, check=True)
+
+
+def top_level_imports(stderr: str, limit: int) -> List[Dict]:
+    """Import time per top-level package from `-X importtime` output.
+
+    Self times are summed, so a package is charged for its own modules only and
+    nothing is counted twice, e.g. fastapi does not include pydantic.
+    """
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{"package": package, "ms": round(us / 1000, 1)} for package, us in ranked]
+
+
+def measure(statement: str, repeat: int, top: int) -> Dict:
+    samples, rss = [], []
+    heavy = []
+    for _ in range(repeat):
+        probe = json.loads(run_probe(statement).stdout.strip().splitlines()[-1])
+        samples.append(probe["seconds"])
+        rss.append(probe["rss_bytes"])
+        heavy = probe["heavy"]
+    breakdown = top_level_imports(run_probe(statement, importtime=True).stderr, top)
+    return {
+        "latency_ms": percentiles(samples),
+        "rss_bytes": sorted(rss)[len(rss) // 2],
+        "heavy_modules": heavy,
+        "top_imports": breakdown,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="top-level packages listed per profile")
+    parser.add_argument("--compare", help="previous result file to compare import times against")
+    parser.add_argument("--output", help="result file (default benchmarks/results/imports.json)")
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in PROFILES.items():
+        results[name] = measure(statement, args.repeat, args.top)
+        heavy = ", ".join(results[name]["heavy_modules"]) or "none"
+        print(f"{name}: {results[name]['latency_ms']['p50']} ms, RSS {results[name]['rss_bytes'] / 2**20:.1f} MiB, heavy: {heavy}")
+        for entry in results[name]["top_imports"][:5]:
+            print(f"    {entry['package']:<20} {entry['ms']} ms")
+
+    comparison = compare(args.compare, results) if args.compare else []
+    path = write_results("imports", results, args.output)
+    print(f"Results written to {path}")
+    for line in comparison:
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Language detection benchmark: legacy `langdetect.detect` on the full text
+versus the cached, prefix-sampling LanguageDetector.
+
+    python -m benchmarks.language_bench --repeat 5
+"""
+import argparse
+import json
+import os
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.common import CORPUS_DIR, percentiles, write_results
+from app.services.language_detector import LanguageDetector
+
+
+def load_fixtures(long_chars: int) -> List[Dict]:
+    with open(os.path.join(CORPUS_DIR, "languages.json"), encoding="utf-8") as f:
+        fixtures = json.load(f)
+    documents = []
+    for fixture in fixtures:
+        documents.append({"lang": fixture["lang"], "kind": "short", "text": fixture["text"]})
+        # Article-sized variant, like the full body handed to _detect_language
+        repeats = max(1, long_chars // len(fixture["text"]))
+        documents.append({"lang": fixture["lang"], "kind": "long", "text": " ".join([fixture["text"]] * repeats)})
+    return documents
+
+
+def legacy_detect(text: str):
+    try:
+        from langdetect import detect
+        return detect(text)
+    except Exception:
+        return None
+
+
+def measure(detect: Callable, documents: List[Dict], repeat: int) -> Dict:
+    latencies = []
+    answers = [set() for _ in documents]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for index, document in enumerate(documents):
+            call_started = time.perf_counter()
+            answers[index].add(detect(document["text"]))
+            latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    def accuracy(selector):
+        chosen = [(doc, answer) for doc, answer in zip(documents, answers) if selector(doc)]
+        if not chosen:
+            return None
+        correct = sum(1 for doc, answer in chosen if answer == {doc["lang"]})
+        return round(correct / len(chosen), 4)
+
+    return {
+        "calls": len(latencies),
+        "throughput_calls_per_s": round(len(latencies) / elapsed, 1),
+        "latency_ms": percentiles(latencies),
+        "accuracy": accuracy(lambda doc: True),
+        "accuracy_turkish": accuracy(lambda doc: doc["lang"] == "tr"),
+        "accuracy_short": accuracy(lambda doc: doc["kind"] == "short"),
+        "accuracy_long": accuracy(lambda doc: doc["kind"] == "long"),
+        "nondeterministic_documents": sum(1 for answer in answers if len(answer) > 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the fixtures")
+    parser.add_argument("--long-chars", type=int, default=20000, help="size of the article-sized variants")
+    parser.add_argument("--output", help="result file (default benchmarks/results/language.json)")
+    args = parser.parse_args()
+
+    documents = load_fixtures(args.long_chars)
+
+    # Profile loading is paid once up front by both paths
+    legacy_detect("warm up")
+    detector = LanguageDetector()
+    detector.load()
+
+    uncached = LanguageDetector()
+    uncached.load()
+
+    def cold(text):
+        uncached.clear_cache()
+        return uncached.detect(text)
+
+    results = {
+        "langdetect.detect (legacy)": measure(legacy_detect, documents, args.repeat),
+        "LanguageDetector (uncached)": measure(cold, documents, args.repeat),
+        "LanguageDetector (cached)": measure(detector.detect, documents, args.repeat),
+    }
+
+    batch_detector = LanguageDetector()
+    batch_detector.load()
+    batch_started = time.perf_counter()
+    batch_detector.detect_many(document["text"] for document in documents * args.repeat)
+    results["LanguageDetector.detect_many"] = {
+        "calls": len(documents) * args.repeat,
+        "throughput_calls_per_s": round(len(documents) * args.repeat / (time.perf_counter() - batch_started), 1),
+    }
+
+    for name, result in results.items():
+        print(f"{name}: {result['throughput_calls_per_s']} calls/s, "
+              f"accuracy {result.get('accuracy')}, turkish {result.get('accuracy_turkish')}, "
+              f"nondeterministic {result.get('nondeterministic_documents')}")
+
+    path = write_results("language", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
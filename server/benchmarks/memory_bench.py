@@ -0,0 +1,132 @@
+"""Memory of forked workers: proportional set size (PSS) per worker when each worker loads the
+extractor's assets itself, versus preloading them in the parent, with and without gc.freeze().
+
+Each mode runs in a fresh interpreter that imports the API like the gunicorn master, forks the
+workers, and lets every worker extract the corpus pages and run a full GC pass, as a worker does
+over its lifetime. PSS splits shared pages between the processes mapping them, so it shows what
+each worker really costs. Linux only (/proc/<pid>/smaps_rollup).
+
+    python -m benchmarks.memory_bench --workers 8
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from typing import Dict
+
+from benchmarks.common import SERVER_DIR, corpus_pages, read_page, write_results
+
+# Mode -> what the parent does before forking
+MODES = {
+    "lazy": "nothing; every worker loads on first use",
+    "preload": "SharedAssets.load() without freezing",
+    "preload_freeze": "SharedAssets.preload(): load with GC paused, then gc.freeze()",
+}
+
+
+def memory_kib(pid: int) -> Dict[str, int]:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss", "Private_Dirty", "Shared_Clean", "Shared_Dirty"):
+                values[key.lower()] = int(rest.split()[0])
+    return values
+
+
+def worker(pages) -> None:
+    import asyncio
+    from app.services.advanced_extractor import AdvancedNewsExtractor
+
+    async def extract_all():
+        for name, html in pages:
+            await AdvancedNewsExtractor.extract_with_metadata(f"http://bench.local/{name}", html=html)
+
+    asyncio.run(extract_all())
+    # A full collection visits every tracked object, as the workers' own GC eventually will
+    gc.collect()
+
+
+def run_mode(mode: str, workers: int) -> Dict:
+    """Inside the per-mode interpreter: fork the workers and measure them while all are alive"""
+    import app.main  # noqa: F401
+    from app.services.preload import SharedAssets
+
+    if mode == "preload":
+        SharedAssets.load()
+    elif mode == "preload_freeze":
+        SharedAssets.preload()
+    pages = [(name, read_page(name)) for name in corpus_pages()]
+
+    ready_read, ready_write = os.pipe()
+    release_read, release_write = os.pipe()
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            os.close(release_write)
+            try:
+                worker(pages)
+                os.write(ready_write, b"1")
+                os.read(release_read, 1)
+            finally:
+                os._exit(0)
+        children.append(pid)
+    os.close(ready_write)
+    os.close(release_read)
+    for _ in range(workers):
+        os.read(ready_read, 1)
+
+    per_worker = [memory_kib(pid) for pid in children]
+    parent = memory_kib(os.getpid())
+    os.close(release_write)
+    for pid in children:
+        os.waitpid(pid, 0)
+
+    def mean(key):
+        return round(sum(sample[key] for sample in per_worker) / len(per_worker))
+
+    return {
+        "workers": workers,
+        "parent_pss_kib": parent["pss"],
+        "worker_pss_kib": mean("pss"),
+        "worker_rss_kib": mean("rss"),
+        "worker_private_dirty_kib": mean("private_dirty"),
+        "total_pss_kib": parent["pss"] + sum(sample["pss"] for sample in per_worker),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--mode", choices=sorted(MODES), help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="result file (default benchmarks/results/memory.json)")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.workers)))
+        return
+
+    results = {}
+    for mode, description in MODES.items():
+        probe = subprocess.run(
+            [sys.executable, "-m", "benchmarks.memory_bench", "--mode", mode, "--workers", str(args.workers)],
+            cwd=SERVER_DIR, capture_output=True, text=True, check=True,
+        )
+        results[mode] = json.loads(probe.stdout.strip().splitlines()[-1])
+        result = results[mode]
+        print(
+            f"{mode} ({description}): worker PSS {result['worker_pss_kib'] / 1024:.1f} MiB "
+            f"(RSS {result['worker_rss_kib'] / 1024:.1f}, private {result['worker_private_dirty_kib'] / 1024:.1f}), "
+            f"{args.workers} workers + parent {result['total_pss_kib'] / 1024:.1f} MiB"
+        )
+
+    path = write_results("memory", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
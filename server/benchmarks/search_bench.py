@@ -0,0 +1,131 @@
+"""Full-text search benchmark over a synthetic article corpus.
+
+    python -m benchmarks.search_bench --articles 1000000 --db /tmp/search_bench.db
+
+The database is built once and reused on later runs with the same path.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import percentiles, synthetic_vocabulary, write_results
+from app.database import Base, register_sqlite_functions
+from app.models import news, user  # noqa: F401  (register tables)
+from app.services.compression import BodyCodec
+from app.services.search import SearchService
+
+def build_database(path: str, articles: int, users: int, words_per_article: int, seed: int = 42):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    vocabulary, weights = synthetic_vocabulary(20000, rng)
+    started_at = datetime(2024, 1, 1)
+
+    connection = sqlite3.connect(path)
+    register_sqlite_functions(connection)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = OFF")
+    for user_id in range(1, users + 1):
+        connection.execute(
+            "INSERT INTO users (id, username, email, hashed_password) VALUES (?, ?, ?, 'x')",
+            (user_id, f"user{user_id}", f"user{user_id}@example.com"),
+        )
+
+    def flush(articles_batch, bodies_batch):
+        connection.executemany(
+            "INSERT INTO news_articles (id, url, title, meta_keywords, user_id, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            articles_batch,
+        )
+        connection.executemany(
+            "INSERT INTO article_bodies (article_id, codec, body, size) VALUES (?, ?, ?, ?)",
+            bodies_batch,
+        )
+        connection.commit()
+
+    articles_batch, bodies_batch = [], []
+    for article_id in range(1, articles + 1):
+        words = rng.choices(vocabulary, weights=weights, k=words_per_article)
+        title = " ".join(words[:8]).capitalize()
+        content = " ".join(words)
+        created = started_at + timedelta(minutes=article_id)
+        articles_batch.append((article_id, f"https://example.com/{article_id}", title, '["bench"]', (article_id % users) + 1, created.isoformat(" ")))
+        codec, body = BodyCodec.encode(content)
+        bodies_batch.append((article_id, codec, body, len(content.encode("utf-8"))))
+        if len(articles_batch) == 10000:
+            flush(articles_batch, bodies_batch)
+            articles_batch, bodies_batch = [], []
+            print(f"  {article_id} articles inserted", end="\r")
+    if articles_batch:
+        flush(articles_batch, bodies_batch)
+    connection.commit()
+    connection.execute("INSERT INTO news_articles_fts(news_articles_fts) VALUES ('optimize')")
+    connection.close()
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--words", type=int, default=120, help="words per synthetic article")
+    parser.add_argument("--db", default="/tmp/search_bench.db")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5, help="pages followed through next_cursor")
+    parser.add_argument("--output", help="result file (default benchmarks/results/search.json)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Building {args.articles} articles into {args.db}")
+        build_started = time.perf_counter()
+        build_database(args.db, args.articles, args.users, args.words)
+        print(f"Built in {time.perf_counter() - build_started:.1f}s")
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    total = db.execute(text("SELECT count(*) FROM news_articles")).scalar()
+
+    queries = {
+        "common_term": "deprem",
+        "two_terms": "ekonomi faiz",
+        "rare_term": "ankara",
+        "prefix": "enfla",
+        "no_match": "zzzzqqq",
+    }
+
+    results = {"articles": total, "users": args.users, "queries": {}}
+    for name, query in queries.items():
+        first_page, deep_pages = [], []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            page = SearchService.search(db, 1, query, limit=20)
+            first_page.append(time.perf_counter() - started)
+            for _ in range(args.pages - 1):
+                if not page["next_cursor"]:
+                    break
+                started = time.perf_counter()
+                page = SearchService.search(db, 1, query, limit=20, cursor=page["next_cursor"])
+                deep_pages.append(time.perf_counter() - started)
+        results["queries"][name] = {
+            "query": query,
+            "first_page_ms": percentiles(first_page),
+            "next_pages_ms": percentiles(deep_pages),
+        }
+        print(f"{name} ({query!r}): first page p50 {results['queries'][name]['first_page_ms']['p50']} ms, "
+              f"next pages p50 {results['queries'][name]['next_pages_ms']['p50']} ms")
+    db.close()
+
+    path = write_results("search", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
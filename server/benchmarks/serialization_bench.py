@@ -0,0 +1,121 @@
+"""Response serialization benchmark for the article list: ORM objects validated
+through NewsResponse and the standard json encoder, versus column tuples
+rendered straight to orjson.
+
+    python -m benchmarks.serialization_bench --articles 1000 --repeat 50
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.common import percentiles, write_results
+from app.database import Base
+from app.models.news import NewsArticle
+from app.models.user import User
+from app.schemas.news import NewsResponse
+from app.services.news_queries import NewsQueryService
+
+WORDS = "haber ekonomi faiz seçim deprem futbol meclis bakan açıklama istanbul ankara market election minister".split()
+
+
+def build_session(articles: int, content_chars: int, seed: int = 42):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    rng = random.Random(seed)
+    user = User(username="bench", email="bench@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    started_at = datetime(2024, 1, 1)
+    for index in range(articles):
+        words = []
+        while sum(len(word) + 1 for word in words) < content_chars:
+            words.append(rng.choice(WORDS))
+        db.add(NewsArticle(
+            url=f"https://example.com/haber/{index}",
+            title=" ".join(words[:8]).capitalize(),
+            content=" ".join(words),
+            publish_date=started_at + timedelta(hours=index),
+            image_url=f"https://example.com/img/{index}.jpg",
+            processed_image_url=f"/static/processed/{index}.jpg",
+            meta_keywords='["ekonomi", "faiz"]',
+            meta_lang="tr",
+            user_id=user.id,
+        ))
+    db.commit()
+    return db, user.id
+
+
+def orm_response(db, user_id: int) -> bytes:
+    """The previous list endpoint: ORM rows, NewsResponse validation, jsonable_encoder, json"""
+    news = db.query(NewsArticle).filter(NewsArticle.user_id == user_id).all()
+    validated = TypeAdapter(List[NewsResponse]).validate_python(news, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def orm_orjson_response(db, user_id: int) -> bytes:
+    """Same full payload as the previous endpoint, but without validation and with orjson"""
+    news = db.query(NewsArticle).filter(NewsArticle.user_id == user_id).all()
+    fields = [name for name in NewsResponse.model_fields]
+    return ORJSONResponse([{name: getattr(article, name) for name in fields} for article in news]).body
+
+
+def column_response(db, user_id: int) -> bytes:
+    return ORJSONResponse(NewsQueryService.list_for_user(db, user_id)).body
+
+
+def measure(render: Callable, db, user_id: int, articles: int, repeat: int) -> Dict:
+    render(db, user_id)  # warm up statement caches
+    latencies = []
+    size = 0
+    for _ in range(repeat):
+        db.expire_all()
+        started = time.perf_counter()
+        size = len(render(db, user_id))
+        latencies.append(time.perf_counter() - started)
+    mean = sum(latencies) / len(latencies)
+    return {
+        "responses": repeat,
+        "response_bytes": size,
+        "throughput_responses_per_s": round(1 / mean, 1),
+        "throughput_articles_per_s": round(articles / mean, 1),
+        "latency_ms": percentiles(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--content-chars", type=int, default=5000, help="body length of each synthetic article")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", help="result file (default benchmarks/results/serialization.json)")
+    args = parser.parse_args()
+
+    db, user_id = build_session(args.articles, args.content_chars)
+    results = {"articles": args.articles, "content_chars": args.content_chars}
+    for name, render in (
+        ("orm_pydantic_json", orm_response),
+        ("orm_orjson", orm_orjson_response),
+        ("columns_orjson", column_response),
+    ):
+        results[name] = measure(render, db, user_id, args.articles, args.repeat)
+        print(f"{name}: {results[name]['throughput_responses_per_s']} responses/s, "
+              f"p50 {results[name]['latency_ms']['p50']} ms, {results[name]['response_bytes']} bytes")
+    db.close()
+
+    path = write_results("serialization", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Article body storage benchmark: bodies inline in news_articles (the layout before
+article_bodies) versus compressed rows in article_bodies.
+
+    python -m benchmarks.storage_bench --articles 1000000 --dir /tmp/storage_bench
+
+Both databases carry the same metadata columns and (user_id, created_at) index; the
+search index is left out because it stores no body text in either layout. Databases
+are built once per directory and reused on later runs.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from benchmarks.common import percentiles, synthetic_vocabulary, write_results
+from app.services.compression import BodyCodec
+
+METADATA_COLUMNS = """
+    id INTEGER PRIMARY KEY, url VARCHAR NOT NULL, title VARCHAR, publish_date DATETIME,
+    image_url VARCHAR, processed_image_url VARCHAR, video_url VARCHAR, processed_video_url VARCHAR,
+    meta_keywords TEXT, meta_lang VARCHAR, user_id INTEGER, created_at DATETIME
+"""
+
+LAYOUTS = {
+    "inline": [
+        f"CREATE TABLE news_articles ({METADATA_COLUMNS}, content TEXT)",
+    ],
+    "compressed": [
+        f"CREATE TABLE news_articles ({METADATA_COLUMNS})",
+        "CREATE TABLE article_bodies (article_id INTEGER PRIMARY KEY, codec VARCHAR(8) NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL)",
+    ],
+}
+
+LIST_SQL = """
+    SELECT id, url, title, publish_date, image_url, processed_image_url, video_url, processed_video_url,
+           meta_keywords, meta_lang, created_at, user_id
+    FROM news_articles WHERE user_id = ? ORDER BY created_at DESC LIMIT 50 OFFSET ?
+"""
+
+
+def generate(articles: int, users: int, words_per_article: int, seed: int = 42):
+    rng = random.Random(seed)
+    vocabulary, weights = synthetic_vocabulary(20000, rng)
+    started_at = datetime(2024, 1, 1)
+    for article_id in range(1, articles + 1):
+        words = rng.choices(vocabulary, weights=weights, k=words_per_article)
+        # Sentences of 8-20 words, like running article text
+        sentences, position = [], 0
+        while position < len(words):
+            length = rng.randint(8, 20)
+            sentences.append(" ".join(words[position:position + length]).capitalize() + ".")
+            position += length
+        yield (
+            article_id,
+            f"https://example.com/haber/{article_id}",
+            " ".join(words[:8]).capitalize(),
+            (started_at + timedelta(minutes=article_id)).isoformat(" "),
+            f"https://example.com/img/{article_id}.jpg",
+            '["ekonomi", "gündem"]',
+            "tr",
+            (article_id % users) + 1,
+            (started_at + timedelta(minutes=article_id)).isoformat(" "),
+            " ".join(sentences),
+        )
+
+
+def build(path: str, layout: str, args) -> Dict:
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = OFF")
+    for statement in LAYOUTS[layout]:
+        connection.execute(statement)
+    connection.execute("CREATE INDEX ix_news_articles_user_id_created_at ON news_articles (user_id, created_at)")
+
+    metadata_sql = ("INSERT INTO news_articles (id, url, title, publish_date, image_url, meta_keywords, meta_lang, "
+                    "user_id, created_at{extra}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?{placeholder})")
+    raw_bytes = 0
+    started = time.perf_counter()
+    articles_batch, bodies_batch = [], []
+
+    def flush():
+        if layout == "inline":
+            connection.executemany(metadata_sql.format(extra=", content", placeholder=", ?"), articles_batch)
+        else:
+            connection.executemany(metadata_sql.format(extra="", placeholder=""), articles_batch)
+            connection.executemany("INSERT INTO article_bodies (article_id, codec, body, size) VALUES (?, ?, ?, ?)", bodies_batch)
+        connection.commit()
+        articles_batch.clear()
+        bodies_batch.clear()
+
+    for row in generate(args.articles, args.users, args.words):
+        content = row[-1]
+        raw_bytes += len(content.encode("utf-8"))
+        if layout == "inline":
+            articles_batch.append(row)
+        else:
+            articles_batch.append(row[:-1])
+            codec, body = BodyCodec.encode(content)
+            bodies_batch.append((row[0], codec, body, len(content.encode("utf-8"))))
+        if len(articles_batch) == 10000:
+            flush()
+            print(f"  {layout}: {row[0]} articles", end="\r")
+    flush()
+    connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    connection.close()
+    print()
+    elapsed = time.perf_counter() - started
+    return {"build_seconds": round(elapsed, 1), "insert_articles_per_s": round(args.articles / elapsed, 1), "body_bytes_raw": raw_bytes}
+
+
+def table_sizes(connection) -> Dict[str, int]:
+    try:
+        rows = connection.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall()
+    except sqlite3.OperationalError:
+        return {}  # SQLite built without the dbstat table
+    return {name: size for name, size in rows}
+
+
+def timed(samples: int, call: Callable[[int], None], rng: random.Random):
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        call(rng.random())
+        latencies.append(time.perf_counter() - started)
+    return percentiles(latencies)
+
+
+def measure(path: str, layout: str, args) -> Dict:
+    connection = sqlite3.connect(path)
+    # Same, deliberately small page cache for both layouts
+    connection.execute(f"PRAGMA cache_size = -{args.cache_kib}")
+    rng = random.Random(7)
+    per_user = args.articles // args.users
+
+    def list_page(r):
+        user_id = int(r * args.users) + 1
+        connection.execute(LIST_SQL, (user_id, int(r * 997) % max(1, per_user - 50))).fetchall()
+
+    def detail(r):
+        article_id = int(r * args.articles) + 1
+        if layout == "inline":
+            connection.execute("SELECT content FROM news_articles WHERE id = ?", (article_id,)).fetchone()
+        else:
+            codec, body = connection.execute("SELECT codec, body FROM article_bodies WHERE article_id = ?", (article_id,)).fetchone()
+            BodyCodec.decode(codec, body)
+
+    def metadata_scan(r):
+        connection.execute("SELECT count(*), max(created_at) FROM news_articles WHERE meta_lang = 'tr'").fetchone()
+
+    result = {
+        "file_bytes": os.path.getsize(path),
+        "tables_bytes": table_sizes(connection),
+        "list_page_ms": timed(args.samples, list_page, rng),
+        "detail_ms": timed(args.samples, detail, rng),
+        "metadata_scan_ms": timed(max(3, args.samples // 100), metadata_scan, rng),
+    }
+    connection.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--words", type=int, default=500, help="words per synthetic article")
+    parser.add_argument("--dir", default="/tmp/storage_bench")
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--cache-kib", type=int, default=2000, help="SQLite page cache per connection")
+    parser.add_argument("--output", help="result file (default benchmarks/results/storage.json)")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    results = {"articles": args.articles, "words_per_article": args.words}
+    for layout in LAYOUTS:
+        path = os.path.join(args.dir, f"{layout}_{args.articles}.db")
+        build_stats = None
+        if not os.path.exists(path):
+            print(f"Building {args.articles} articles into {path}")
+            build_stats = build(path, layout, args)
+        results[layout] = {**(build_stats or {}), **measure(path, layout, args)}
+        print(f"{layout}: {results[layout]['file_bytes'] / 2**20:.1f} MiB, "
+              f"list p50 {results[layout]['list_page_ms']['p50']} ms, detail p50 {results[layout]['detail_ms']['p50']} ms, "
+              f"metadata scan p50 {results[layout]['metadata_scan_ms']['p50']} ms")
+
+    inline, compressed = results["inline"]["file_bytes"], results["compressed"]["file_bytes"]
+    results["space_saved_bytes"] = inline - compressed
+    results["space_saved_ratio"] = round(1 - compressed / inline, 4)
+    print(f"Space saved: {results['space_saved_bytes'] / 2**20:.1f} MiB ({results['space_saved_ratio']:.1%})")
+
+    path = write_results("storage", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
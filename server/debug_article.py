@@ -1,4 +1,6 @@
+import os
 import sys
+import time
 import traceback
 from datetime import datetime
 
@@ -41,13 +43,13 @@ def debug_article(url: str):
             from app.services.news_extractor import NewsExtractor
             extracted = NewsExtractor.extract_content(url)
             
-            if extracted["success"]:
-                print(f"✓ Enhanced Title: {extracted['title']}")
-                print(f"✓ Enhanced Publish Date: {extracted['publish_date']}")
-                print(f"✓ Meta Keywords: {extracted['meta_keywords']}")
-                print(f"✓ Meta Language: {extracted['meta_lang']}")
+            if extracted.success:
+                print(f"✓ Enhanced Title: {extracted.title}")
+                print(f"✓ Enhanced Publish Date: {extracted.publish_date}")
+                print(f"✓ Meta Keywords: {extracted.meta_keywords}")
+                print(f"✓ Meta Language: {extracted.meta_lang}")
             else:
-                print(f"✗ Enhanced extraction failed: {extracted['error']}")
+                print(f"✗ Enhanced extraction failed: {extracted.error}")
         except Exception as e:
             print(f"✗ Error testing enhanced extraction: {e}")
         
@@ -102,7 +104,33 @@ def debug_article(url: str):
         print("Full traceback:")
         traceback.print_exc()
 
+def debug_batch(urls):
+    """Extract many URLs concurrently and print one line per article as it completes"""
+    from app.services.batch_extractor import extract_many_sync
+    
+    started = time.perf_counter()
+    succeeded = 0
+    for result in extract_many_sync(urls):
+        if result.success:
+            succeeded += 1
+            print(f"✓ {result.seconds:6.2f}s {result.url} | {result.extracted.title} | {result.extracted.word_count} words")
+        else:
+            print(f"✗ {result.seconds:6.2f}s {result.url} | {result.error}")
+    elapsed = time.perf_counter() - started
+    print(f"\n{succeeded}/{len(urls)} extracted in {elapsed:.1f}s")
+
 if __name__ == "__main__":
-    # Test with the Turkish news URL
-    test_url = "https://www.haber7.com/dunya/haber/3551186-emekli-generalden-israili-sarsan-iddia-turkiye-israille-savasa-hazirlaniyor"
-    debug_article(test_url) 
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # URLs as arguments, or a file with one URL per line
+        args = sys.argv[1:]
+        if len(args) == 1 and os.path.isfile(args[0]):
+            with open(args[0], encoding="utf-8") as f:
+                args = [line.strip() for line in f if line.strip()]
+        if len(args) == 1:
+            debug_article(args[0])
+        else:
+            debug_batch(args)
+    else:
+        # Test with the Turkish news URL
+        test_url = "https://www.haber7.com/dunya/haber/3551186-emekli-generalden-israili-sarsan-iddia-turkiye-israille-savasa-hazirlaniyor"
+        debug_article(test_url)
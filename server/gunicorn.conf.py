@@ -0,0 +1,50 @@
+"""Production server: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master (preload) and forked into the workers, together with
+the extractor's read-only assets (newspaper, stopwords, language profiles), which the workers
+then share copy-on-write. Per-worker startup work runs in each worker's lifespan hook; migrations
+are serialized there by a file lock, so only the first worker applies them. The Celery job
+sweep runs once in the master.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# UvicornWorker that fails readiness for SHUTDOWN_READY_DELAY seconds after SIGTERM before it stops listening
+worker_class = "app.worker.DrainingUvicornWorker"
+preload_app = True
+
+# Long extractions get this long to finish after SIGTERM before the worker is killed
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "60"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared with the forked workers
+    from app.database import engine
+
+    engine.dispose(close=False)
+
+
+def when_ready(server):
+    from app.services.jobs import job_runner
+    from app.services.preload import SharedAssets
+
+    SharedAssets.preload()
+    # Once per start in the master, not once per worker: with Celery every worker would send
+    # the same jobs to the queue again
+    job_runner.startup_sweep()
+
+
+def pre_fork(server, worker):
+    # Replacement workers are forked later; freeze what the master allocated in the meantime
+    from app.services.preload import SharedAssets
+
+    SharedAssets.freeze()
@@ -8,6 +8,7 @@ async def test_advanced_extraction():
     """Test the advanced news extraction with the Turkish news URL"""
     try:
         from app.services.advanced_extractor import AdvancedNewsExtractor
+        from app.services.extraction_result import HEAVY_SECTIONS
         
         test_url = "https://www.haber7.com/dunya/haber/3551186-emekli-generalden-israili-sarsan-iddia-turkiye-israille-savasa-hazirlaniyor"
         
@@ -15,7 +16,7 @@ async def test_advanced_extraction():
         print(f"URL: {test_url}")
         print("-" * 50)
         
-        result = await AdvancedNewsExtractor.extract_with_metadata(test_url)
+        result = (await AdvancedNewsExtractor.extract_with_metadata(test_url, include=HEAVY_SECTIONS)).as_dict()
         
         if result["success"]:
             print("✓ Advanced extraction successful!")
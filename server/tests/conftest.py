@@ -23,4 +23,27 @@ def test_db():
     
     # Cleanup
     os.close(db_fd)
-    os.unlink(db_path)
\ No newline at end of file
+    os.unlink(db_path)
+
+@pytest.fixture(autouse=True)
+def fresh_fetch_state(tmp_path, monkeypatch):
+    # Each test starts without cached robots.txt rules (in memory or on disk) or per-domain fetch state
+    from app.config import settings
+    from app.services.fetch_governor import fetch_governor
+    from app.services.robots import robots_cache
+
+    monkeypatch.setattr(settings, "ROBOTS_CACHE_DIR", str(tmp_path / "robots"))
+    robots_cache.reset()
+    fetch_governor.reset()
+    yield
+    robots_cache.reset()
+    fetch_governor.reset()
+
+@pytest.fixture(autouse=True)
+def fresh_domain_profiles():
+    # Profiles learned or loaded by one test (e.g. configured selectors) don't carry into the next
+    from app.services.domain_profiles import domain_profiles
+
+    domain_profiles.reset()
+    yield
+    domain_profiles.reset()
@@ -0,0 +1,76 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.article_body import ArticleBody
+from app.models.news import NewsArticle
+from app.models.user import User
+from app.services.compression import BodyCodec
+from tests.test_auth import TestingSessionLocal, setup_database
+from tests.test_news import get_auth_token
+
+client = TestClient(app)
+
+LONG_BODY = "Merkez bankası faiz kararını açıkladı ve piyasalar yükselişle kapandı. " * 200
+
+def add_article(content):
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "testuser").first()
+        article = NewsArticle(url="https://example.com/faiz", title="Faiz kararı", content=content, user_id=user.id)
+        db.add(article)
+        db.commit()
+        return article.id
+    finally:
+        db.close()
+
+def fts_count(db, query):
+    return db.connection().exec_driver_sql(
+        "SELECT count(*) FROM news_articles_fts WHERE news_articles_fts MATCH ?", (query,)
+    ).scalar()
+
+def test_codec_round_trip_and_short_bodies_stay_raw():
+    assert BodyCodec.encode("kısa") == ("raw", "kısa".encode("utf-8"))
+    codec, data = BodyCodec.encode(LONG_BODY)
+    assert codec == "zlib"
+    assert len(data) < len(LONG_BODY) / 10
+    assert BodyCodec.decode(codec, data) == LONG_BODY
+
+def test_body_is_stored_compressed_and_served_gzipped_by_detail_view(setup_database):
+    token = get_auth_token()
+    article_id = add_article(LONG_BODY)
+    
+    db = TestingSessionLocal()
+    try:
+        body = db.get(ArticleBody, article_id)
+        assert body.codec == "zlib"
+        assert body.size == len(LONG_BODY.encode("utf-8"))
+        assert len(body.body) < body.size
+    finally:
+        db.close()
+    
+    response = client.get(f"/api/news/{article_id}", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["content"] == LONG_BODY
+
+def test_search_index_follows_body_changes(setup_database):
+    get_auth_token()
+    article_id = add_article(LONG_BODY)
+    
+    db = TestingSessionLocal()
+    try:
+        assert fts_count(db, "piyasalar") == 1
+        
+        article = db.get(NewsArticle, article_id)
+        article.content = "Milli takım deplasmanda kazandı."
+        db.commit()
+        assert fts_count(db, "piyasalar") == 0
+        assert fts_count(db, "deplasmanda") == 1
+        assert fts_count(db, "faiz") == 1  # still matched through the title
+        
+        db.delete(article)
+        db.commit()
+        assert fts_count(db, "deplasmanda") == 0
+        assert fts_count(db, "faiz") == 0
+        assert db.query(ArticleBody).count() == 0
+    finally:
+        db.close()
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.config import settings
+from app.services.batch_extractor import extract_many, extract_many_sync
+from app.services.fetch_governor import fetch_governor
+
+PARAGRAPH = "Traffic in the city centre returned to normal over the weekend after the new road layout opened. "
+
+
+class ArticleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        # /article/<n>?delay=<seconds>
+        path, _, query = self.path.partition("?")
+        number = path.rsplit("/", 1)[-1]
+        delay = float(query.split("=")[1]) if query else 0
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.connections.add(self.client_address)
+        try:
+            time.sleep(delay)
+            body = (
+                f"<html><head><title>Story {number}</title></head><body><article>"
+                f"<h1>Story {number}</h1><p>{PARAGRAPH * 5}</p><p>{PARAGRAPH * 5}</p></article></body></html>"
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_RATE", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_BURST", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_INITIAL_CONCURRENCY", 8)
+    monkeypatch.setattr(settings, "FETCH_MAX_CONCURRENCY", 8)
+    fetch_governor.reset()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ArticleHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.active = server.max_active = 0
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server
+    server.shutdown()
+    server.server_close()
+    fetch_governor.reset()
+
+
+def test_results_arrive_in_completion_order(origin):
+    base_url, server = origin
+    # The first extraction in a process loads newspaper and the language profiles
+    list(extract_many_sync([f"{base_url}/article/warmup"]))
+    server.connections.clear()
+    urls = [f"{base_url}/article/{n}?delay={0.4 if n == 0 else 0.05}" for n in range(6)]
+
+    async def collect():
+        return [result async for result in extract_many(urls, concurrency=3, parse_workers=2)]
+
+    results = asyncio.run(collect())
+
+    assert all(result.success for result in results)
+    assert sorted(result.index for result in results) == list(range(6))
+    # The slow first URL does not hold back the others
+    assert results[-1].index == 0
+    assert results[-1].extracted.title == "Story 0"
+    assert server.max_active <= 3
+    # Keep-alive connections from the shared pool are reused across URLs
+    assert len(server.connections) <= 3
+
+
+def test_urls_are_pulled_only_as_results_are_consumed(origin):
+    base_url, _ = origin
+    pulled = []
+
+    def urls():
+        for n in range(20):
+            pulled.append(n)
+            yield f"{base_url}/article/{n}"
+
+    results = extract_many_sync(urls(), concurrency=2, parse_workers=1)
+    first = next(results)
+    assert first.success
+    # Two in flight, plus the one started when the first finished
+    assert len(pulled) <= 3
+    results.close()
+
+
+def test_sync_wrapper_reports_failures_per_url(origin):
+    base_url, _ = origin
+    results = list(extract_many_sync([f"{base_url}/article/1", "http://127.0.0.1:9/closed"], concurrency=2))
+
+    by_url = {result.url: result for result in results}
+    assert by_url[f"{base_url}/article/1"].success
+    assert by_url[f"{base_url}/article/1"].extracted.word_count > 100
+    assert not by_url["http://127.0.0.1:9/closed"].success
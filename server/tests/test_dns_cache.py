@@ -0,0 +1,118 @@
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.config import settings
+from app.services import metrics
+from app.services.dns_cache import dns_cache, interleave_families
+from app.services.page_fetch import PageFetcher
+
+
+class StubResolver:
+    """Blocking getaddrinfo stand-in: *.test names resolve to 127.0.0.1, anything else fails"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, host, port, family=0, type=0, proto=0, flags=0):
+        with self.lock:
+            self.calls.append(host)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if not host.endswith(".test"):
+                raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        status, body = (404, b"") if self.path == "/robots.txt" else (200, b"<html><head></head><body>ok</body></html>")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    stub = StubResolver()
+    monkeypatch.setattr(dns_cache, "lookup", stub)
+    dns_cache.reset()
+    yield stub
+    dns_cache.reset()
+
+
+def test_lookups_are_shared_cached_and_negatively_cached(resolver, monkeypatch):
+    monkeypatch.setattr(settings, "DNS_CACHE_TTL", 0.2)
+    monkeypatch.setattr(settings, "DNS_MAX_LOOKUPS", 2)
+    dns_cache.reset()
+    resolver.delay = 0.05
+
+    async def resolve_all(names):
+        return await asyncio.gather(*[dns_cache.resolve(name, 80) for name in names], return_exceptions=True)
+
+    # Ten callers for one name share a single lookup; distinct names run at most two at a time
+    answers = asyncio.run(resolve_all(["haber.test"] * 10 + [f"site{i}.test" for i in range(4)]))
+    assert all(answer[0]["host"] == "127.0.0.1" for answer in answers)
+    assert resolver.calls.count("haber.test") == 1 and resolver.max_active == 2
+
+    # Cached across event loops until the TTL runs out
+    asyncio.run(dns_cache.resolve("HABER.test", 80))
+    assert resolver.calls.count("haber.test") == 1
+    time.sleep(0.25)
+    asyncio.run(dns_cache.resolve("haber.test", 80))
+    assert resolver.calls.count("haber.test") == 2
+
+    # A name that doesn't resolve isn't looked up again within DNS_NEGATIVE_TTL
+    for _ in range(3):
+        with pytest.raises(socket.gaierror):
+            asyncio.run(dns_cache.resolve("yok.example", 80))
+    assert resolver.calls.count("yok.example") == 1
+
+
+def test_address_families_alternate():
+    hosts = [{"family": socket.AF_INET6, "host": f"v6-{i}"} for i in range(3)]
+    hosts += [{"family": socket.AF_INET, "host": f"v4-{i}"} for i in range(2)]
+    assert [host["host"] for host in interleave_families(hosts)] == ["v6-0", "v4-0", "v6-1", "v4-1", "v6-2"]
+
+
+def test_fetches_reuse_lookups_and_report_phase_timings(resolver, monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_RATE", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_BURST", 1000.0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stages = []
+    monkeypatch.setattr(metrics, "stage_listeners", [lambda name, domain, seconds: stages.append((name, domain))])
+    try:
+        url = f"http://haber.test:{server.server_address[1]}"
+        for path in ("/1", "/2"):
+            page = asyncio.run(PageFetcher.fetch(url + path))
+            assert "ok" in page.html
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # robots.txt and both pages, each in a session of its own, from one lookup
+    assert resolver.calls == ["haber.test"]
+    assert stages.count(("fetch_dns", "haber.test")) == 3
+    assert stages.count(("fetch_connect", "haber.test")) == 3
+    assert stages.count(("fetch_ttfb", "haber.test")) == 3
+    assert ("fetch_tls", "haber.test") not in stages
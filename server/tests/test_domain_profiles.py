@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import patch
+from app.services.advanced_extractor import AdvancedNewsExtractor
+from app.services.domain_profiles import DomainProfileStore, domain_profiles
+from app.services.extraction_result import HEAVY_SECTIONS, ExtractedArticle
+from app.config import settings
+
+ARTICLE_HTML = """
+<html lang="tr">
+<head><meta property="og:title" content="Başlık"></head>
+<body>
+  <h1 class="article-title">Test Başlık</h1>
+  <div class="article-body"><p>Birinci paragraf.</p><p>İkinci paragraf.</p></div>
+  <time datetime="2024-05-01T10:00:00Z">1 Mayıs</time>
+</body>
+</html>
+"""
+
+def test_domain_of_strips_www():
+    assert DomainProfileStore.domain_of("https://www.Example.com/news/1") == "example.com"
+
+def test_learned_profile_skips_unproductive_steps():
+    store = DomainProfileStore()
+    profile = store.get("https://example.com/a")
+    
+    for _ in range(settings.DOMAIN_PROFILE_LEARNING_SAMPLES):
+        assert profile.should_run("video_urls")
+        store.record_step(profile, "video_urls", False, 0.001)
+        store.record_step(profile, "og_data", True, 0.001)
+        store.record_extraction(profile, 0.01, False)
+    
+    assert not profile.is_learning
+    assert not profile.should_run("video_urls")
+    assert profile.should_run("og_data")
+
+def test_configured_profile_uses_selector_fast_path(tmp_path):
+    config = tmp_path / "profiles.json"
+    config.write_text(
+        '{"example-news.com": {"selectors": {"title": "h1.article-title", '
+        '"content": "div.article-body p", "publish_date": "time"}, "steps": ["og_data", "meta_lang"]}}'
+    )
+    domain_profiles.load_config(str(config))
+    
+    async def fake_fetch(url):
+        return ARTICLE_HTML
+    
+    with patch.object(AdvancedNewsExtractor, "_fetch_html", side_effect=fake_fetch), \
+            patch("app.services.news_extractor.NewsExtractor.extract_content") as mock_extract:
+        result = asyncio.run(AdvancedNewsExtractor.extract_with_metadata(
+            "https://example-news.com/haber/1", include=HEAVY_SECTIONS
+        ))
+    
+    mock_extract.assert_not_called()
+    assert result.title == "Test Başlık"
+    assert result.content == "Birinci paragraf.\n\nİkinci paragraf."
+    assert result.publish_date.year == 2024
+    assert result.og_data == {"title": "Başlık"}
+    assert result.language == "tr"
+    assert result.video_urls == []
+    
+    stats = {p["domain"]: p for p in domain_profiles.snapshot()}["example-news.com"]
+    assert stats["fast_path_extractions"] == 1
+    assert stats["steps"]["video_urls"]["skipped"] == 1
+
+def test_reset_drops_profiles_loaded_after_startup(tmp_path):
+    config = tmp_path / "profiles.json"
+    config.write_text('{"example-news.com": {"selectors": {"title": "h1"}}}')
+    store = DomainProfileStore()
+    store.load_config(str(config))
+    assert store.get("https://example-news.com/1").selectors == {"title": "h1"}
+    
+    store.reset()
+    assert store.get("https://example-news.com/1").selectors == {}
+
+def test_language_detection_is_a_profiled_step():
+    html = "<html><body><p>Merkez bankası faiz kararını açıkladı.</p></body></html>"
+    
+    def extract(url):
+        # A fresh article each time: the enrichment steps fill it in place
+        basic = ExtractedArticle(title="Faiz kararı", content="Merkez bankası faiz kararını bugün açıkladı ve piyasalar yükseldi.")
+        with patch("app.services.news_extractor.NewsExtractor.extract_content", return_value=basic):
+            return asyncio.run(AdvancedNewsExtractor.extract_with_metadata(url, html=html))
+    
+    assert extract("https://learned-news.com/1").language == "tr"
+    stats = {p["domain"]: p for p in domain_profiles.snapshot()}["learned-news.com"]
+    assert stats["steps"]["language_detect"]["runs"] == 1
+    
+    # A domain configured without the step doesn't pay for detection
+    profile = domain_profiles.get("https://quiet-news.com/1")
+    profile.steps = {"og_data"}
+    assert extract("https://quiet-news.com/1").language is None
+    assert profile.step_stats["language_detect"].skipped == 1
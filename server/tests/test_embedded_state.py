@@ -0,0 +1,91 @@
+import json
+from app.services.embedded_state import EmbeddedStateExtractor
+from app.services.news_extractor import NewsExtractor
+
+PARAGRAPHS = [
+    "Belediye, kent merkezindeki tarihi çarşının yenilenmesi için yeni bir proje başlattı.",
+    "Proje kapsamında dükkanların cepheleri aslına uygun olarak restore edilecek.",
+    "Çalışmaların yaz sonuna kadar tamamlanması ve esnafın bu süre boyunca çalışmaya devam etmesi planlanıyor.",
+]
+
+
+def page(script: str) -> str:
+    # A client-rendered page: an empty mount point and the data in a script tag
+    return f'<html><head><title>Haber</title></head><body><div id="__next"></div>{script}</body></html>'
+
+
+def next_page() -> str:
+    state = {
+        "props": {"pageProps": {
+            "menu": [{"title": "Gündem", "text": "Son dakika"}],
+            "article": {
+                "headline": "Tarihi çarşı yenileniyor",
+                "body": "".join(f"<p>{text}</p>" for text in PARAGRAPHS),
+                "publishedAt": "2024-03-01T09:30:00Z",
+                "image": {"url": "https://cdn.example.com/carsi.jpg"},
+            },
+        }},
+        "page": "/haber/[slug]",
+    }
+    return page(f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>')
+
+
+def test_next_data_maps_to_article_fields():
+    extracted = EmbeddedStateExtractor.extract(next_page())
+
+    assert extracted["framework"] == "next"
+    assert extracted["title"] == "Tarihi çarşı yenileniyor"
+    assert extracted["content"].split("\n\n") == PARAGRAPHS
+    assert extracted["publish_date"].isoformat() == "2024-03-01T09:30:00+00:00"
+    assert extracted["image_url"] == "https://cdn.example.com/carsi.jpg"
+
+
+def test_nuxt_payload_is_unflattened():
+    # devalue form: entries refer to each other by index, wrapped in Reactive markers
+    payload = [
+        ["Reactive", 1],
+        {"data": 2},
+        {"story": 3},
+        {"title": 4, "content": 5, "date": 10},
+        "Tarihi çarşı yenileniyor",
+        [6, 8],
+        {"type": 7, "text": 9},
+        "paragraph",
+        {"type": 7, "text": 11},
+        PARAGRAPHS[0],
+        ["Date", "2024-03-01T09:30:00.000Z"],
+        PARAGRAPHS[1],
+    ]
+    html = page(f'<script type="application/json" id="__NUXT_DATA__" data-ssr="true">{json.dumps(payload)}</script>')
+
+    extracted = EmbeddedStateExtractor.extract(html)
+
+    assert extracted["framework"] == "nuxt"
+    assert extracted["content"] == "\n\n".join(PARAGRAPHS[:2])
+    assert extracted["publish_date"].year == 2024
+
+
+def test_initial_state_assignments():
+    state = {"news": {"current": {"title": "Tarihi çarşı", "content": " ".join(PARAGRAPHS), "publishDate": 1709285400000}}}
+    assignment = f"window.__INITIAL_STATE__ = {json.dumps(state)};window.__ENV__ = 'prod';"
+    extracted = EmbeddedStateExtractor.extract(page(f"<script>{assignment}</script>"))
+    assert extracted["content"] == " ".join(PARAGRAPHS)
+    assert extracted["publish_date"].year == 2024
+
+    # The same state serialized as a string for JSON.parse
+    quoted = json.dumps(json.dumps(state))
+    extracted = EmbeddedStateExtractor.extract(page(f"<script>window.__PRELOADED_STATE__ = JSON.parse({quoted});</script>"))
+    assert extracted["title"] == "Tarihi çarşı"
+
+    # Nuxt 2 ships a function rather than JSON; it is skipped
+    assert EmbeddedStateExtractor.extract(page("<script>window.__NUXT__=(function(a){return {}}(1));</script>")) is None
+    assert EmbeddedStateExtractor.extract(page("<p>Plain page</p>")) is None
+
+
+def test_extract_content_falls_back_to_embedded_state():
+    extracted = NewsExtractor.extract_content("https://example.com/haber/carsi", html=next_page())
+
+    assert extracted.success
+    assert extracted.title == "Haber"
+    assert PARAGRAPHS[2] in extracted.content
+    assert extracted.image_url == "https://cdn.example.com/carsi.jpg"
@@ -0,0 +1,172 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from app.config import settings
+from app.main import app
+from app.models.news import NewsArticle
+from app.models.user import User
+from app.services.export import ArticleExporter
+from tests.test_auth import SQLALCHEMY_DATABASE_URL, TestingSessionLocal, setup_database
+from tests.test_news import get_auth_token
+
+client = TestClient(app)
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_articles():
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "testuser").first()
+        for url, created_at in (
+            ("https://www.haber.com/ekonomi/1", datetime(2024, 1, 10)),
+            ("https://haber.com/spor/2", datetime(2024, 2, 10)),
+            ("https://haber.com.tr/gundem/3", datetime(2024, 2, 20)),
+            ("http://gazete.com/dunya/4", datetime(2024, 3, 10)),
+        ):
+            db.add(NewsArticle(url=url, title=f"Haber {url[-1]}", content=f"Metin {url[-1]}, \"alıntı\"\nikinci satır",
+                               created_at=created_at, user_id=user.id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_ndjson_export_streams_the_filtered_archive(setup_database):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    add_articles()
+
+    response = client.get("/api/news/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "news-export.ndjson" in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["url"][-1] for row in rows] == ["1", "2", "3", "4"]
+    assert rows[0]["content"] == "Metin 1, \"alıntı\"\nikinci satır"
+
+    # The www. host counts as the domain; haber.com.tr does not
+    response = client.get("/api/news/export", params={"domain": "haber.com", "since": "2024-02-01T00:00:00"},
+                          headers=headers)
+    assert [json.loads(line)["url"] for line in response.text.splitlines()] == ["https://haber.com/spor/2"]
+
+    response = client.get("/api/news/export", params={"until": "2024-02-15T00:00:00"}, headers=headers)
+    assert len(response.text.splitlines()) == 2
+
+
+def test_csv_export_and_unknown_formats(setup_database):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    add_articles()
+
+    response = client.get("/api/news/export", params={"format": "csv", "domain": "gazete.com"}, headers=headers)
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["content"] == "Metin 4, \"alıntı\"\nikinci satır"
+    assert rows[0]["created_at"] == "2024-03-10T00:00:00"
+
+    assert client.get("/api/news/export", params={"format": "xlsx"}, headers=headers).status_code == 400
+    assert client.get("/api/news/export").status_code == 401
+
+
+def test_export_reads_in_short_batches_that_leave_the_database_writable(setup_database, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    get_auth_token()
+    add_articles()
+    db = TestingSessionLocal()
+    try:
+        # Ties on created_at and a row without one are paged past like any other
+        db.execute(update(NewsArticle).where(NewsArticle.url.endswith("/3")).values(created_at=datetime(2024, 2, 10)))
+        db.execute(update(NewsArticle).where(NewsArticle.url.endswith("/4")).values(created_at=None))
+        db.commit()
+        user_id = db.query(User.id).filter(User.username == "testuser").scalar()
+
+        rows = ArticleExporter.rows(db, user_id)
+        first = next(rows)
+        # A writer mid-export doesn't wait for the client to finish downloading
+        writer = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"timeout": 0.5})
+        with writer.begin() as connection:
+            connection.execute(update(NewsArticle).where(NewsArticle.id == first["id"]).values(title="Güncel"))
+        writer.dispose()
+        urls = [first["url"]] + [row["url"] for row in rows]
+    finally:
+        db.close()
+    assert [url[-1] for url in urls] == ["4", "1", "2", "3"]
+
+
+def test_parquet_export(setup_database):
+    pq = pytest.importorskip("pyarrow.parquet")
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    add_articles()
+
+    response = client.get("/api/news/export", params={"format": "parquet"}, headers=headers)
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 4
+    assert table.column("title").to_pylist()[0] == "Haber 1"
+
+
+# Builds a database of `rows` articles with ~4 KB bodies and reports how much the resident set
+# grows while the export is consumed, along with the number of bytes exported
+MEMORY_PROBE = r"""
+import gc, sys
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models.article_body import ArticleBody
+from app.models.news import NewsArticle
+from app.models.user import User
+from app.services.export import ArticleExporter
+
+def rss():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+
+rows, path = int(sys.argv[1]), sys.argv[2]
+engine = create_engine(f"sqlite:///{path}")
+Base.metadata.create_all(engine)
+with engine.begin() as connection:
+    connection.execute(insert(User.__table__), [{"id": 1, "username": "u", "email": "u@example.com", "hashed_password": "x"}])
+    connection.execute(insert(NewsArticle.__table__), [
+        {"id": i, "url": f"https://haber.com/{i}", "title": f"Haber {i}", "user_id": 1} for i in range(1, rows + 1)
+    ])
+    connection.execute(insert(ArticleBody.__table__), [
+        {"article_id": i, "codec": "raw", "body": (f"{i} " + "haber metni " * 340).encode(), "size": 4000}
+        for i in range(1, rows + 1)
+    ])
+
+gc.collect()
+with Session(engine) as db:
+    baseline = peak = rss()
+    exported = 0
+    for chunk in ArticleExporter.ndjson(ArticleExporter.rows(db, 1)):
+        exported += len(chunk)
+        peak = max(peak, rss())
+print(peak - baseline, exported)
+"""
+
+
+def export_growth(rows, tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-c", MEMORY_PROBE, str(rows), str(tmp_path / f"export_{rows}.db")],
+        cwd=SERVER_DIR, capture_output=True, text=True, check=True,
+    )
+    growth, exported = map(int, result.stdout.split())
+    return growth, exported
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="reads VmRSS from /proc")
+def test_export_memory_stays_flat_as_rows_grow(tmp_path):
+    small_growth, small_bytes = export_growth(1000, tmp_path)
+    large_growth, large_bytes = export_growth(8000, tmp_path)
+
+    assert large_bytes > 7 * small_bytes
+    # Eight times the rows (about 32 MB of output) for a few MB more resident memory at most
+    assert large_growth - small_growth < 8 * 1024 * 1024
+    assert large_growth < large_bytes / 4
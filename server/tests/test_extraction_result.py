@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime
+import json
+from unittest.mock import patch
+import pytest
+from app.services.advanced_extractor import AdvancedNewsExtractor
+from app.services.extraction_result import HEAVY_SECTIONS, ExtractedArticle, ExtractionFailure
+
+ARTICLE_HTML = """
+<html lang="tr">
+<head>
+  <meta property="og:title" content="Başlık">
+  <script type="application/ld+json">{"@type": "NewsArticle", "headline": "Başlık"}</script>
+</head>
+<body><p>Haber metni.</p><video src="https://cdn.example.com/a.mp4"></video><video src="https://cdn.example.com/b.mp4"></video></body>
+</html>
+"""
+
+
+def extract(include=frozenset()):
+    basic = ExtractedArticle(title="Başlık", content="Haber metni burada.")
+    with patch("app.services.news_extractor.NewsExtractor.extract_content", return_value=basic):
+        return asyncio.run(AdvancedNewsExtractor.extract_with_metadata(
+            "https://example.com/haber/1", html=ARTICLE_HTML, include=include
+        ))
+
+
+def test_heavy_sections_are_only_computed_on_request():
+    with patch.object(AdvancedNewsExtractor, "_extract_structured_data") as mock_structured, \
+            patch.object(AdvancedNewsExtractor, "_extract_og_metadata") as mock_og:
+        result = extract()
+    mock_structured.assert_not_called()
+    mock_og.assert_not_called()
+    assert result.og_data is None and result.structured_data is None and result.video_urls is None
+    # The first video is still picked up for the article
+    assert result.video_url == "https://cdn.example.com/a.mp4"
+    assert result.language == "tr" and result.word_count == 3
+
+    result = extract(HEAVY_SECTIONS)
+    assert result.og_data == {"title": "Başlık"}
+    assert result.structured_data == [{"@type": "NewsArticle", "headline": "Başlık"}]
+    assert len(result.video_urls) == 2
+
+
+def test_result_converts_to_article_and_json():
+    extracted = ExtractedArticle(
+        title="Başlık", content="Metin", publish_date=datetime(2024, 5, 1), tags=["ekonomi"], language="tr"
+    )
+    article = extracted.to_article("https://example.com/haber/1", user_id=7)
+    assert (article.title, article.user_id, article.meta_lang) == ("Başlık", 7, "tr")
+    assert json.loads(article.meta_keywords) == ["ekonomi"]
+    assert extracted.as_dict()["success"] and extracted.as_dict()["tags"] == ["ekonomi"]
+    assert ExtractionFailure("zaman aşımı").as_dict() == {"success": False, "error": "zaman aşımı", "retry_after": None}
+
+    # Slotted: no per-instance __dict__, and unknown attributes are refused
+    assert not hasattr(extracted, "__dict__")
+    with pytest.raises(AttributeError):
+        extracted.extra = 1
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from app.config import settings
+from app.services.advanced_extractor import AdvancedNewsExtractor
+from app.services.domain_profiles import DomainProfileStore
+from app.services.fetch_governor import AdaptiveLimit, FetchRejected, fetch_governor, parse_retry_after
+from app.services.news_extractor import NewsExtractor
+
+
+class FaultServer(ThreadingHTTPServer):
+    """Local origin whose behaviour per path is set by the test: status, delay and headers"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FaultHandler)
+        self.faults = {}
+        self.hits = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FaultHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        status, delay, headers = server.faults.get(self.path, (200, 0, {}))
+        with server.lock:
+            server.hits += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(delay)
+            body = b"<html><head><title>ok</title></head><body>ok</body></html>"
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_RATE", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_BURST", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_MAX_WAIT", 2.0)
+    # Request counts here are the governor's alone, without robots.txt lookups
+    monkeypatch.setattr(settings, "ROBOTS_ENABLED", False)
+    fetch_governor.reset()
+    server = FaultServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    fetch_governor.reset()
+
+
+def test_token_bucket_spaces_out_requests(origin, monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_RATE", 10.0)
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_BURST", 1.0)
+    fetch_governor.reset()
+
+    started = time.monotonic()
+    for _ in range(4):
+        NewsExtractor._download(f"{origin.base_url}/ok")
+    # One token up front, then one every 100 ms
+    assert time.monotonic() - started >= 0.28
+    assert origin.hits == 4
+
+
+def test_circuit_opens_after_errors_and_probes_for_recovery(origin, monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_CIRCUIT_FAILURES", 3)
+    monkeypatch.setattr(settings, "FETCH_CIRCUIT_RESET", 0.3)
+    fetch_governor.reset()
+    origin.faults["/news"] = (500, 0, {})
+    url = f"{origin.base_url}/news"
+
+    for _ in range(3):
+        with pytest.raises(requests.HTTPError):
+            NewsExtractor._download(url)
+    with pytest.raises(FetchRejected) as rejected:
+        NewsExtractor._download(url)
+    assert rejected.value.reason == "circuit_open"
+    assert origin.hits == 3
+
+    # After the reset timeout a single probe goes through and closes the circuit again
+    origin.faults.clear()
+    time.sleep(0.3)
+    assert "ok" in NewsExtractor._download(url)
+    assert fetch_governor.snapshot()[rejected.value.domain]["circuit"] == "closed"
+
+
+def test_retry_after_pauses_the_domain(origin):
+    origin.faults["/busy"] = (429, 0, {"Retry-After": "30"})
+
+    with pytest.raises(requests.HTTPError):
+        NewsExtractor._download(f"{origin.base_url}/busy")
+    # Longer than FETCH_MAX_WAIT, so the next request is refused without being sent
+    with pytest.raises(FetchRejected) as rejected:
+        NewsExtractor._download(f"{origin.base_url}/other")
+    assert rejected.value.reason == "throttled"
+    assert 28 < rejected.value.retry_after <= 30
+    assert origin.hits == 1
+
+
+def test_failed_fetch_is_not_downloaded_again(origin):
+    origin.faults["/gone"] = (500, 0, {})
+
+    extracted = asyncio.run(AdvancedNewsExtractor.extract_with_metadata(f"{origin.base_url}/gone"))
+    assert not extracted.success
+    assert origin.hits == 1
+
+
+def test_blocking_slot_refuses_event_loop_threads(origin):
+    async def download():
+        NewsExtractor._download(f"{origin.base_url}/ok")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(download())
+    assert origin.hits == 0
+
+
+def test_cancelled_waiter_does_not_break_later_releases(origin, monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_INITIAL_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "FETCH_MAX_CONCURRENCY", 1)
+    fetch_governor.reset()
+    url = f"{origin.base_url}/ok"
+    held = threading.Event()
+    done = threading.Event()
+
+    def hold_slot():
+        # Holds the only slot from a plain thread while another loop queues behind it
+        with fetch_governor.sync_slot(url) as slot:
+            held.set()
+            done.wait(2)
+            slot.status = 200
+
+    holder = threading.Thread(target=hold_slot)
+    holder.start()
+    held.wait(2)
+
+    async def cancelled_waiter():
+        async def wait_for_slot():
+            async with fetch_governor.slot(url):
+                pass
+        task = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # The waiter's loop is closed by the time the holder releases
+    asyncio.run(cancelled_waiter())
+    state = fetch_governor.state(DomainProfileStore.domain_of(url))
+    assert not state.waiters
+
+    # A wake that fails still lets the others run
+    woken = threading.Event()
+    def closed_loop_wake():
+        raise RuntimeError("Event loop is closed")
+    state.waiters.extend([closed_loop_wake, woken.set])
+    done.set()
+    holder.join(2)
+    assert woken.is_set()
+    assert state.in_flight == 0
+
+
+def test_retry_after_accepts_http_dates():
+    now = time.time()
+    assert parse_retry_after("120") == 120
+    assert 59 <= parse_retry_after(formatdate(now + 60, usegmt=True), now=now) <= 60
+    assert parse_retry_after("soon") is None
+
+
+def test_concurrency_per_domain_is_capped(origin, monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_INITIAL_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "FETCH_MAX_CONCURRENCY", 2)
+    fetch_governor.reset()
+    origin.faults["/slow"] = (200, 0.1, {})
+
+    async def fetch_all():
+        return await asyncio.gather(*[AdvancedNewsExtractor._fetch_html(f"{origin.base_url}/slow") for _ in range(6)])
+
+    pages = asyncio.run(fetch_all())
+    assert len(pages) == 6
+    assert origin.max_active == 2
+
+
+def test_read_timeout_fails_fast(origin, monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_READ_TIMEOUT", 0.2)
+    origin.faults["/hang"] = (200, 1.0, {})
+
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(AdvancedNewsExtractor._fetch_html(f"{origin.base_url}/hang"))
+    assert time.monotonic() - started < 0.9
+
+
+def test_adaptive_limit_follows_latency():
+    limit = AdaptiveLimit(initial=2, minimum=1, maximum=8, tolerance=2.0)
+    for _ in range(20):
+        limit.record(0.05, failed=False)
+    assert limit.limit > 4
+
+    grown = limit.limit
+    for _ in range(3):
+        limit.record(0.5, failed=False)
+    assert limit.limit < grown / 2
+
+    limit.record(None, failed=True)
+    assert limit.limit >= 1
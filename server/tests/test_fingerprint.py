@@ -0,0 +1,89 @@
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.models.news import NewsArticle
+from app.services.fingerprint import FingerprintService
+from app.services.ingest import ArticleIngest
+from tests.test_auth import setup_database
+from tests.test_news import get_auth_token
+from app.services.extraction_result import ExtractedArticle
+
+client = TestClient(app)
+
+WIRE_STORY = (
+    "Ankara'da bugün gerçekleştirilen toplantıda ekonomi yönetimi yeni dönemin yol haritasını kamuoyuyla paylaştı. "
+    "Toplantıya bakanlar, merkez bankası yetkilileri ve iş dünyasının temsilcileri katıldı. Açıklamada enflasyonla "
+    "mücadelenin öncelikli hedef olmaya devam edeceği vurgulandı. Yetkililer sıkı para politikasının yılın ikinci "
+    "yarısında da sürdürüleceğini belirtti. İş dünyası temsilcileri ise kredi koşullarının esnetilmesi gerektiğini dile getirdi. "
+    "Özellikle küçük ve orta ölçekli işletmelerin finansmana erişimde zorlandığı ifade edildi. Uzmanlar alınan kararların "
+    "piyasalar üzerindeki etkisinin önümüzdeki haftalarda daha net görüleceğini söyledi. Borsa İstanbul günü yükselişle "
+    "tamamladı ve bankacılık endeksi yüzde iki değer kazandı. Toplantının ardından yapılan basın açıklamasında ihracatçılara "
+    "yönelik yeni destek paketinin de yakında duyurulacağı bildirildi. Paketin vergi indirimleri, ucuz kredi imkanları ve "
+    "yeni pazarlara açılmak isteyen firmalara danışmanlık desteği içereceği belirtildi. Sanayi odası başkanı yaptığı "
+    "değerlendirmede adımların doğru yönde olduğunu ancak uygulamanın hızlı olması gerektiğini vurguladı. Sendikalar ise "
+    "asgari ücret görüşmelerinin de bu çerçevede ele alınmasını talep etti. Ekonomistler cari açıktaki daralmanın sürmesi "
+    "halinde kurdaki oynaklığın azalacağını ve yatırım ortamının iyileşeceğini öngörüyor."
+)
+REPUBLISHED = "Son dakika: " + WIRE_STORY + " Haberin devamı için takipte kalın."
+UNRELATED = (
+    "Milli takım hazırlık maçında rakibini iki golle mağlup etti. Teknik direktör maçın ardından yaptığı açıklamada "
+    "oyuncularının performansından memnun olduğunu söyledi. Takım kampa yarın başlayacak ve ilk resmi maçını gelecek "
+    "hafta deplasmanda oynayacak. Taraftarlar stadyumu doldurdu ve maç boyunca takımlarını destekledi."
+)
+
+def test_minhash_separates_copies_from_other_stories():
+    original = FingerprintService.minhash(WIRE_STORY)
+    copy = FingerprintService.minhash(REPUBLISHED)
+    other = FingerprintService.minhash(UNRELATED)
+    
+    assert FingerprintService.similarity(original, copy) >= 0.8
+    assert set(FingerprintService.band_keys(original)) & set(FingerprintService.band_keys(copy))
+    assert FingerprintService.similarity(original, other) < 0.2
+    assert not set(FingerprintService.band_keys(original)) & set(FingerprintService.band_keys(other))
+    assert FingerprintService.minhash("çok kısa metin") is None
+
+def extracted(content, image_url):
+    return ExtractedArticle(
+        title="Haber",
+        content=content,
+        image_url=image_url
+    )
+
+@patch('app.services.media_processor.MediaProcessor.add_watermark')
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor.extract_with_metadata')
+def test_near_duplicate_is_linked_and_skips_media(mock_extract, mock_watermark, setup_database):
+    token = get_auth_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    mock_watermark.return_value = "static/images/watermarked.jpg"
+    
+    mock_extract.return_value = extracted(WIRE_STORY, "https://a.example.com/photo.jpg")
+    first = client.post("/api/news/extract", json={"url": "https://a.example.com/1"}, headers=headers).json()
+    assert first["duplicate_of_id"] is None
+    
+    mock_extract.return_value = extracted(WIRE_STORY + " Kaynak: AA", "https://a.example.com/photo.jpg")
+    second = client.post("/api/news/extract", json={"url": "https://b.example.com/2"}, headers=headers).json()
+    assert second["duplicate_of_id"] == first["id"]
+    assert second["processed_image_url"] == "static/images/watermarked.jpg"
+    assert mock_watermark.call_count == 1
+    
+    mock_extract.return_value = extracted(UNRELATED, None)
+    third = client.post("/api/news/extract", json={"url": "https://c.example.com/3"}, headers=headers).json()
+    assert third["duplicate_of_id"] is None
+
+def test_copy_of_an_unprocessed_original_is_queued_itself(monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_PROCESSING", "worker")
+    monkeypatch.setattr(settings, "SKIP_MEDIA_FOR_DUPLICATES", True)
+    original = NewsArticle(url="https://a.example.com/1", image_url="https://a.example.com/photo.jpg")
+    copy = NewsArticle(url="https://b.example.com/2", image_url="https://a.example.com/photo.jpg")
+    
+    # The original's watermark is still waiting for the media worker
+    assert ArticleIngest.process_media(copy, original) is True
+    
+    original.processed_image_url = "static/images/watermarked.jpg"
+    assert ArticleIngest.process_media(copy, original) is False
+    assert copy.processed_image_url == "static/images/watermarked.jpg"
+    
+    # Copies with an image of their own are still not processed
+    other = NewsArticle(url="https://c.example.com/3", image_url="https://c.example.com/other.jpg")
+    assert ArticleIngest.process_media(other, original) is False and other.processed_image_url is None
@@ -0,0 +1,90 @@
+import asyncio
+import signal
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from uvicorn.config import Config
+from app.config import settings
+from app.main import app
+from app.lifecycle import InFlight, in_flight
+from app.worker import DrainingServer
+from tests.test_auth import setup_database
+
+client = TestClient(app)
+
+def test_liveness():
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+@patch("app.api.health._check_task_queue", return_value="ok")
+def test_readiness_checks_database_and_queue(mock_queue, setup_database, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_PROCESSING", "worker")
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"] == {"database": "ok", "task_queue": "ok"}
+    
+    mock_queue.return_value = "error: connection refused"
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+
+@patch("app.api.health._check_task_queue", return_value="error: connection refused")
+def test_readiness_ignores_the_queue_when_nothing_is_sent_to_it(mock_queue, setup_database, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RUNNER", "inline")
+    monkeypatch.setattr(settings, "MEDIA_PROCESSING", "inline")
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"] == {"database": "ok"}
+    mock_queue.assert_not_called()
+    
+    monkeypatch.setattr(settings, "JOB_RUNNER", "celery")
+    assert client.get("/health/ready").status_code == 503
+
+@patch("app.api.health._check_task_queue", return_value="ok")
+def test_readiness_fails_while_draining(mock_queue, setup_database):
+    in_flight.draining = True
+    try:
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["draining"] is True
+    finally:
+        in_flight.draining = False
+
+def test_drain_waits_for_tracked_work():
+    async def scenario():
+        tracker = InFlight()
+        with tracker.track():
+            assert await tracker.drain(0.01) is False
+            assert tracker.draining
+        
+        finished = []
+        async def extraction():
+            with tracker.track():
+                await asyncio.sleep(0.05)
+                finished.append(True)
+        task = asyncio.create_task(extraction())
+        await asyncio.sleep(0)
+        assert await tracker.drain(1) is True
+        assert finished == [True]
+        await task
+    
+    asyncio.run(scenario())
+
+def test_sigterm_reports_unready_before_the_server_stops(monkeypatch):
+    monkeypatch.setattr(settings, "SHUTDOWN_READY_DELAY", 0.05)
+    monkeypatch.setattr(in_flight, "draining", False)
+    
+    async def scenario():
+        server = DrainingServer(Config(app=app))
+        server.handle_exit(signal.SIGTERM, None)
+        # Still serving, but readiness already fails
+        assert in_flight.draining and not server.should_exit
+        await asyncio.sleep(0.1)
+        assert server.should_exit
+        
+        # A second SIGTERM doesn't wait
+        other = DrainingServer(Config(app=app))
+        other.handle_exit(signal.SIGTERM, None)
+        assert other.should_exit
+    
+    asyncio.run(scenario())
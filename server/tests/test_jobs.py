@@ -0,0 +1,151 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.models.job import ExtractionJob
+from app.services.jobs import JobService, job_runner
+from tests.test_auth import setup_database, TestingSessionLocal
+from tests.test_news import get_auth_token
+from app.services.extraction_result import ExtractedArticle
+
+client = TestClient(app)
+
+EXTRACTED = ExtractedArticle(
+    title="Kuyruktan gelen haber",
+    content="İşlenen haberin metni"
+)
+
+def submit(headers, url="https://example.com/news/1"):
+    with patch.object(job_runner, "schedule") as mock_schedule:
+        response = client.post("/api/news/jobs", json={"url": url}, headers=headers)
+    assert response.status_code == 202
+    return response.json(), mock_schedule
+
+def run_job(job_id):
+    with patch.object(job_runner, "session_factory", TestingSessionLocal):
+        asyncio.run(job_runner.run(job_id))
+
+def test_normalized_urls_share_an_idempotency_key():
+    key = JobService.idempotency_key(1, "https://Example.com:443/news/1?b=2&a=1&utm_source=x#top")
+    assert key == JobService.idempotency_key(1, "https://example.com/news/1?a=1&b=2")
+    assert key != JobService.idempotency_key(2, "https://example.com/news/1?a=1&b=2")
+    assert key != JobService.idempotency_key(1, "https://example.com/news/2?a=1&b=2")
+
+def test_resubmitting_returns_the_existing_job(setup_database):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    first, mock_schedule = submit(headers)
+    assert first["state"] == "queued"
+    mock_schedule.assert_called_once_with(first["id"])
+
+    again, mock_schedule = submit(headers, "https://example.com/news/1?utm_medium=social")
+    assert again["id"] == first["id"]
+    mock_schedule.assert_not_called()
+
+def test_only_one_worker_claims_a_job(setup_database):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    job, _ = submit(headers)
+    db = TestingSessionLocal()
+    try:
+        assert JobService.claim(db, job["id"], "worker-a")
+        assert not JobService.claim(db, job["id"], "worker-b")
+        assert not JobService.advance(db, job["id"], "worker-b", "parsing")
+    finally:
+        db.close()
+
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor.extract_with_metadata')
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor._fetch_html')
+def test_job_runs_to_done_and_streams_its_state(mock_fetch, mock_extract, setup_database):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    mock_fetch.return_value = "<html><body>haber</body></html>"
+    mock_extract.return_value = EXTRACTED
+    job, _ = submit(headers)
+
+    run_job(job["id"])
+
+    # The page is downloaded once and the download is reused for parsing, off the event loop
+    mock_extract.assert_called_once_with(job["url"], html=mock_fetch.return_value, executor=job_runner.parse_executor())
+    done = client.get(f"/api/news/jobs/{job['id']}", headers=headers).json()
+    assert done["state"] == "done" and done["attempts"] == 1
+    article = client.get(f"/api/news/{done['article_id']}", headers=headers).json()
+    assert article["title"] == EXTRACTED.title
+
+    stream = client.get(
+        f"/api/news/jobs/{job['id']}/events",
+        headers={**headers, "Accept": "text/event-stream", "Accept-Encoding": "gzip"}
+    )
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in stream.headers
+    assert stream.text.startswith("data: ") and '"state":"done"' in stream.text
+
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor._fetch_html')
+def test_fetch_errors_are_retried_with_backoff_then_fail(mock_fetch, setup_database, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    mock_fetch.side_effect = OSError("connection reset")
+    job, _ = submit(headers)
+
+    with patch.object(job_runner, "schedule") as mock_schedule:
+        run_job(job["id"])
+    mock_schedule.assert_called_once_with(job["id"], settings.JOB_RETRY_BACKOFF)
+    queued = client.get(f"/api/news/jobs/{job['id']}", headers=headers).json()
+    assert queued["state"] == "queued" and queued["attempts"] == 1
+    assert "connection reset" in queued["error"]
+
+    # Not due yet, so no worker can claim it
+    run_job(job["id"])
+    assert mock_fetch.call_count == 1
+
+    db = TestingSessionLocal()
+    db.query(ExtractionJob).update({ExtractionJob.next_attempt_at: ExtractionJob.created_at})
+    db.commit()
+    db.close()
+    with patch.object(job_runner, "schedule") as mock_schedule:
+        run_job(job["id"])
+    mock_schedule.assert_not_called()
+    failed = client.get(f"/api/news/jobs/{job['id']}", headers=headers).json()
+    assert failed["state"] == "failed" and failed["attempts"] == 2
+
+    # Submitting a failed URL again starts it over
+    again, mock_schedule = submit(headers)
+    assert again["id"] == job["id"] and again["state"] == "queued" and again["attempts"] == 0
+    mock_schedule.assert_called_once_with(job["id"])
+
+def test_jobs_are_private(setup_database):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    job, _ = submit(headers)
+    client.post("/api/auth/register", json={"username": "other", "email": "other@example.com", "password": "otherpassword"})
+    token = client.post("/api/auth/token", data={"username": "other", "password": "otherpassword"}).json()["access_token"]
+    response = client.get(f"/api/news/jobs/{job['id']}", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 404
+
+def test_only_stalled_jobs_are_recovered(setup_database, monkeypatch):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    fresh, _ = submit(headers, "https://example.com/news/fresh")
+    lost, _ = submit(headers, "https://example.com/news/lost")
+    dead, _ = submit(headers, "https://example.com/news/dead")
+    running, _ = submit(headers, "https://example.com/news/running")
+    db = TestingSessionLocal()
+    try:
+        assert JobService.claim(db, dead["id"], "worker-a")
+        assert JobService.claim(db, running["id"], "worker-b")
+        long_ago = datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS + 1)
+        db.get(ExtractionJob, lost["id"]).next_attempt_at = long_ago
+        db.get(ExtractionJob, dead["id"]).claimed_at = long_ago
+        db.commit()
+    finally:
+        db.close()
+    
+    # Fresh queued jobs are still on their way through the queue; live leases are left alone
+    monkeypatch.setattr(job_runner, "session_factory", TestingSessionLocal)
+    with patch.object(job_runner, "schedule") as mock_schedule:
+        assert job_runner.recover() == 2
+    assert sorted(call.args[0] for call in mock_schedule.call_args_list) == sorted([lost["id"], dead["id"]])
+    
+    # With Celery, beat sends the stalled jobs to the extract queue
+    monkeypatch.setattr(settings, "JOB_RUNNER", "celery")
+    with patch("app.services.task_queue.run_extraction_job.apply_async") as mock_send:
+        from app.services.task_queue import recover_extraction_jobs
+        recover_extraction_jobs.apply()
+    assert mock_send.call_count == 2
@@ -0,0 +1,24 @@
+from app.services.language_detector import LanguageDetector
+
+TURKISH = "İstanbul'da etkili olan sağanak yağış nedeniyle birçok ilçede su baskınları yaşandı. Belediye ekipleri sabahın erken saatlerinden itibaren çalışmalarını sürdürüyor."
+ENGLISH = "City officials approved a new transit plan on Tuesday that will add three bus rapid transit lines and extend light rail service to the airport."
+
+def test_detects_turkish_deterministically():
+    results = {LanguageDetector().detect(TURKISH) for _ in range(5)}
+    assert results == {"tr"}
+
+def test_samples_bounded_prefix():
+    detector = LanguageDetector(sample_chars=200)
+    long_text = " ".join([TURKISH] * 50) + " " + " ".join([ENGLISH] * 200)
+    assert detector.detect(long_text) == "tr"
+
+def test_results_are_cached_by_content():
+    detector = LanguageDetector()
+    assert detector.detect(ENGLISH) == "en"
+    detector._detect_sample = lambda sample: "xx"
+    assert detector.detect(ENGLISH) == "en"
+    assert detector.detect(TURKISH) == "xx"
+
+def test_detect_many_matches_single_calls():
+    detector = LanguageDetector()
+    assert detector.detect_many([TURKISH, "", ENGLISH, TURKISH, None]) == ["tr", None, "en", "tr", None]
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.models.news import NewsArticle
+from tests.test_auth import TestingSessionLocal, setup_database
+from tests.test_news import PAGE, get_auth_token
+from app.services.extraction_result import ExtractedArticle
+
+client = TestClient(app)
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries only extraction or media work needs; none of them may load with the API
+HEAVY_MODULES = ["PIL", "moviepy", "numpy", "imageio", "newspaper", "nltk", "aiohttp", "bs4", "lxml", "celery"]
+
+def loaded_after_import(module):
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def test_api_import_skips_heavy_libraries():
+    assert loaded_after_import("app.main") == []
+
+def test_task_queue_import_skips_media_libraries():
+    assert loaded_after_import("app.services.task_queue") == ["celery"]
+
+@patch('app.services.media_processor.MediaProcessor.add_watermark')
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor._fetch_page', return_value=PAGE)
+@patch('app.services.news_extractor.NewsExtractor.extract_content')
+def test_worker_mode_queues_watermark(mock_extract, mock_fetch, mock_watermark, setup_database, monkeypatch):
+    from app.services import task_queue
+    
+    monkeypatch.setattr(settings, "MEDIA_PROCESSING", "worker")
+    token = get_auth_token()
+    mock_extract.return_value = ExtractedArticle(
+        title="Görselli haber",
+        content="İçerik",
+        image_url="https://example.com/image.jpg"
+    )
+    
+    with patch.object(task_queue.watermark_article_image, "delay") as mock_delay:
+        response = client.post(
+            "/api/news/extract",
+            json={"url": "https://example.com/gorsel"},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    
+    assert response.status_code == 200
+    assert response.json()["processed_image_url"] is None
+    mock_watermark.assert_not_called()
+    mock_delay.assert_called_once_with(response.json()["id"], "https://example.com/image.jpg", settings.WATERMARK_TEXT)
+    
+    # The media worker then stores the processed image on the article
+    mock_watermark.return_value = "static/images/watermarked_test.jpg"
+    with patch.object(task_queue, "SessionLocal", TestingSessionLocal):
+        task_queue.watermark_article_image(response.json()["id"], "https://example.com/image.jpg", "text")
+    
+    db = TestingSessionLocal()
+    try:
+        assert db.get(NewsArticle, response.json()["id"]).processed_image_url == "static/images/watermarked_test.jpg"
+    finally:
+        db.close()
+
+def test_preload_loads_and_freezes_extraction_assets():
+    code = (
+        "import gc; from app.services.preload import SharedAssets; SharedAssets.preload(); "
+        "from newspaper.text import StopWords; from app.services.language_detector import language_detector; "
+        "print(gc.get_freeze_count() > 0, gc.isenabled(), 'tr' in StopWords._cached_stop_words, "
+        "language_detector._factory is not None)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["True"] * 4
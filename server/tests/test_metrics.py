@@ -0,0 +1,30 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.metrics import Histogram, stage, extraction_stage_seconds
+
+client = TestClient(app)
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test histogram", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "parse")
+    histogram.observe(0.5, "parse")
+    histogram.observe(5.0, "parse")
+    
+    lines = histogram.samples()
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="parse"} 3' in lines
+
+def test_metrics_endpoint_exposes_stages_and_requests():
+    with stage("newspaper_parse", "https://www.example.com/news/1"):
+        pass
+    client.get("/")
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'extraction_stage_seconds_count{stage="newspaper_parse",domain="example.com"}' in body
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in body
+    assert "# TYPE db_pool_connections gauge" in body
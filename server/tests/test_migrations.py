@@ -0,0 +1,97 @@
+import json
+import sqlite3
+from sqlalchemy import create_engine, inspect, text
+from app.migrations.runner import BatchedBackfill, current_version, run_migrations
+from app.migrations import m0012_fold_tags
+from app.migrations.versions import MIGRATIONS
+
+LATEST = MIGRATIONS[-1].VERSION
+
+def legacy_database(path):
+    """Schema as created before meta fields, search, fingerprints and tags existed"""
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR, email VARCHAR, hashed_password VARCHAR, created_at DATETIME);
+        CREATE TABLE news_articles (
+            id INTEGER PRIMARY KEY, url VARCHAR NOT NULL, title VARCHAR, content TEXT, publish_date DATETIME,
+            image_url VARCHAR, processed_image_url VARCHAR, video_url VARCHAR, processed_video_url VARCHAR,
+            user_id INTEGER, created_at DATETIME
+        );
+        INSERT INTO users (id, username, email, hashed_password) VALUES (1, 'u', 'u@example.com', 'x');
+    """)
+    connection.close()
+
+def test_fresh_database_is_created_and_stamped(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert run_migrations(engine) == LATEST
+    with engine.connect() as connection:
+        assert current_version(connection) == LATEST
+        assert "news_articles_fts" in inspect(connection).get_table_names()
+    # Second start only reads schema_version
+    assert run_migrations(engine) == LATEST
+
+def test_legacy_database_is_upgraded_with_batched_backfill(tmp_path):
+    path = tmp_path / "legacy.db"
+    legacy_database(path)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE news_articles ADD COLUMN meta_keywords TEXT")
+        for i in range(1, 8):
+            connection.execute(
+                text("INSERT INTO news_articles (id, url, title, content, meta_keywords, user_id) VALUES (:id, 'u', 't', 'deprem haberi', :kw, 1)"),
+                {"id": i, "kw": json.dumps(["ekonomi", f"etiket{i % 2}"])},
+            )
+    
+    assert run_migrations(engine, batch_size=3, pause=0) == LATEST
+    
+    with engine.connect() as connection:
+        columns = [c["name"] for c in inspect(connection).get_columns("news_articles")]
+        assert "meta_lang" in columns
+        assert "content" not in columns
+        assert connection.exec_driver_sql("SELECT count(*) FROM article_bodies").scalar() == 7
+        assert connection.exec_driver_sql("SELECT count(*) FROM article_tags").scalar() == 14
+        assert connection.exec_driver_sql("SELECT count(*) FROM tags").scalar() == 3
+        assert connection.exec_driver_sql("SELECT count(*) FROM news_articles_fts WHERE news_articles_fts MATCH 'deprem'").scalar() == 7
+        assert connection.exec_driver_sql("SELECT count(*) FROM migration_progress").scalar() == 0
+
+def test_case_variant_tags_are_merged(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tags.db'}")
+    run_migrations(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO users (id, username, email, hashed_password) VALUES (1, 'u', 'u@example.com', 'x')")
+        connection.exec_driver_sql("INSERT INTO news_articles (id, url, user_id) VALUES (1, 'a', 1), (2, 'b', 1)")
+        connection.exec_driver_sql("INSERT INTO tags (id, name) VALUES (1, 'Ekonomi'), (2, 'ekonomi'), (3, 'EKONOMİ'), (4, 'Spor')")
+        connection.exec_driver_sql("INSERT INTO article_tags (article_id, tag_id) VALUES (1, 1), (1, 2), (2, 3), (2, 4)")
+        m0012_fold_tags.upgrade(connection)
+    
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT id, name FROM tags ORDER BY id").all() == [(2, "ekonomi"), (4, "spor")]
+        assert connection.exec_driver_sql("SELECT article_id, tag_id FROM article_tags ORDER BY article_id, tag_id").all() == [(1, 2), (2, 2), (2, 4)]
+
+def test_backfill_resumes_after_last_committed_batch(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'resume.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY, done INTEGER DEFAULT 0)")
+        connection.exec_driver_sql("INSERT INTO items (id) VALUES (1), (2), (3), (4), (5)")
+    
+    fetch = lambda session, after_id, limit: session.execute(
+        text("SELECT id FROM items WHERE id > :after ORDER BY id LIMIT :limit"), {"after": after_id, "limit": limit}
+    ).all()
+    
+    def crash_on_four(session, rows):
+        if any(row.id == 4 for row in rows):
+            raise RuntimeError("worker killed")
+        session.execute(text("UPDATE items SET done = done + 1 WHERE id <= :id"), {"id": rows[-1].id})
+    
+    backfill = BatchedBackfill("items", batch_size=2, pause=0)
+    try:
+        backfill.run(engine, fetch, crash_on_four)
+    except RuntimeError:
+        pass
+    
+    def mark(session, rows):
+        session.execute(text("UPDATE items SET done = done + 1 WHERE id >= :first AND id <= :last"), {"first": rows[0].id, "last": rows[-1].id})
+    
+    assert backfill.run(engine, fetch, mark) == 3
+    with engine.connect() as connection:
+        assert [row.done for row in connection.exec_driver_sql("SELECT done FROM items ORDER BY id")] == [1, 1, 1, 1, 1]
@@ -3,9 +3,14 @@ from fastapi.testclient import TestClient
 from app.main import app
 from tests.test_auth import override_get_db, setup_database
 from unittest.mock import patch, MagicMock
+from app.services.extraction_result import ExtractedArticle, ExtractionFailure
+from app.services.page_fetch import FetchedPage
 
 client = TestClient(app)
 
+# Stands in for the download, so extraction reaches the mocked newspaper step without network access
+PAGE = FetchedPage("https://example.com/news", 200, "utf-8", "<html><head></head><body></body></html>")
+
 def get_auth_token():
     # Register and login user
     client.post(
@@ -26,18 +31,17 @@ def get_auth_token():
     )
     return login_response.json()["access_token"]
 
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor._fetch_page', return_value=PAGE)
 @patch('app.services.news_extractor.NewsExtractor.extract_content')
-def test_extract_news_success(mock_extract, setup_database):
+def test_extract_news_success(mock_extract, mock_fetch, setup_database):
     token = get_auth_token()
     
     # Mock successful extraction
-    mock_extract.return_value = {
-        "title": "Test News Title",
-        "content": "Test news content",
-        "publish_date": None,
-        "image_url": "https://example.com/image.jpg",
-        "success": True
-    }
+    mock_extract.return_value = ExtractedArticle(
+        title="Test News Title",
+        content="Test news content",
+        image_url="https://example.com/image.jpg"
+    )
     
     response = client.post(
         "/api/news/extract",
@@ -50,15 +54,13 @@ def test_extract_news_success(mock_extract, setup_database):
     assert data["title"] == "Test News Title"
     assert data["url"] == "https://example.com/news"
 
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor._fetch_page', return_value=PAGE)
 @patch('app.services.news_extractor.NewsExtractor.extract_content')
-def test_extract_news_failure(mock_extract, setup_database):
+def test_extract_news_failure(mock_extract, mock_fetch, setup_database):
     token = get_auth_token()
     
     # Mock failed extraction
-    mock_extract.return_value = {
-        "error": "Failed to extract content",
-        "success": False
-    }
+    mock_extract.return_value = ExtractionFailure("Failed to extract content")
     
     response = client.post(
         "/api/news/extract",
@@ -87,18 +89,51 @@ def test_get_user_news(setup_database):
     assert response.status_code == 200
     assert response.json() == []
 
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor._fetch_page', return_value=PAGE)
 @patch('app.services.news_extractor.NewsExtractor.extract_content')
-def test_delete_news(mock_extract, setup_database):
+def test_news_list_omits_content(mock_extract, mock_fetch, setup_database):
+    token = get_auth_token()
+    
+    mock_extract.return_value = ExtractedArticle(
+        title="Listed News",
+        content="Long article body"
+    )
+    news_id = client.post(
+        "/api/news/extract",
+        json={"url": "https://example.com/listed"},
+        headers={"Authorization": f"Bearer {token}"}
+    ).json()["id"]
+    
+    response = client.get(
+        "/api/news/",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    [item] = response.json()
+    assert item["id"] == news_id
+    assert item["title"] == "Listed News"
+    assert item["duplicate_of_id"] is None
+    assert "content" not in item
+    
+    # The body is still served by the detail view
+    detail = client.get(
+        f"/api/news/{news_id}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert detail.json()["content"] == "Long article body"
+
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor._fetch_page', return_value=PAGE)
+@patch('app.services.news_extractor.NewsExtractor.extract_content')
+def test_delete_news(mock_extract, mock_fetch, setup_database):
     token = get_auth_token()
     
     # Mock successful extraction
-    mock_extract.return_value = {
-        "title": "Test News",
-        "content": "Content",
-        "publish_date": None,
-        "image_url": None,
-        "success": True
-    }
+    mock_extract.return_value = ExtractedArticle(
+        title="Test News",
+        content="Content"
+    )
     
     # Add news
     add_response = client.post(
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+from app.config import settings
+from app.services.advanced_extractor import AdvancedNewsExtractor
+from app.services.extraction_result import HEAVY_SECTIONS, ExtractedArticle
+from app.services.fetch_governor import fetch_governor
+from app.services.page_fetch import PageFetcher, PageReader, PageRejected, detect_charset
+
+HEAD = (
+    '<html lang="tr"><head><meta charset="iso-8859-9">'
+    '<meta property="og:title" content="Şehir Haberleri">'
+    '<script type="application/ld+json">{"@type": "NewsArticle", "headline": "Güneşli gün"}</script>'
+    '</head>'
+)
+BODY = "<body><p>" + "Çarşıda öğle saatlerinde yoğunluk yaşandı. " * 200 + "</p></body></html>"
+
+
+class StreamingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def send_chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/article":
+            # Head first, the body after a pause, like a slow origin rendering the page
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.send_chunk(HEAD.encode("iso-8859-9"))
+            time.sleep(0.3)
+            self.send_chunk(BODY.encode("iso-8859-9"))
+            self.send_chunk(b"")
+        elif self.path == "/endless":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk = b"<p>" + b"x" * 16000 + b"</p>"
+            try:
+                for _ in range(10000):
+                    self.send_chunk(chunk)
+            except OSError:
+                pass
+        elif self.path == "/huge":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(50 * 1024 * 1024))
+            self.end_headers()
+        elif self.path == "/robots.txt":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/image":
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            time.sleep(2)
+            self.wfile.write(b"\xff" * 100)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_RATE", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_BURST", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_MAX_BYTES", 256 * 1024)
+    fetch_governor.reset()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StreamingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    fetch_governor.reset()
+
+
+def test_charset_is_detected_once_from_headers_and_prefix():
+    assert detect_charset("text/html; charset=ISO-8859-9", b"") == "iso8859-9"
+    assert detect_charset("text/html", b'<meta charset="windows-1254">') == "cp1254"
+    assert detect_charset(None, "Çarşı".encode("utf-8")[:-1]) == "utf-8"
+
+
+def test_head_is_parsed_before_the_body_arrives(origin):
+    seen = {}
+
+    def on_head(head):
+        seen["at"] = time.monotonic()
+        return head.count("og:title")
+
+    page = asyncio.run(PageFetcher.fetch(f"{origin}/article", on_head=on_head))
+    finished = time.monotonic()
+
+    assert page.charset == "iso8859-9"
+    assert "Çarşıda öğle" in page.html and not page.truncated
+    assert page.head.endswith("</script>") and page.head_result == 1
+    assert finished - seen["at"] >= 0.25
+
+
+def test_endless_body_is_cut_at_the_byte_cap(origin):
+    page = PageFetcher.fetch_sync(f"{origin}/endless")
+    assert page.truncated
+    assert len(page.html) == settings.FETCH_MAX_BYTES
+
+    page = asyncio.run(PageFetcher.fetch(f"{origin}/endless"))
+    assert page.truncated
+    assert len(page.html) == settings.FETCH_MAX_BYTES
+
+
+def test_oversized_and_non_html_responses_are_refused_before_reading(origin):
+    with pytest.raises(PageRejected, match="too large"):
+        asyncio.run(PageFetcher.fetch(f"{origin}/huge"))
+
+    started = time.monotonic()
+    with pytest.raises(PageRejected, match="image/jpeg"):
+        PageFetcher.fetch_sync(f"{origin}/image")
+    assert time.monotonic() - started < 1.5
+
+
+def test_extractor_uses_the_early_head_metadata(origin):
+    basic = ExtractedArticle(title="Başlık", content="İçerik")
+    with patch("app.services.news_extractor.NewsExtractor.extract_content", return_value=basic) as mock_extract:
+        result = asyncio.run(AdvancedNewsExtractor.extract_with_metadata(f"{origin}/article", include=HEAVY_SECTIONS))
+
+    # newspaper gets the page that was already downloaded
+    assert "Çarşıda öğle" in mock_extract.call_args.kwargs["html"]
+    assert result.og_data == {"title": "Şehir Haberleri"}
+    assert result.structured_data == [{"@type": "NewsArticle", "headline": "Güneşli gün"}]
+    assert result.meta_lang == "tr"
+
+
+def test_reader_finds_the_head_across_chunk_boundaries():
+    html = (HEAD + BODY).encode("utf-8")
+    reader = PageReader("https://example.com", 200, "text/html; charset=utf-8", 10 ** 6, on_head=len)
+    for start in range(0, len(html), 5):
+        reader.feed(html[start:start + 5])
+    page = reader.finish()
+    assert page.head == HEAD[:HEAD.index("</head>")]
+    assert page.html == HEAD + BODY
+
+
+def test_early_head_parse_runs_on_the_parse_executor(origin):
+    basic = ExtractedArticle(title="Başlık", content="İçerik")
+    parse_head = AdvancedNewsExtractor._parse_head
+    threads = []
+
+    def recording_parse_head(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return parse_head(*args, **kwargs)
+
+    executor = ThreadPoolExecutor(1, thread_name_prefix="parse")
+    try:
+        with patch("app.services.news_extractor.NewsExtractor.extract_content", return_value=basic), \
+                patch.object(AdvancedNewsExtractor, "_parse_head", side_effect=recording_parse_head):
+            result = asyncio.run(AdvancedNewsExtractor.extract_with_metadata(
+                f"{origin}/article", executor=executor, include=HEAVY_SECTIONS
+            ))
+    finally:
+        executor.shutdown()
+
+    assert len(threads) == 1 and threads[0].startswith("parse")
+    assert result.og_data == {"title": "Şehir Haberleri"}
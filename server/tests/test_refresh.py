@@ -0,0 +1,160 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.models.news import NewsArticle
+from app.models.revision import ArticleRefresh, ArticleRevision
+from app.models.user import User
+from app.services.fetch_governor import fetch_governor
+from app.services.refresh import RefreshScheduler, RefreshService, RevisionDiff
+from tests.test_auth import TestingSessionLocal, setup_database
+from tests.test_news import get_auth_token
+
+client = TestClient(app)
+
+PARAGRAPH = "Rescue teams worked through the night after the river burst its banks near the old bridge. "
+UPDATE = "Officials later confirmed that all residents of the riverside streets had been moved to safety. "
+
+
+def page(paragraphs, comment=""):
+    body = "".join(f"<p>{text * 4}</p>" for text in paragraphs)
+    return f"<html><head><title>Flood update</title></head><body>{comment}<article><h1>Flood update</h1>{body}</article></body></html>"
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if self.path == "/robots.txt":
+            server.robots_requests += 1
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        server.validators.append(self.headers.get("If-None-Match"))
+        if server.etag and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+        body = server.page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_RATE", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_BURST", 1000.0)
+    fetch_governor.reset()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ConditionalHandler)
+    server.daemon_threads = True
+    server.validators = []
+    server.robots_requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server
+    server.shutdown()
+    server.server_close()
+    fetch_governor.reset()
+
+
+def test_revision_diffs_and_decaying_schedule():
+    first = "Giriş paragrafı.\n\nİkinci paragraf.\n\nSon paragraf."
+    second = "Giriş paragrafı.\n\nİkinci paragraf güncellendi.\n\nSon paragraf.\n\nEk bilgi."
+    edits = RevisionDiff.make(second, first)
+    assert RevisionDiff.apply(second, edits) == first
+    # Only changed lines are kept: the old second paragraph, and the last line without its newline
+    assert [line for _, _, replacement in edits for line in replacement] == ["İkinci paragraf.\n", "Son paragraf."]
+    assert RevisionDiff.decode(*RevisionDiff.encode(edits)) == edits
+
+    saved = datetime(2024, 5, 1, 12, 0)
+    assert RefreshService.next_refresh(saved, saved) == saved + timedelta(minutes=5)
+    assert RefreshService.next_refresh(saved, saved + timedelta(minutes=6)) == saved + timedelta(minutes=30)
+    # Steps missed while nothing ran are skipped rather than run back to back
+    assert RefreshService.next_refresh(saved, saved + timedelta(hours=3)) == saved + timedelta(hours=24)
+    assert RefreshService.next_refresh(saved, saved + timedelta(days=2)) is None
+
+
+def test_refresh_skips_unchanged_pages_and_records_revisions(setup_database, origin):
+    base_url, server = origin
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "testuser").one()
+        article = NewsArticle(url=f"{base_url}/haber/1", title="Sel baskını", content="İlk metin", user_id=user.id)
+        RefreshService.schedule(article)
+        db.add(article)
+        db.commit()
+        article_id = article.id
+        assert article.refresh.next_refresh_at > datetime.utcnow()
+    finally:
+        db.close()
+
+    def refresh():
+        db = TestingSessionLocal()
+        try:
+            db.query(ArticleRefresh).update({ArticleRefresh.next_refresh_at: datetime(2000, 1, 1)})
+            db.commit()
+        finally:
+            db.close()
+        return asyncio.run(RefreshScheduler.run(session_factory=TestingSessionLocal))
+
+    server.page, server.etag = page([PARAGRAPH, PARAGRAPH]), '"v1"'
+    assert refresh() == {"revised": 1}
+    # The origin knows the page by its ETag now: a 304 and nothing parsed
+    assert refresh() == {"not_modified": 1}
+    assert server.validators == [None, '"v1"']
+    # The missing robots.txt is remembered
+    assert server.robots_requests == 1
+    # Without validators, identical bytes are caught by the page hash
+    server.etag = None
+    assert refresh() == {"same_page": 1}
+    # A different page with the same article text adds no revision
+    server.page = page([PARAGRAPH, PARAGRAPH], comment="<!-- rendered 12:05 -->")
+    assert refresh() == {"unchanged": 1}
+    server.page = page([PARAGRAPH, UPDATE])
+    assert refresh() == {"revised": 1}
+    # A consent wall in place of the article leaves newspaper's placeholder; the stored text is kept
+    server.page = "<html><head><title>Çerez tercihleri</title></head><body><p>Devam etmek için onaylayın.</p></body></html>"
+    assert refresh() == {"failed": 1}
+
+    db = TestingSessionLocal()
+    try:
+        current = db.get(NewsArticle, article_id)
+        assert UPDATE.strip() in current.content and current.title == "Flood update"
+        assert [r.revision for r in db.query(ArticleRevision).order_by(ArticleRevision.revision)] == [2, 3]
+        assert db.get(ArticleRefresh, article_id).refreshes == 6
+    finally:
+        db.close()
+
+    history = client.get(f"/api/news/{article_id}/revisions", headers=headers).json()
+    assert [version["revision"] for version in history] == [3, 2, 1]
+    assert history[1]["title_changed"] and not history[0]["title_changed"]
+
+    first = client.get(f"/api/news/{article_id}/revisions/1", headers=headers).json()
+    assert first == {"revision": 1, "title": "Sel baskını", "content": "İlk metin"}
+    second = client.get(f"/api/news/{article_id}/revisions/2", headers=headers).json()
+    assert PARAGRAPH.strip() in second["content"] and UPDATE.strip() not in second["content"]
+    assert client.get(f"/api/news/{article_id}/revisions/4", headers=headers).status_code == 404
+
+    # Deleting the article takes its schedule and history with it
+    assert client.delete(f"/api/news/{article_id}", headers=headers).status_code == 200
+    db = TestingSessionLocal()
+    try:
+        assert db.query(ArticleRefresh).count() == 0 and db.query(ArticleRevision).count() == 0
+    finally:
+        db.close()
@@ -0,0 +1,132 @@
+import os
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+from app.models.article_body import ArticleBody
+from app.models.fingerprint import ArticleFingerprint, ArticleFingerprintBand
+from app.models.news import NewsArticle
+from app.models.tag import article_tags
+from app.models.user import User
+from app.services.fingerprint import FingerprintService
+from app.services.retention import ArticleDeletion, RetentionService
+from app.services.tags import TagService
+from tests.test_auth import TestingSessionLocal, setup_database
+from tests.test_news import get_auth_token
+
+client = TestClient(app)
+
+STORY = " ".join(f"kelime{i}" for i in range(40))
+
+
+def add_article(db, user_id, url, created_at, image=None, duplicate_of=None):
+    article = NewsArticle(url=url, title="Deprem haberi", content=STORY, created_at=created_at,
+                          processed_image_url=image, user_id=user_id)
+    db.add(article)
+    db.flush()
+    TagService.attach(db, article, ["gündem"])
+    db.add(FingerprintService.build(article, FingerprintService.minhash(STORY), duplicate_of))
+    db.commit()
+    return article
+
+
+def write_media(tmp_path, name):
+    os.makedirs(tmp_path / "images", exist_ok=True)
+    (tmp_path / "images" / name).write_bytes(b"jpg")
+    return f"static/images/{name}"
+
+
+def counts(db):
+    return {
+        "articles": db.query(NewsArticle).count(),
+        "bodies": db.query(ArticleBody).count(),
+        "tags": db.query(article_tags).count(),
+        "fingerprints": db.query(ArticleFingerprint).count(),
+        "bands": db.query(ArticleFingerprintBand).count(),
+        "search": db.connection().exec_driver_sql(
+            "SELECT count(*) FROM news_articles_fts WHERE news_articles_fts MATCH 'deprem'"
+        ).scalar(),
+    }
+
+
+def test_bulk_delete_removes_derived_rows_and_unused_media(setup_database, tmp_path):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    db = TestingSessionLocal()
+    try:
+        user_id = db.query(User).filter(User.username == "testuser").one().id
+        shared = write_media(tmp_path, "watermarked_shared.jpg")
+        own = write_media(tmp_path, "watermarked_own.jpg")
+        original = add_article(db, user_id, "https://haber.com/1", datetime(2024, 1, 1), image=shared)
+        add_article(db, user_id, "https://haber.com/2", datetime(2024, 1, 2), image=own)
+        # A copy keeps its original's processed image
+        add_article(db, user_id, "https://gazete.com/3", datetime(2024, 3, 1), image=shared, duplicate_of=original)
+
+        assert client.post("/api/news/bulk-delete", json={}, headers=headers).status_code == 400
+
+        with patch.object(settings, "STATIC_DIR", str(tmp_path)), patch.object(settings, "DELETE_BATCH_SIZE", 1):
+            response = client.post("/api/news/bulk-delete", json={"domain": "haber.com"}, headers=headers)
+        assert response.json() == {"deleted": 2}
+
+        db.expire_all()
+        assert counts(db) == {"articles": 1, "bodies": 1, "tags": 1, "fingerprints": 1, "bands": 10, "search": 1}
+        assert db.query(ArticleFingerprint).one().duplicate_of_id is None
+        assert not (tmp_path / "images" / "watermarked_own.jpg").exists()
+        assert (tmp_path / "images" / "watermarked_shared.jpg").exists()
+
+        with patch.object(settings, "STATIC_DIR", str(tmp_path)):
+            last_id = db.query(NewsArticle.id).scalar()
+            assert client.delete(f"/api/news/{last_id}", headers=headers).status_code == 200
+        assert not (tmp_path / "images" / "watermarked_shared.jpg").exists()
+        db.expire_all()
+        assert set(counts(db).values()) == {0}
+    finally:
+        db.close()
+
+
+def test_retention_policy_deletes_only_expired_articles(setup_database):
+    headers = {"Authorization": f"Bearer {get_auth_token()}"}
+    assert client.get("/api/news/retention", headers=headers).json() == {"retention_days": None}
+    assert client.put("/api/news/retention", json={"retention_days": 0}, headers=headers).status_code == 422
+    response = client.put("/api/news/retention", json={"retention_days": 90}, headers=headers)
+    assert response.json() == {"retention_days": 90}
+
+    db = TestingSessionLocal()
+    try:
+        user_id = db.query(User).filter(User.username == "testuser").one().id
+        other = User(username="other", email="other@example.com", hashed_password="x")
+        db.add(other)
+        db.commit()
+        now = datetime(2024, 6, 1)
+        for days in (200, 120, 91, 30):
+            add_article(db, user_id, f"https://haber.com/{days}", now - timedelta(days=days))
+        # No policy: kept regardless of age
+        add_article(db, other.id, "https://haber.com/eski", now - timedelta(days=400))
+
+        with patch.object(settings, "DELETE_BATCH_SIZE", 2), patch.object(settings, "RETENTION_BATCH_PAUSE", 0):
+            assert RetentionService.enforce(db, now=now) == 3
+            assert RetentionService.enforce(db, now=now) == 0
+        assert sorted(url for url, in db.query(NewsArticle.url)) == ["https://haber.com/30", "https://haber.com/eski"]
+    finally:
+        db.close()
+
+
+def test_orphan_media_sweep_keeps_files_in_use(setup_database, tmp_path):
+    get_auth_token()
+    db = TestingSessionLocal()
+    try:
+        user_id = db.query(User).filter(User.username == "testuser").one().id
+        used = write_media(tmp_path, "watermarked_used.jpg")
+        write_media(tmp_path, "watermarked_orphan.jpg")
+        write_media(tmp_path, "watermarked_fresh.jpg")
+        add_article(db, user_id, "https://haber.com/1", datetime(2024, 1, 1), image=used)
+        old = time.time() - 2 * 86400
+        for name in ("watermarked_used.jpg", "watermarked_orphan.jpg"):
+            os.utime(tmp_path / "images" / name, (old, old))
+
+        with patch.object(settings, "STATIC_DIR", str(tmp_path)):
+            assert ArticleDeletion.sweep_orphan_media(db) == 1
+        assert sorted(os.listdir(tmp_path / "images")) == ["watermarked_fresh.jpg", "watermarked_used.jpg"]
+    finally:
+        db.close()
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.config import settings
+from app.services.domain_profiles import DomainProfileStore
+from app.services.fetch_governor import FetchRejected, fetch_governor
+from app.services.page_fetch import PageFetcher, RobotsDisallowed
+from app.services.robots import RobotsRules, RobotsStore, robots_cache
+
+ROBOTS = """
+User-agent: *
+Disallow: /
+
+User-agent: NewsExtractor
+User-agent: OtherBot
+Disallow: /private/
+Allow: /private/press/
+Disallow: /*.pdf$
+Crawl-delay: 0.5
+"""
+
+
+class RobotsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.paths.append(self.path)
+        server.agents.append(self.headers.get("User-Agent"))
+        if self.path == "/robots.txt":
+            status, body, headers = server.robots
+        else:
+            status, body, headers = 200, "<html><head><title>ok</title></head><body>ok</body></html>", {}
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8" if self.path != "/robots.txt" else "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin(monkeypatch):
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_RATE", 1000.0)
+    monkeypatch.setattr(settings, "FETCH_DOMAIN_BURST", 1000.0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RobotsHandler)
+    server.daemon_threads = True
+    server.paths = []
+    server.agents = []
+    server.robots = (200, ROBOTS, {})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", server
+    server.shutdown()
+    server.server_close()
+
+
+def test_rules_pick_our_group_and_the_most_specific_pattern():
+    rules = RobotsRules.parse(ROBOTS, "NewsExtractor/1.0")
+    assert rules.allowed("/haber/1")
+    assert not rules.allowed("/private/notes")
+    # The longer Allow wins over the Disallow it sits under
+    assert rules.allowed("/private/press/release")
+    assert not rules.allowed("/files/report.pdf")
+    assert rules.allowed("/files/report.pdf?page=2")
+    assert rules.crawl_delay == 0.5
+
+    # Agents without a group of their own get the * group
+    assert not RobotsRules.parse(ROBOTS, "SomeCrawler").allowed("/haber/1")
+    # At equal length Allow wins; an empty Disallow allows everything
+    tie = RobotsRules.parse("User-agent: *\nDisallow: /a\nAllow: /a\nDisallow:\n", "NewsExtractor")
+    assert tie.allowed("/a")
+    assert RobotsRules.parse("User-agent: *\nCrawl-delay: 3600\n", "NewsExtractor").crawl_delay == settings.ROBOTS_MAX_CRAWL_DELAY
+
+
+def test_rules_are_fetched_once_and_crawl_delay_reaches_the_governor(origin):
+    base_url, server = origin
+    page = PageFetcher.fetch_sync(f"{base_url}/haber/1")
+    assert "ok" in page.html
+    with pytest.raises(RobotsDisallowed):
+        PageFetcher.fetch_sync(f"{base_url}/private/notes")
+    with pytest.raises(RobotsDisallowed):
+        asyncio.run(PageFetcher.fetch(f"{base_url}/private/notes"))
+    # robots.txt was read once; the disallowed page was never requested
+    assert server.paths == ["/robots.txt", "/haber/1"]
+    asyncio.run(PageFetcher.fetch(f"{base_url}/haber/2"))
+    # Pages are requested as the agent whose rules were applied
+    assert server.agents == [settings.ROBOTS_USER_AGENT] * 3
+
+    # Crawl-delay: 0.5 caps the domain at two requests a second with no burst
+    bucket = fetch_governor.state(DomainProfileStore.domain_of(base_url)).bucket
+    assert (bucket.rate, bucket.burst) == (2.0, 1.0)
+
+    # Another process finds the parsed rules in the shared store
+    robots_cache.reset()
+    fetch_governor.reset()
+    assert not asyncio.run(robots_cache.allowed(f"{base_url}/private/notes"))
+    assert server.paths.count("/robots.txt") == 1
+    assert fetch_governor.state(DomainProfileStore.domain_of(base_url)).bucket.rate == 2.0
+
+
+def test_missing_robots_allow_all_and_failing_ones_keep_the_last_rules(origin):
+    base_url, server = origin
+
+    async def lookup_together(url):
+        # Concurrent lookups for one origin share a single download
+        return await asyncio.gather(*[robots_cache.allowed(url) for _ in range(5)])
+
+    server.robots = (404, "", {})
+    assert asyncio.run(lookup_together(f"{base_url}/haber/1")) == [True] * 5
+    origin_key = robots_cache.origin(base_url)
+    _, expires = RobotsStore.load(origin_key)
+    assert expires - time.time() > settings.ROBOTS_TTL - 60
+
+    # While robots.txt fails, the expired rules stay in force for ROBOTS_ERROR_TTL
+    robots_cache.reset()
+    RobotsStore.save(origin_key, RobotsRules([(False, "/private/")]), time.time() - 1)
+    server.robots = (503, "", {})
+    assert robots_cache.allowed_sync(f"{base_url}/haber/1")
+    assert not robots_cache.allowed_sync(f"{base_url}/private/a")
+    _, expires = RobotsStore.load(origin_key)
+    assert expires - time.time() <= settings.ROBOTS_ERROR_TTL
+
+    # Without earlier rules nothing is fetched until robots.txt can be read
+    robots_cache.reset()
+    os.remove(RobotsStore._path(origin_key))
+    with pytest.raises(FetchRejected) as rejected:
+        asyncio.run(PageFetcher.fetch(f"{base_url}/haber/1"))
+    assert rejected.value.retry_after == settings.ROBOTS_ERROR_TTL
+    assert "/haber/1" not in server.paths
+
+    # A shorter max-age is honoured
+    robots_cache.reset()
+    RobotsStore.save(origin_key, RobotsRules([]), time.time() - 1)
+    server.robots = (200, "User-agent: *\nDisallow: /private/\n", {"Cache-Control": "max-age=1200"})
+    assert not robots_cache.allowed_sync(f"{base_url}/private/a")
+    _, expires = RobotsStore.load(origin_key)
+    assert 1100 < expires - time.time() <= 1200
+    assert server.paths.count("/robots.txt") == 4
@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.news import NewsArticle
+from tests.test_auth import TestingSessionLocal, setup_database
+from tests.test_news import get_auth_token
+
+client = TestClient(app)
+
+def add_articles(articles):
+    db = TestingSessionLocal()
+    try:
+        from app.models.user import User
+        user = db.query(User).filter(User.username == "testuser").first()
+        for title, content in articles:
+            db.add(NewsArticle(url="https://example.com/" + title, title=title, content=content, user_id=user.id))
+        db.commit()
+    finally:
+        db.close()
+
+def search(token, **params):
+    response = client.get("/api/news/search", params=params, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    return response.json()
+
+def test_search_ranks_and_highlights(setup_database):
+    token = get_auth_token()
+    add_articles([
+        ("Deprem bölgesinde son durum", "Deprem bölgesinde çalışmalar sürüyor."),
+        ("Ekonomi gündemi", "Merkez bankası faiz kararını açıkladı. Deprem bölgesine destek."),
+        ("Spor", "Milli takım kazandı."),
+    ])
+    
+    data = search(token, q="deprem")
+    titles = [result["title"] for result in data["results"]]
+    assert titles == ["Deprem bölgesinde son durum", "Ekonomi gündemi"]
+    assert data["results"][0]["title_highlight"].startswith("<mark>Deprem</mark>")
+    assert "<mark>" in data["results"][1]["snippet"]
+    assert data["next_cursor"] is None
+
+def test_search_keyset_pagination_and_sync(setup_database):
+    token = get_auth_token()
+    add_articles([(f"Haber {i}", "Seçim sonuçları açıklandı.") for i in range(5)])
+    
+    first = search(token, q="seçim", limit=3)
+    second = search(token, q="seçim", limit=3, cursor=first["next_cursor"])
+    ids = [r["id"] for r in first["results"]] + [r["id"] for r in second["results"]]
+    assert len(ids) == 5 and len(set(ids)) == 5
+    assert second["next_cursor"] is None
+    
+    # Triggers keep the index in sync with updates and deletes
+    db = TestingSessionLocal()
+    try:
+        article = db.get(NewsArticle, ids[1])
+        article.title = "Meclis gündemi"
+        article.content = "Bütçe görüşmeleri başladı."
+        db.commit()
+    finally:
+        db.close()
+    assert [r["id"] for r in search(token, q="bütçe")["results"]] == [ids[1]]
+    assert [r["id"] for r in search(token, q="meclis")["results"]] == [ids[1]]
+    assert len(search(token, q="secim")["results"]) == 4
+    
+    client.delete(f"/api/news/{ids[0]}", headers={"Authorization": f"Bearer {token}"})
+    assert len(search(token, q="secim")["results"]) == 3
+
+def test_search_only_matches_own_articles(setup_database):
+    token = get_auth_token()
+    add_articles([("Deprem raporu", "Deprem bölgesinde son durum.")])
+    db = TestingSessionLocal()
+    try:
+        db.add(NewsArticle(url="https://example.com/other", title="Deprem", content="Deprem haberi", user_id=999))
+        db.commit()
+    finally:
+        db.close()
+    
+    assert [r["title"] for r in search(token, q="deprem")["results"]] == ["Deprem raporu"]
+    # A user id typed as a search word doesn't match the owner column
+    assert search(token, q="999")["results"] == []
+
+def test_search_rejects_bad_cursor(setup_database):
+    token = get_auth_token()
+    response = client.get(
+        "/api/news/search",
+        params={"q": "x", "cursor": "not-a-cursor"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 400
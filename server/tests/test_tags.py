@@ -0,0 +1,41 @@
+import json
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.news import NewsArticle
+from app.models.user import User
+from app.services.tags import TagService
+from tests.test_auth import TestingSessionLocal, setup_database
+from tests.test_news import get_auth_token
+
+client = TestClient(app)
+
+def add_tagged_articles(tag_lists):
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "testuser").first()
+        for i, tags in enumerate(tag_lists):
+            article = NewsArticle(url=f"https://example.com/{i}", title=f"Haber {i}", user_id=user.id)
+            TagService.attach(db, article, tags)
+            db.add(article)
+        db.commit()
+    finally:
+        db.close()
+
+def test_normalize_and_parse_meta_keywords():
+    assert TagService.normalize(["  ekonomi ", "ekonomi", "", "merkez   bankası", None]) == ["ekonomi", "merkez bankası"]
+    assert TagService.parse_meta_keywords(json.dumps(["a", " b "])) == ["a", "b"]
+    assert TagService.parse_meta_keywords("not json") == []
+    assert TagService.normalize(["Ekonomi", "EKONOMİ", "ekonomi", "Istanbul"]) == ["ekonomi", "istanbul"]
+
+def test_tag_filtered_listing_and_top_tags(setup_database):
+    token = get_auth_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    add_tagged_articles([["Ekonomi", "faiz"], ["ekonomi"], ["spor"]])
+    
+    response = client.get("/api/news/", params={"tag": "EKONOMİ"}, headers=headers)
+    assert response.status_code == 200
+    assert sorted(article["title"] for article in response.json()) == ["Haber 0", "Haber 1"]
+    
+    response = client.get("/api/analytics/stats/tags", params={"limit": 2}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [{"tag": "ekonomi", "count": 2}, {"tag": "faiz", "count": 1}]
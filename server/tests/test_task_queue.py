@@ -0,0 +1,62 @@
+from unittest.mock import patch
+from app.services import task_queue
+from app.services.extraction_result import ExtractedArticle, ExtractionFailure
+from app.services.queues import QUEUE_PROFILES
+from app.services.task_queue import celery_app
+
+def route_of(task):
+    return celery_app.amqp.router.route({}, task.name)["queue"].name
+
+def test_tasks_are_routed_to_their_queues():
+    assert route_of(task_queue.extract_article) == "extract"
+    assert route_of(task_queue.process_image_watermark) == "image"
+    assert route_of(task_queue.watermark_article_image) == "image"
+    assert route_of(task_queue.process_video_intro) == "video"
+    # Database maintenance stays off the media queues
+    assert route_of(task_queue.enforce_retention) == "extract"
+
+def test_tasks_carry_their_queue_profile():
+    video = QUEUE_PROFILES["video"]
+    task = task_queue.process_video_intro
+    assert (task.soft_time_limit, task.time_limit) == (video.soft_time_limit, video.time_limit)
+    assert task.acks_late and task.reject_on_worker_lost
+    assert task.max_retries == video.max_retries
+    assert task_queue.watermark_article_image.ignore_result
+    # Redelivery of unacknowledged tasks must not start while one is still allowed to run
+    visibility = celery_app.conf.broker_transport_options["visibility_timeout"]
+    assert all(visibility > profile.time_limit for profile in QUEUE_PROFILES.values())
+
+@patch('app.services.media_processor.MediaProcessor.add_watermark')
+def test_watermark_retries_then_falls_back(mock_watermark, monkeypatch):
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    
+    mock_watermark.side_effect = [OSError("connection reset"), "static/images/watermarked_ok.jpg"]
+    result = task_queue.process_image_watermark.apply(args=("https://example.com/a.jpg", "text"))
+    assert result.get() == "static/images/watermarked_ok.jpg"
+    assert mock_watermark.call_count == 2
+    
+    mock_watermark.reset_mock()
+    mock_watermark.side_effect = OSError("still down")
+    result = task_queue.process_image_watermark.apply(args=("https://example.com/a.jpg", "text"))
+    assert result.get() == "https://example.com/a.jpg"
+    assert mock_watermark.call_count == QUEUE_PROFILES["image"].max_retries + 1
+
+@patch('app.services.advanced_extractor.AdvancedNewsExtractor.extract_with_metadata')
+def test_failed_fetches_are_retried_after_the_governors_delay(mock_extract, monkeypatch):
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    task = task_queue.extract_article
+    
+    deferred = ExtractionFailure("Failed to fetch: throttled", retry_after=7.0, retryable=True)
+    mock_extract.side_effect = [deferred, ExtractedArticle(title="Başlık", content="Metin")]
+    with patch.object(task, "retry", wraps=task.retry) as mock_retry:
+        result = task.apply(args=("https://example.com/a",))
+    assert result.get()["success"]
+    assert mock_retry.call_args.kwargs["countdown"] == 7.0
+    
+    # A page that was downloaded but can't be parsed is not fetched again
+    mock_extract.reset_mock()
+    mock_extract.side_effect = None
+    mock_extract.return_value = ExtractionFailure("Failed to extract content: no text")
+    result = task.apply(args=("https://example.com/b",))
+    assert result.get() == {"success": False, "error": "Failed to extract content: no text", "retry_after": None}
+    assert mock_extract.call_count == 1